@@ -30,11 +30,35 @@ import json
 import csv
 import base64
 import shutil
+import hashlib
+import sqlite3
+import threading
+import time
+import getpass
+import io
+import codecs
+import math
+import itertools
+import re
+import mmap
+import struct
+from array import array
+from html import escape as html_escape
+from urllib.parse import quote as url_quote
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import multiprocessing
+import argparse
+import bisect
 from datetime import datetime, timedelta
 from pathlib import Path
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
 
+try:
+    import numpy as np  # optional: beschleunigt die Sollwert-Prüfung großer Tabellen
+except ImportError:
+    np = None
+
 o3NAME = "o3Measurement"
 o3VERSION = "12.5.1"
 o3COPYRIGHT = "openw3rk INVENT - Vehicle Solutions"
@@ -45,10 +69,16 @@ DATA_DIR = Path.home() / ".o3measurement" / "data"
 VEHICLES_BASE_DIR = Path.home() / ".o3measurement" / "vehicles"
 STORAGE_DIR = Path.home() / ".o3measurement" / "storage"
 BACKUP_DIR_SHOW = Path.home() / ".o3measurement" / "backups" # nur als var zur ansicht in Über. Richtige pfad cfg in Backup klasse.
+BLOBS_DIR = VEHICLES_BASE_DIR / ".blobs" # Anhänge nach Hash, liegt unter vehicles damit Backups sie mitnehmen
+THUMBS_DIR = Path.home() / ".o3measurement" / "cache" / "thumbs" # Vorschaubilder für Berichte, jederzeit neu erzeugbar
 STORAGE_DIR.mkdir(parents=True, exist_ok=True)
 TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 VEHICLES_BASE_DIR.mkdir(parents=True, exist_ok=True)
+BLOBS_DIR.mkdir(parents=True, exist_ok=True)
+
+# Dateifilter für Datasets (o3ds = binäres Format, siehe MappedDataset)
+DATASET_FILE_FILTER = "CSV Dateien (*.csv);;JSON Dateien (*.json);;o3 Binär-Datasets (*.o3ds)"
 
 # Logos
 LOGO_PATH = Path(__file__).parent / "o3assets" / "o3_logo.png"
@@ -810,6 +840,219 @@ ALL_UNITS = []
 for category_units in AVAILABLE_UNITS.values():
     ALL_UNITS.extend(category_units)
 
+# Umrechnung der Einheiten: Basiseinheit -> (Dimension, Faktor, Offset) mit SI = Wert * Faktor + Offset.
+# Einheiten mit Zusatz ("mm Hub", "m² Lackfläche") werden über das erste Wort zugeordnet,
+# reine Bezeichnungen ("FIN", "Kunde") bleiben ohne Dimension und werden nie umgerechnet.
+_GAL_US = 3.785411784e-3
+_FT3 = 0.028316846592
+UNIT_CONVERSIONS = {
+    # Länge (m)
+    "m": ("Länge", 1.0), "mm": ("Länge", 1e-3), "cm": ("Länge", 1e-2), "dm": ("Länge", 0.1),
+    "km": ("Länge", 1e3), "µm": ("Länge", 1e-6), "nm": ("Länge", 1e-9), "inch": ("Länge", 0.0254),
+    "ft": ("Länge", 0.3048), "yard": ("Länge", 0.9144), "mil": ("Länge", 2.54e-5),
+    # Fläche (m²)
+    "m²": ("Fläche", 1.0), "mm²": ("Fläche", 1e-6), "cm²": ("Fläche", 1e-4), "dm²": ("Fläche", 1e-2),
+    "µm²": ("Fläche", 1e-12), "in²": ("Fläche", 6.4516e-4), "ft²": ("Fläche", 0.09290304),
+    "yd²": ("Fläche", 0.83612736),
+    # Volumen (m³)
+    "m³": ("Volumen", 1.0), "dm³": ("Volumen", 1e-3), "cm³": ("Volumen", 1e-6), "mm³": ("Volumen", 1e-9),
+    "µm³": ("Volumen", 1e-18), "L": ("Volumen", 1e-3), "ml": ("Volumen", 1e-6), "µl": ("Volumen", 1e-9),
+    "nl": ("Volumen", 1e-12), "pl": ("Volumen", 1e-15), "in³": ("Volumen", 1.6387064e-5),
+    "ft³": ("Volumen", _FT3), "yd³": ("Volumen", 0.764554857984), "gal": ("Volumen", _GAL_US),
+    "gal (UK)": ("Volumen", 4.54609e-3), "qt": ("Volumen", _GAL_US / 4), "pt": ("Volumen", _GAL_US / 8),
+    "fl oz": ("Volumen", _GAL_US / 128),
+    # Volumenstrom (m³/s)
+    "m³/s": ("Volumenstrom", 1.0), "m³/min": ("Volumenstrom", 1 / 60), "m³/h": ("Volumenstrom", 1 / 3600),
+    "dm³/s": ("Volumenstrom", 1e-3), "cm³/s": ("Volumenstrom", 1e-6), "L/s": ("Volumenstrom", 1e-3),
+    "L/min": ("Volumenstrom", 1e-3 / 60), "L/h": ("Volumenstrom", 1e-3 / 3600), "ml/s": ("Volumenstrom", 1e-6),
+    "ml/min": ("Volumenstrom", 1e-6 / 60), "ml/h": ("Volumenstrom", 1e-6 / 3600),
+    "cc/min": ("Volumenstrom", 1e-6 / 60), "cfm": ("Volumenstrom", _FT3 / 60),
+    "cfh": ("Volumenstrom", _FT3 / 3600), "gpm": ("Volumenstrom", _GAL_US / 60),
+    "gph": ("Volumenstrom", _GAL_US / 3600),
+    # Masse (kg)
+    "kg": ("Masse", 1.0), "g": ("Masse", 1e-3), "mg": ("Masse", 1e-6), "t": ("Masse", 1e3),
+    "Megatonne (Mt)": ("Masse", 1e9), "oz": ("Masse", 0.028349523125), "lb": ("Masse", 0.45359237),
+    "st": ("Masse", 6.35029318), "ton (US)": ("Masse", 907.18474), "slug": ("Masse", 14.59390294),
+    # Massenstrom (kg/s)
+    "kg/s": ("Massenstrom", 1.0), "kg/h": ("Massenstrom", 1 / 3600), "g/s": ("Massenstrom", 1e-3),
+    "g/min": ("Massenstrom", 1e-3 / 60), "g/h": ("Massenstrom", 1e-3 / 3600), "mg/s": ("Massenstrom", 1e-6),
+    "mg/min": ("Massenstrom", 1e-6 / 60), "mg/h": ("Massenstrom", 1e-6 / 3600), "µg/s": ("Massenstrom", 1e-9),
+    # Dichte/Konzentration (kg/m³)
+    "kg/m³": ("Dichte", 1.0), "g/cm³": ("Dichte", 1e3), "kg/L": ("Dichte", 1e3), "kg/dm³": ("Dichte", 1e3),
+    "g/L": ("Dichte", 1.0), "g/mm³": ("Dichte", 1e6), "g/m³": ("Dichte", 1e-3), "mg/m³": ("Dichte", 1e-6),
+    "µg/m³": ("Dichte", 1e-9), "ng/m³": ("Dichte", 1e-12),
+    # Emissionen je Strecke (kg/m)
+    "g/km": ("Masse/Strecke", 1e-6), "mg/km": ("Masse/Strecke", 1e-9), "g/mi": ("Masse/Strecke", 1e-3 / 1609.344),
+    # Kraft (N)
+    "N": ("Kraft", 1.0), "mN": ("Kraft", 1e-3), "kN": ("Kraft", 1e3), "MN": ("Kraft", 1e6),
+    "kgf": ("Kraft", 9.80665), "gf": ("Kraft", 9.80665e-3), "tf": ("Kraft", 9806.65),
+    "lbf": ("Kraft", 4.4482216152605), "ozf": ("Kraft", 0.27801385095378), "dyn": ("Kraft", 1e-5),
+    # Drehmoment (Nm)
+    "Nm": ("Drehmoment", 1.0), "kNm": ("Drehmoment", 1e3), "kgf·m": ("Drehmoment", 9.80665),
+    "kgf·cm": ("Drehmoment", 0.0980665), "lbf·ft": ("Drehmoment", 1.3558179483314),
+    "lbf·in": ("Drehmoment", 0.112984829027617),
+    # Federsteifigkeit (N/m)
+    "N/m": ("Federsteifigkeit", 1.0), "N/mm": ("Federsteifigkeit", 1e3),
+    # Druck (Pa)
+    "Pa": ("Druck", 1.0), "hPa": ("Druck", 1e2), "kPa": ("Druck", 1e3), "MPa": ("Druck", 1e6),
+    "GPa": ("Druck", 1e9), "bar": ("Druck", 1e5), "mbar": ("Druck", 1e2), "µbar": ("Druck", 0.1),
+    "psi": ("Druck", 6894.757293168), "psf": ("Druck", 47.880258980336), "inHg": ("Druck", 3386.389),
+    "mmHg": ("Druck", 133.322387415), "Torr": ("Druck", 101325 / 760), "atm": ("Druck", 101325.0),
+    "kg/cm²": ("Druck", 98066.5), "mmH₂O": ("Druck", 9.80665), "inH₂O": ("Druck", 249.08891),
+    "N/m²": ("Druck", 1.0), "N/mm²": ("Druck", 1e6),
+    # Temperatur (K)
+    "K": ("Temperatur", 1.0, 0.0), "°C": ("Temperatur", 1.0, 273.15),
+    "°F": ("Temperatur", 5 / 9, 459.67 * 5 / 9), "°R": ("Temperatur", 5 / 9, 0.0),
+    # Zeit (s)
+    "s": ("Zeit", 1.0), "ms": ("Zeit", 1e-3), "µs": ("Zeit", 1e-6), "ns": ("Zeit", 1e-9),
+    "min": ("Zeit", 60.0), "h": ("Zeit", 3600.0),
+    # Drehzahl (U/s)
+    "U/min": ("Drehzahl", 1 / 60), "rad/s": ("Drehzahl", 1 / (2 * math.pi)), "°/s": ("Drehzahl", 1 / 360),
+    # Geschwindigkeit (m/s)
+    "m/s": ("Geschwindigkeit", 1.0), "km/h": ("Geschwindigkeit", 1 / 3.6), "m/min": ("Geschwindigkeit", 1 / 60),
+    "mm/s": ("Geschwindigkeit", 1e-3), "cm/s": ("Geschwindigkeit", 1e-2), "km/s": ("Geschwindigkeit", 1e3),
+    "ft/s": ("Geschwindigkeit", 0.3048), "in/s": ("Geschwindigkeit", 0.0254), "mph": ("Geschwindigkeit", 0.44704),
+    "kn": ("Geschwindigkeit", 1852 / 3600),
+    # Beschleunigung (m/s²)
+    "m/s²": ("Beschleunigung", 1.0), "ft/s²": ("Beschleunigung", 0.3048),
+    "g (Erdbeschleunigung)": ("Beschleunigung", 9.80665), "Gal (cm/s²)": ("Beschleunigung", 0.01),
+    # Leistung (W) und Energie (J)
+    "W": ("Leistung", 1.0), "kW": ("Leistung", 1e3), "MW": ("Leistung", 1e6), "PS": ("Leistung", 735.49875),
+    "BTU/h": ("Leistung", 0.29307107), "kcal/h": ("Leistung", 1.163),
+    "J": ("Energie", 1.0), "kJ": ("Energie", 1e3), "Wh": ("Energie", 3600.0), "kWh": ("Energie", 3.6e6),
+    # Elektrik
+    "V": ("Spannung", 1.0), "mV": ("Spannung", 1e-3), "kV": ("Spannung", 1e3),
+    "A": ("Strom", 1.0), "mA": ("Strom", 1e-3), "µA": ("Strom", 1e-6),
+    "Ω": ("Widerstand", 1.0), "mΩ": ("Widerstand", 1e-3), "kΩ": ("Widerstand", 1e3), "MΩ": ("Widerstand", 1e6),
+    "F": ("Kapazität", 1.0), "µF": ("Kapazität", 1e-6), "nF": ("Kapazität", 1e-9), "pF": ("Kapazität", 1e-12),
+    "C": ("Ladung", 1.0), "Ah": ("Ladung", 3600.0),
+    "T": ("Flussdichte", 1.0), "mT": ("Flussdichte", 1e-3), "µT": ("Flussdichte", 1e-6),
+    "nT": ("Flussdichte", 1e-9), "Gauss (G)": ("Flussdichte", 1e-4),
+    # Frequenz (Hz)
+    "Hz": ("Frequenz", 1.0), "kHz": ("Frequenz", 1e3), "MHz": ("Frequenz", 1e6), "GHz": ("Frequenz", 1e9),
+    "1/s": ("Frequenz", 1.0),
+    # Daten (Bit) und Datenrate (Bit/s)
+    "Bit": ("Daten", 1.0), "Byte": ("Daten", 8.0), "kB": ("Daten", 8e3), "MB": ("Daten", 8e6),
+    "GB": ("Daten", 8e9), "TB": ("Daten", 8e12), "KiB": ("Daten", 8.0 * 2 ** 10), "MiB": ("Daten", 8.0 * 2 ** 20),
+    "GiB": ("Daten", 8.0 * 2 ** 30), "TiB": ("Daten", 8.0 * 2 ** 40),
+    "bit/s": ("Datenrate", 1.0), "kbit/s": ("Datenrate", 1e3), "Mbit/s": ("Datenrate", 1e6),
+    "Gbit/s": ("Datenrate", 1e9), "Tbit/s": ("Datenrate", 1e12), "B/s": ("Datenrate", 8.0),
+    "kB/s": ("Datenrate", 8e3), "MB/s": ("Datenrate", 8e6), "GB/s": ("Datenrate", 8e9), "TB/s": ("Datenrate", 8e12),
+    "KiB/s": ("Datenrate", 8.0 * 2 ** 10), "MiB/s": ("Datenrate", 8.0 * 2 ** 20),
+    "GiB/s": ("Datenrate", 8.0 * 2 ** 30), "TiB/s": ("Datenrate", 8.0 * 2 ** 40),
+    # Anteile
+    "%": ("Anteil", 1e-2), "‰": ("Anteil", 1e-3), "ppm": ("Anteil", 1e-6), "ppb": ("Anteil", 1e-9),
+    "ppt": ("Anteil", 1e-12), "vol%": ("Anteil", 1e-2),
+    # Winkel (rad)
+    "rad": ("Winkel", 1.0), "°": ("Winkel", math.pi / 180), "' (Bogenminute)": ("Winkel", math.pi / 10800),
+    # Viskosität
+    "Pa·s": ("Viskosität", 1.0), "Poise (P)": ("Viskosität", 0.1), "Centipoise (cP)": ("Viskosität", 1e-3),
+    "m²/s": ("kin. Viskosität", 1.0), "Stokes (St)": ("kin. Viskosität", 1e-4),
+    "Centistokes (cSt)": ("kin. Viskosität", 1e-6),
+}
+
+# Schreibweisen aus AVAILABLE_UNITS und Eingaben -> Basiseinheit in UNIT_CONVERSIONS
+UNIT_ALIASES = {
+    "zoll": "inch", "in": "inch", "thou": "mil", "l": "L", "mL": "ml", "cc": "cm³", "gal (US)": "gal",
+    "Bar": "bar", "kp": "kgf", "kp/cm²": "kg/cm²", "N·m": "Nm", "RPM": "U/min", "rpm": "U/min",
+    "kj": "kJ", "Vol%": "vol%", "Kn": "kn", "Tesla": "T", "mL/h": "ml/h",
+}
+
+
+# Einheiten-Register, einmal aus AVAILABLE_UNITS aufgebaut.
+# Jede Schreibweise zeigt auf (ID, Dimension, Faktor, Offset); Umrechnungen zwischen zwei
+# Einheiten werden als (Skala, Verschiebung) zwischengespeichert, damit ganze Spalten mit
+# einer Multiplikation umgerechnet werden können.
+class UnitRegistry:
+    NUMBER_RE = re.compile(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(.*?)\s*$")
+
+    def __init__(self, units_by_category):
+        self._units = {}
+        self._conversions = {}
+        for symbol in UNIT_CONVERSIONS:
+            self._units[symbol] = self._resolve(symbol)
+        for alias in UNIT_ALIASES:
+            self._units[alias] = self._resolve(alias)
+        for units in units_by_category.values():
+            for unit in units:
+                if unit and unit not in self._units:
+                    self._units[unit] = self._resolve(unit)
+
+    @staticmethod
+    def _normalize(symbol):
+        # Mikro-Zeichen (U+00B5) und griechisches My (U+03BC) gleich behandeln
+        return symbol.strip().replace('μ', 'µ')
+
+    def _resolve(self, unit):
+        symbol = self._normalize(unit)
+        for candidate in (symbol, symbol.split(' ')[0]):
+            base = UNIT_ALIASES.get(candidate, candidate)
+            conversion = UNIT_CONVERSIONS.get(base)
+            if conversion is not None:
+                dimension, factor = conversion[0], conversion[1]
+                offset = conversion[2] if len(conversion) > 2 else 0.0
+                return (base, dimension, factor, offset)
+        # Bezeichnung ohne Umrechnung, nur mit sich selbst vergleichbar
+        return (symbol, None, 1.0, 0.0)
+
+    def lookup(self, unit):
+        # (ID, Dimension, Faktor, Offset); unbekannte Schreibweisen werden beim ersten Mal aufgelöst
+        info = self._units.get(unit)
+        if info is None:
+            info = self._units[unit] = self._resolve(unit)
+        return info
+
+    def conversion(self, source, target):
+        # (Skala, Verschiebung) mit Ziel = Wert * Skala + Verschiebung,
+        # False bei unterschiedlichen Dimensionen, None wenn eine Einheit nicht umrechenbar ist
+        key = (source, target)
+        if key in self._conversions:
+            return self._conversions[key]
+        src, dst = self.lookup(source), self.lookup(target)
+        if src[0] == dst[0]:
+            result = (1.0, 0.0)
+        elif src[1] is None or dst[1] is None:
+            result = None
+        elif src[1] != dst[1]:
+            result = False
+        else:
+            scale = src[2] / dst[2]
+            result = (scale, (src[3] - dst[3]) / dst[2])
+        self._conversions[key] = result
+        return result
+
+    def convert(self, value, source, target):
+        conversion = self.conversion(source, target)
+        if not conversion:
+            return None
+        return value * conversion[0] + conversion[1]
+
+    def parse(self, text):
+        # "12.5 bar", "12.5bar", "12.5" -> (Wert, Einheit); (NaN, '') wenn keine Zahl vorne steht
+        if not text:
+            return math.nan, ''
+        number, _, unit = text.partition(' ')
+        try:
+            return float(number), unit.strip()
+        except ValueError:
+            pass
+        match = self.NUMBER_RE.match(text)
+        if match is None:
+            return math.nan, ''
+        return float(match.group(1)), match.group(2)
+
+    def unit_of(self, text):
+        # Nur den Einheitenteil, schneller Weg für Zellen der Form "Zahl Einheit"
+        number, sep, unit = text.partition(' ')
+        if sep:
+            return unit.strip() if number else self.parse(text)[1]
+        if not text or text[-1] in '0123456789.':
+            return ''
+        return self.parse(text)[1]
+
+
+UNIT_REGISTRY = UnitRegistry(AVAILABLE_UNITS)
+
 # Service intervalle mit standards
 SERVICE_TYPES = {
     "Ölwechsel": {"default_interval": 15000, "unit": "km"},
@@ -825,40 +1068,125 @@ SERVICE_TYPES = {
 }
 
 
+# Gespeicherte Messtabelle.
+# Version 2: Werte spaltenweise ohne Formatierung (ohne Sollwert-Zeile), die OK/Fehler-Farben
+# werden beim Laden aus den Sollwerten neu berechnet. In der vehicle.json stehen nur die Metadaten,
+# die Werte liegen in saved_tables/<table_id>.json.
+# Version 1 (alt): table_data mit text/background/foreground je Zelle, wird weiterhin gelesen.
 class SavedTable:
+    FORMAT_VERSION = 2
+    LEGACY_SETPOINT_BACKGROUND = "#2a2a33"  # Hintergrund der Sollwert-Zeile im alten Format
+
     def __init__(self, name: str = "", description: str = "", template_data: dict = None, 
-                 table_data: list = None, vehicle_name: str = "", created_date: str = ""):
+                 columns: list = None, vehicle_name: str = "", created_date: str = ""):
         self.name = name
         self.description = description
         self.template_data = template_data if template_data is not None else {}
-        self.table_data = table_data if table_data is not None else []
         self.vehicle_name = vehicle_name
         self.created_date = created_date or datetime.now().strftime("%Y-%m-%d %H:%M")
         self.modified_date = datetime.now().strftime("%Y-%m-%d %H:%M")
         self.table_id = str(uuid.uuid4())[:8]  # Kurze eindeutige ID
+        self.columns = []
+        self.row_count = 0
+        self.column_count = 0
+        self.template_name = self.template_data.get("name", "")
+        self.has_data = False  # False = nur Metadaten aus der vehicle.json
+        if columns is not None:
+            self.set_columns(columns)
+
+    def set_columns(self, columns: list):
+        self.columns = columns
+        self.column_count = len(columns)
+        self.row_count = max((len(c) for c in columns), default=0)
+        self.has_data = True
 
     def to_dict(self):
+        # Vollständiger Inhalt für saved_tables/<table_id>.json
         return {
+            "version": self.FORMAT_VERSION,
             "name": self.name,
             "description": self.description,
             "template_data": self.template_data,
-            "table_data": self.table_data,
+            "columns": self.columns,
             "vehicle_name": self.vehicle_name,
             "created_date": self.created_date,
             "modified_date": self.modified_date,
             "table_id": self.table_id
         }
 
+    def to_meta_dict(self):
+        # Nur Metadaten für die vehicle.json
+        return {
+            "version": self.FORMAT_VERSION,
+            "name": self.name,
+            "description": self.description,
+            "template_name": self.template_data.get("name", "") if self.template_data else self.template_name,
+            "vehicle_name": self.vehicle_name,
+            "created_date": self.created_date,
+            "modified_date": self.modified_date,
+            "table_id": self.table_id,
+            "row_count": self.row_count,
+            "column_count": self.column_count
+        }
+
     @staticmethod
     def from_dict(d):
-        return SavedTable(
+        table = SavedTable(
             d.get("name", ""),
             d.get("description", ""),
             d.get("template_data", {}),
-            d.get("table_data", []),
+            None,
             d.get("vehicle_name", ""),
             d.get("created_date", "")
         )
+        table.modified_date = d.get("modified_date", table.modified_date)
+        table.table_id = d.get("table_id", table.table_id)
+        if "columns" in d:
+            table.set_columns(d["columns"])
+        elif "table_data" in d:
+            table.set_columns(SavedTable._columns_from_legacy(d["table_data"]))
+        else:
+            table.row_count = d.get("row_count", 0)
+            table.column_count = d.get("column_count", 0)
+            table.template_name = d.get("template_name", "")
+        return table
+
+    @staticmethod
+    def _columns_from_legacy(table_data: list) -> list:
+        rows = table_data or []
+        # alte Tabellen enthalten die Sollwert-Zeile als erste Zeile, sie kommt beim Laden aus der Vorlage
+        if rows and rows[0] and all((cell.get("background") or "").lower() == SavedTable.LEGACY_SETPOINT_BACKGROUND
+                                    for cell in rows[0]):
+            rows = rows[1:]
+        column_count = max((len(row) for row in rows), default=0)
+        return [[row[c].get("text", "") if c < len(row) else "" for row in rows] for c in range(column_count)]
+
+    @staticmethod
+    def migrate_inline_tables(data: dict, tables_dir: Path) -> bool:
+        # Einmalige Umstellung: eingebettete table_data aus der vehicle.json in eigene Dateien auslagern
+        changed = False
+        entries = data.get("saved_tables", [])
+        for i, entry in enumerate(entries):
+            if "table_data" not in entry and "columns" not in entry:
+                continue
+            table = SavedTable.from_dict(entry)
+            try:
+                write_saved_table_file(tables_dir, table)
+            except Exception as e:
+                print(f"Fehler bei der Migration der Tabelle {table.name}: {e}")
+                continue
+            entries[i] = table.to_meta_dict()
+            changed = True
+        return changed
+
+
+def write_saved_table_file(tables_dir: Path, table: SavedTable):
+    tables_dir.mkdir(parents=True, exist_ok=True)
+    table_file = tables_dir / f"{table.table_id}.json"
+    tmp_file = table_file.with_suffix(".tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(table.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_file, table_file)
 
 
 class Vehicle:
@@ -891,8 +1219,8 @@ class Vehicle:
             "include_attachments_in_export": self.include_attachments_in_export,
             "parts": self.parts,
             "defect_reports": self.defect_reports,
-            # WICHTIG: saved_tables muss hier serialisiert werden
-            "saved_tables": [table.to_dict() for table in self.saved_tables]  # Diese Zeile war möglicherweise falsch
+            # nur Metadaten, die Werte liegen in saved_tables/<table_id>.json
+            "saved_tables": [table.to_meta_dict() for table in self.saved_tables]
         }
 
     @staticmethod
@@ -995,9 +1323,7 @@ class Vehicle:
             # Verzeichnis sicherstellen
             self.ensure_directories()
             
-            table_file = self.get_saved_tables_dir() / f"{table.table_id}.json"
-            with open(table_file, 'w', encoding='utf-8') as f:
-                json.dump(table.to_dict(), f, indent=2, ensure_ascii=False)
+            write_saved_table_file(self.get_saved_tables_dir(), table)
         except Exception as e:
             QtWidgets.QMessageBox.warning(None, "Speicherfehler", f"Tabelle konnte nicht gespeichert werden: {e}")
 
@@ -1012,10 +1338,10 @@ class Vehicle:
                         with open(table_file, 'r', encoding='utf-8') as f:
                             table_data = json.load(f)
                             return SavedTable.from_dict(table_data)
-                    except Exception:
-                        # Falls Datei nicht geladen werden kann, Rückfall auf Listeneintrag
-                        return table
-                return table
+                    except Exception as e:
+                        print(f"Fehler beim Laden der Tabelle {table_file}: {e}")
+                # Falls Datei nicht geladen werden kann, Rückfall auf Listeneintrag (falls mit Werten)
+                return table if table.has_data else None
         return None
 
     def delete_table(self, table_id: str):
@@ -1038,15 +1364,9 @@ class Vehicle:
         return False
 
     def _save_vehicle_immediately(self):
-        try:
-            self.ensure_directories()
-            vehicle_file = self.get_vehicle_dir() / "vehicle.json"
-            with open(vehicle_file, "w", encoding="utf-8") as f:
-                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            QtWidgets.QMessageBox.warning(None, "Speicherfehler", f"Fahrzeug konnte nicht gespeichert werden: {e}")
-            return False
+        # Schreiben übernimmt der VehicleSaveScheduler im Hintergrund
+        VehicleSaveScheduler.instance().schedule(self)
+        return True
 
     def get_table_by_name(self, name: str) -> SavedTable:
         for table in self.saved_tables:
@@ -1061,6 +1381,805 @@ class Vehicle:
         return None
 
 
+# Zentrale Stelle für alle vehicle.json Schreibzugriffe.
+# Beim Einplanen wird der Stand im aufrufenden Thread als JSON festgehalten, der Worker-Thread schreibt
+# ihn nach kurzer Sammelzeit atomar (temp-Datei + fsync + rename). Mehrere Saves desselben Fahrzeugs
+# ergeben nur einen Schreibvorgang, geschrieben wird der zuletzt eingeplante Stand.
+class VehicleSaveScheduler(QtCore.QObject):
+    saved = QtCore.pyqtSignal(str)  # Fahrzeugname
+    failed = QtCore.pyqtSignal(str, str)  # Fahrzeugname, Fehlermeldung
+
+    COALESCE_SECONDS = 0.5  # Ruhezeit nach der letzten Änderung
+    MAX_DELAY_SECONDS = 3.0  # spätestens dann wird geschrieben
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = VehicleSaveScheduler()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._pending = {}  # Pfad der vehicle.json -> (Fahrzeugname, JSON-Stand beim Einplanen)
+        self._first_dirty = None
+        self._last_dirty = 0.0
+        self._busy = False
+        self._flush_requested = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="VehicleSaveScheduler", daemon=True)
+        self._thread.start()
+
+    def schedule(self, vehicle):
+        if not vehicle.name:
+            return
+        vehicle_file = str(vehicle.get_vehicle_dir() / "vehicle.json")
+        # Stand im aufrufenden (GUI-)Thread festhalten: der kompakte C-Encoder läuft ohne Unterbrechung,
+        # der Worker sieht so nie ein halb bearbeitetes Fahrzeug
+        snapshot = json.dumps(vehicle.to_dict(), ensure_ascii=False)
+        with self._cond:
+            self._pending[vehicle_file] = (vehicle.name, snapshot)
+            now = time.monotonic()
+            if self._first_dirty is None:
+                self._first_dirty = now
+            self._last_dirty = now
+            self._cond.notify_all()
+
+    def has_pending(self):
+        with self._cond:
+            return bool(self._pending) or self._busy
+
+    def flush(self, timeout=30.0):
+        # Wartet bis alles geschrieben ist (Programmende, Umbenennen, Backup)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._pending or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                while self._pending and not self._flush_requested:
+                    wait = min(self._last_dirty + self.COALESCE_SECONDS,
+                               self._first_dirty + self.MAX_DELAY_SECONDS) - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                batch = self._pending
+                self._pending = {}
+                self._first_dirty = None
+                self._busy = True
+
+            for vehicle_file, (vehicle_name, snapshot) in batch.items():
+                self._write(Path(vehicle_file), vehicle_name, snapshot)
+
+            with self._cond:
+                self._busy = False
+                if not self._pending:
+                    self._flush_requested = False
+                self._cond.notify_all()
+
+    def _write(self, vehicle_file: Path, vehicle_name: str, snapshot: str):
+        try:
+            # eigene Kopie, nur für die lesbare Einrückung der Datei
+            content = json.dumps(json.loads(snapshot), indent=2, ensure_ascii=False)
+            vehicle_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = vehicle_file.with_suffix(".json.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, vehicle_file)
+            self.saved.emit(vehicle_name)
+        except Exception as e:
+            print(f"Fehler beim Speichern von {vehicle_file}: {e}")
+            self.failed.emit(vehicle_name, str(e))
+
+
+# Gemeinsamer Hintergrund-Runner für Exporte, Druck und Backups.
+# Aufträge werden in einen eigenen QThreadPool gestellt und warten dort, bis ein Platz frei ist;
+# die Messwerterfassung läuft währenddessen weiter. Die Auftragsfunktion bekommt den Job und
+# meldet darüber Fortschritt, Abbrüche werden beim nächsten set_progress() ausgelöst.
+class JobCancelled(Exception):
+    pass
+
+
+class JobSignals(QtCore.QObject):
+    started = QtCore.pyqtSignal()
+    progress = QtCore.pyqtSignal(int, str)  # Prozent (-1 = unbestimmt), Text
+    finished = QtCore.pyqtSignal(object)  # Ergebnis der Auftragsfunktion
+    failed = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+
+
+class BackgroundJob(QtCore.QRunnable):
+    WAITING, RUNNING, DONE, FAILED, CANCELLED = "Wartet", "Läuft", "Fertig", "Fehler", "Abgebrochen"
+
+    def __init__(self, title, fn):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.title = title
+        self.fn = fn
+        self.state = self.WAITING
+        self.message = ""  # Abschlussmeldung, kann von der Auftragsfunktion gesetzt werden
+        self.signals = JobSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def set_progress(self, percent, text=""):
+        self.check_cancelled()
+        self.signals.progress.emit(int(percent), text)
+
+    def run(self):
+        if self._cancel.is_set():
+            self.signals.cancelled.emit()
+            return
+        self.signals.started.emit()
+        try:
+            result = self.fn(self)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            print(f"Fehler im Hintergrundauftrag '{self.title}': {e}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+class JobRunner(QtCore.QObject):
+    jobAdded = QtCore.pyqtSignal(object)  # BackgroundJob
+    jobChanged = QtCore.pyqtSignal(object)
+    jobDone = QtCore.pyqtSignal(object)
+
+    MAX_THREADS = 2
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = JobRunner()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self.pool = QtCore.QThreadPool()
+        self.pool.setMaxThreadCount(self.MAX_THREADS)
+        self.jobs = []
+
+    def submit(self, title, fn, on_finished=None, on_failed=None):
+        # on_finished(result) / on_failed(Fehlertext) laufen im GUI-Thread
+        job = BackgroundJob(title, fn)
+        job.signals.started.connect(lambda: self._set_state(job, BackgroundJob.RUNNING))
+        job.signals.progress.connect(lambda percent, text: self.jobChanged.emit(job))
+        job.signals.finished.connect(lambda result: self._finish(job, BackgroundJob.DONE, on_finished, result))
+        job.signals.failed.connect(lambda error: self._finish(job, BackgroundJob.FAILED, on_failed, error))
+        job.signals.cancelled.connect(lambda: self._finish(job, BackgroundJob.CANCELLED))
+        self.jobs.append(job)
+        self.jobAdded.emit(job)
+        self.pool.start(job)
+        return job
+
+    def cancel(self, job):
+        job.cancel()
+        # Noch wartende Aufträge direkt aus der Warteschlange nehmen
+        if job.state == BackgroundJob.WAITING and self.pool.tryTake(job):
+            job.signals.cancelled.emit()
+
+    def active_jobs(self):
+        return [job for job in self.jobs if job.state in (BackgroundJob.WAITING, BackgroundJob.RUNNING)]
+
+    def clear_finished(self):
+        self.jobs = self.active_jobs()
+
+    def shutdown(self, timeout=30.0):
+        # Programmende: Wartende abbrechen, laufende Aufträge abschließen lassen
+        for job in self.active_jobs():
+            if job.state == BackgroundJob.WAITING:
+                self.cancel(job)
+        return self.pool.waitForDone(int(timeout * 1000))
+
+    def _set_state(self, job, state):
+        job.state = state
+        self.jobChanged.emit(job)
+
+    def _finish(self, job, state, callback=None, value=None):
+        if job.state in (BackgroundJob.DONE, BackgroundJob.FAILED, BackgroundJob.CANCELLED):
+            return
+        job.state = state
+        if state == BackgroundJob.FAILED:
+            job.message = value
+        elif state == BackgroundJob.CANCELLED:
+            job.message = "Abgebrochen"
+        elif not job.message:
+            job.message = "Fertig"
+        if callback is not None:
+            try:
+                callback(value)
+            except RuntimeError as e:
+                # Aufrufender Dialog ist inzwischen geschlossen
+                print(f"Fehler beim Abschluss von '{job.title}': {e}")
+        self.jobDone.emit(job)
+
+
+# Anhänge werden einmalig unter ihrem SHA-256 abgelegt, in vehicle.json steht nur die Referenz.
+# Alte Anhänge mit 'data' (base64) bzw. 'scan_path' bleiben lesbar. Nicht mehr referenzierte Blobs
+# räumt collect_garbage() auf (läuft vor jedem Backup mit Fahrzeugdaten).
+class AttachmentStore:
+    CHUNK_SIZE = 1024 * 1024
+    GC_GRACE_SECONDS = 7 * 24 * 3600  # jüngere Blobs gehören evtl. zu noch nicht gespeicherten Fahrzeugen
+
+    def __init__(self, blob_dir: Path = None):
+        self.blob_dir = Path(blob_dir) if blob_dir else BLOBS_DIR
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def put_file(self, file_path) -> tuple:
+        sha = hashlib.sha256()
+        size = 0
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                sha.update(chunk)
+                size += len(chunk)
+        digest = sha.hexdigest()
+        target = self.blob_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_target = target.with_name(f"{digest}.{uuid.uuid4().hex[:8]}.tmp")
+            shutil.copyfile(file_path, tmp_target)
+            os.replace(tmp_target, target)
+        else:
+            os.utime(target)  # erneut verwendet -> Schonfrist für collect_garbage neu starten
+        return digest, size
+
+    def put_bytes(self, data: bytes) -> tuple:
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.blob_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_target = target.with_name(f"{digest}.{uuid.uuid4().hex[:8]}.tmp")
+            with open(tmp_target, "wb") as f:
+                f.write(data)
+            os.replace(tmp_target, target)
+        else:
+            os.utime(target)
+        return digest, len(data)
+
+    def get_path(self, attachment: dict):
+        # Pfad zur Datei auf der Platte, falls vorhanden
+        digest = attachment.get("blob")
+        if digest and self.blob_path(digest).exists():
+            return self.blob_path(digest)
+        scan_path = attachment.get("scan_path")
+        if scan_path and Path(scan_path).exists():
+            return Path(scan_path)
+        return None
+
+    def read_bytes(self, attachment: dict):
+        path = self.get_path(attachment)
+        if path:
+            with open(path, "rb") as f:
+                return f.read()
+        if attachment.get("data"):
+            return base64.b64decode(attachment["data"])
+        return None
+
+    def migrate_attachments(self, attachments: list) -> bool:
+        # Einmalige Umstellung: base64 'data' aus vehicle.json in den Blob-Speicher verschieben
+        changed = False
+        for attachment in attachments:
+            if not attachment.get("data"):
+                continue
+            try:
+                digest, size = self.put_bytes(base64.b64decode(attachment["data"]))
+            except Exception as e:
+                print(f"Fehler bei der Migration von {attachment.get('filename', '')}: {e}")
+                continue
+            attachment["blob"] = digest
+            attachment["size"] = size
+            del attachment["data"]
+            changed = True
+        return changed
+
+    def referenced_blobs(self, vehicles_dir: Path = None):
+        # Alle in vehicle.json referenzierten Blobs, None wenn ein Fahrzeug nicht lesbar ist
+        vehicles_dir = Path(vehicles_dir) if vehicles_dir else VEHICLES_BASE_DIR
+        digests = set()
+        for vehicle_file in vehicles_dir.glob("*/vehicle.json"):
+            try:
+                with open(vehicle_file, "r", encoding="utf-8") as f:
+                    attachments = json.load(f).get("attachments", [])
+            except Exception as e:
+                print(f"Fehler beim Laden von {vehicle_file}: {e}")
+                return None
+            digests.update(attachment["blob"] for attachment in attachments if attachment.get("blob"))
+        return digests
+
+    def collect_garbage(self, vehicles_dir: Path = None) -> tuple:
+        # Blobs entfernter Anhänge löschen; (Anzahl, Bytes). Ist ein Fahrzeug nicht lesbar,
+        # wird nichts gelöscht, da seine Referenzen unbekannt sind.
+        VehicleSaveScheduler.instance().flush()
+        referenced = self.referenced_blobs(vehicles_dir)
+        if referenced is None or not self.blob_dir.exists():
+            return 0, 0
+        cutoff = time.time() - self.GC_GRACE_SECONDS
+        removed = freed = 0
+        for blob in self.blob_dir.glob("*/*"):
+            if not blob.is_file() or blob.name in referenced:
+                continue
+            try:
+                stat = blob.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                blob.unlink()
+                removed += 1
+                freed += stat.st_size
+            except OSError as e:
+                print(f"Fehler beim Entfernen von {blob}: {e}")
+        return removed, freed
+
+
+# Vorschaubilder für Berichte: QImage skaliert im Thread-Pool, Cache auf der Platte nach Inhalts-Hash und Kantenlänge.
+# Gleiche Bilder (auch in verschiedenen Fahrzeugen) werden nur einmal verkleinert.
+class ThumbnailCache:
+    SIZE = 320
+    QUALITY = 80
+    MAX_WORKERS = 4
+
+    def __init__(self, cache_dir: Path = None, store: AttachmentStore = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else THUMBS_DIR
+        self.store = store if store is not None else AttachmentStore()
+
+    def thumb_path(self, digest: str, size: int) -> Path:
+        return self.cache_dir / digest[:2] / f"{digest}_{size}.jpg"
+
+    def thumbnail(self, attachment: dict, size: int = None):
+        size = size or self.SIZE
+        data = None
+        digest = attachment.get("blob")
+        if not digest:
+            # Alte Anhänge ohne Blob: Hash über den Inhalt
+            data = self.store.read_bytes(attachment)
+            if not data:
+                return None
+            digest = hashlib.sha256(data).hexdigest()
+        target = self.thumb_path(digest, size)
+        if target.exists():
+            return target
+
+        image = QtGui.QImage()
+        if data is None:
+            source = self.store.get_path(attachment)
+            if source is None or not image.load(str(source)):
+                return None
+        elif not image.loadFromData(data):
+            return None
+        if image.width() > size or image.height() > size:
+            image = image.scaled(size, size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        if image.hasAlphaChannel():
+            # JPEG kennt keine Transparenz, auf weißen Grund legen
+            canvas = QtGui.QImage(image.size(), QtGui.QImage.Format_RGB32)
+            canvas.fill(QtCore.Qt.white)
+            painter = QtGui.QPainter(canvas)
+            painter.drawImage(0, 0, image)
+            painter.end()
+            image = canvas
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_target = target.with_name(f"{target.stem}.{uuid.uuid4().hex[:8]}.tmp")
+        if not image.save(str(tmp_target), "JPEG", self.QUALITY):
+            return None
+        os.replace(tmp_target, target)
+        return target
+
+    def _safe_thumbnail(self, attachment, size):
+        try:
+            return self.thumbnail(attachment, size)
+        except Exception as e:
+            print(f"Fehler beim Erzeugen der Vorschau für {attachment.get('filename', '')}: {e}")
+            return None
+
+    def thumbnails(self, attachments: list, size: int = None) -> list:
+        # Ergebnis in Reihenfolge der Anhänge, None wenn keine Vorschau möglich war
+        if not attachments:
+            return []
+        workers = min(self.MAX_WORKERS, len(attachments), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda attachment: self._safe_thumbnail(attachment, size), attachments))
+
+
+# Fahrzeug-Index: Kurzinfos aller Fahrzeuge in einer Datei, damit beim Start
+# nicht jede vehicle.json komplett geladen werden muss.
+# Ein Eintrag gilt als aktuell, solange mtime und Größe der vehicle.json passen.
+class VehicleIndex:
+    INDEX_VERSION = 1
+
+    def __init__(self, base_dir: Path = None):
+        self.base_dir = Path(base_dir) if base_dir else VEHICLES_BASE_DIR
+        self.index_file = self.base_dir / "vehicle_index.json"
+        self.entries = {}  # Ordnername -> Kurzinfo
+        self._vehicles = {}  # bereits vollständig geladene Fahrzeuge
+        self._dirty = False
+        self._load_index()
+
+    def _load_index(self):
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.INDEX_VERSION:
+                self.entries = data.get("vehicles", {})
+        except Exception as e:
+            print(f"Fehler beim Laden des Fahrzeug-Index: {e}")
+            self.entries = {}
+
+    def save_index(self):
+        if not self._dirty:
+            return
+        try:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": self.INDEX_VERSION, "vehicles": self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_file, self.index_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"Fehler beim Speichern des Fahrzeug-Index: {e}")
+
+    @staticmethod
+    def _summarize(data: dict, stat=None):
+        specs = data.get("specifications") or {}
+        last_service = data.get("last_service") or {}
+        return {
+            "name": data.get("name", ""),
+            "description": data.get("description", ""),
+            "fin": specs.get("fin", ""),
+            "hsn": specs.get("hsn", ""),
+            "baujahr": specs.get("baujahr", ""),
+            "antrieb": specs.get("antrieb", ""),
+            "motor": specs.get("motor", ""),
+            "farbe": specs.get("farbe", ""),
+            "last_km": last_service.get("ölwechsel_km", 0),
+            "mtime": stat.st_mtime_ns if stat else 0,
+            "size": stat.st_size if stat else 0
+        }
+
+    def refresh(self):
+        # Nur geänderte oder neue vehicle.json werden gelesen
+        found = set()
+        if self.base_dir.exists():
+            for vehicle_dir in self.base_dir.iterdir():
+                if not vehicle_dir.is_dir():
+                    continue
+                vehicle_file = vehicle_dir / "vehicle.json"
+                try:
+                    stat = vehicle_file.stat()
+                except OSError:
+                    continue
+                key = vehicle_dir.name
+                found.add(key)
+                entry = self.entries.get(key)
+                if entry and entry.get("mtime") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+                    continue
+                try:
+                    with open(vehicle_file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    summary = self._summarize(data, stat)
+                    summary["name"] = summary["name"] or key
+                    self.entries[key] = summary
+                    self._dirty = True
+                except Exception as e:
+                    print(f"Fehler beim Laden von {vehicle_file}: {e}")
+
+        for key in list(self.entries):
+            if key not in found:
+                del self.entries[key]
+                self._vehicles.pop(key, None)
+                self._dirty = True
+
+        self.save_index()
+
+    def names(self):
+        return sorted(self.entries, key=str.lower)
+
+    def summaries(self):
+        return [self.entries[key] for key in self.names()]
+
+    def get(self, name: str):
+        return self.entries.get(name)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def load_vehicle(self, name: str):
+        # Vollständiges Fahrzeug erst bei Bedarf laden
+        if name in self._vehicles:
+            return self._vehicles[name]
+        vehicle_file = self.base_dir / name / "vehicle.json"
+        if not vehicle_file.exists():
+            return None
+        try:
+            with open(vehicle_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Alte Anhänge mit eingebettetem base64 und eingebettete Tabellen einmalig auslagern
+            migrated = AttachmentStore().migrate_attachments(data.get("attachments", []))
+            migrated = SavedTable.migrate_inline_tables(data, vehicle_file.parent / "saved_tables") or migrated
+            if migrated:
+                tmp_file = vehicle_file.with_suffix(".tmp")
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_file, vehicle_file)
+                stat = vehicle_file.stat()
+                summary = self._summarize(data, stat)
+                summary["name"] = summary["name"] or name
+                self.entries[name] = summary
+                self._dirty = True
+                self.save_index()
+            vehicle = Vehicle.from_dict(data)
+        except Exception as e:
+            print(f"Fehler beim Laden von {vehicle_file}: {e}")
+            return None
+        self._vehicles[name] = vehicle
+        return vehicle
+
+    def all_vehicles(self):
+        vehicles = []
+        for name in self.names():
+            vehicle = self.load_vehicle(name)
+            if vehicle is not None:
+                vehicles.append(vehicle)
+        return vehicles
+
+    def update(self, vehicle: Vehicle):
+        # Nach dem Speichern aufrufen, damit der Index zur Datei passt
+        if not vehicle.name:
+            return
+        vehicle_file = vehicle.get_vehicle_dir() / "vehicle.json"
+        try:
+            stat = vehicle_file.stat()
+        except OSError:
+            stat = None
+        self.entries[vehicle.name] = self._summarize(vehicle.to_dict(), stat)
+        self._vehicles[vehicle.name] = vehicle
+        self._dirty = True
+        self.save_index()
+
+    def mark_saved(self, name: str):
+        # Nach einem Hintergrund-Save: Kurzinfo und mtime/Größe aus dem geladenen Fahrzeug übernehmen
+        vehicle = self._vehicles.get(name)
+        if vehicle is not None:
+            self.update(vehicle)
+
+    def remove(self, name: str):
+        self._vehicles.pop(name, None)
+        if self.entries.pop(name, None) is not None:
+            self._dirty = True
+            self.save_index()
+
+
+# HU/AU-Daten aller Fahrzeuge in einer eigenen Datei (hu_au.json) statt in jeder vehicle.json.
+# Dazu eine nach Fälligkeit sortierte Liste (bisect), damit Überfällig/Monat-Abfragen Bereichsabfragen sind.
+class HuAuStore:
+    STORE_VERSION = 1
+    DEFAULTS = {
+        'hu_au_due': '',
+        'au_due': '',
+        'status': 'Offen',
+        'next_check': '',
+        'notes': '',
+        'last_hu_au': '',
+        'last_au': '',
+        'needs_retest': False,
+        'retest_date': '',
+        'original_due_date': ''
+    }
+
+    def __init__(self, base_dir: Path = None):
+        self.base_dir = Path(base_dir) if base_dir else VEHICLES_BASE_DIR
+        self.store_file = self.base_dir / "hu_au.json"
+        self.entries = {}  # Fahrzeugname -> HU/AU-Daten
+        self._due = []  # sortiert: (fällig am als ISO-Datum, Fahrzeugname)
+        self._due_of = {}  # Fahrzeugname -> Schlüssel in _due
+        self.load()
+
+    @staticmethod
+    def valid_date(date_str: str) -> str:
+        try:
+            return datetime.strptime(date_str, "%Y-%m-%d").date().isoformat() if date_str else ""
+        except (TypeError, ValueError):
+            return ""
+
+    @classmethod
+    def due_date(cls, data: dict) -> str:
+        # Nachprüfung hat Vorrang, sonst der frühere Termin von HU und AU
+        retest = cls.valid_date(data.get('retest_date', ''))
+        if data.get('needs_retest') and retest:
+            return retest
+        dates = [d for d in (cls.valid_date(data.get('hu_au_due', '')), cls.valid_date(data.get('au_due', ''))) if d]
+        return min(dates) if dates else ""
+
+    def _index(self, name: str):
+        due = self.due_date(self.entries[name])
+        if due:
+            key = (due, name)
+            bisect.insort(self._due, key)
+            self._due_of[name] = key
+
+    def _unindex(self, name: str):
+        key = self._due_of.pop(name, None)
+        if key is not None:
+            i = bisect.bisect_left(self._due, key)
+            if i < len(self._due) and self._due[i] == key:
+                del self._due[i]
+
+    def load(self):
+        self.entries = {}
+        self._due = []
+        self._due_of = {}
+        if not self.store_file.exists():
+            return
+        try:
+            with open(self.store_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.STORE_VERSION:
+                for name, hu_au_data in data.get("vehicles", {}).items():
+                    self.entries[name] = dict(self.DEFAULTS, **hu_au_data)
+        except Exception as e:
+            print(f"Fehler beim Laden der HU/AU Daten: {e}")
+        for name in self.entries:
+            due = self.due_date(self.entries[name])
+            if due:
+                self._due_of[name] = (due, name)
+        self._due = sorted(self._due_of.values())
+
+    def save(self) -> bool:
+        try:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.store_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": self.STORE_VERSION, "vehicles": self.entries}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.store_file)
+            return True
+        except Exception as e:
+            print(f"Fehler beim Speichern der HU/AU Daten: {e}")
+            return False
+
+    def migrate_from_vehicles(self, vehicle_index: VehicleIndex):
+        # Einmalige Umstellung: hu_au_data aus den vehicle.json übernehmen
+        if self.store_file.exists():
+            return
+        for name in vehicle_index.names():
+            vehicle_file = vehicle_index.base_dir / name / "vehicle.json"
+            try:
+                with open(vehicle_file, "r", encoding="utf-8") as f:
+                    hu_au_data = json.load(f).get("hu_au_data") or {}
+            except Exception as e:
+                print(f"Fehler beim Laden von HU/AU Daten für {name}: {e}")
+                continue
+            if hu_au_data:
+                self.entries[name] = dict(self.DEFAULTS, **hu_au_data)
+                self._index(name)
+        self.save()
+
+    def get(self, name: str) -> dict:
+        return dict(self.entries.get(name, self.DEFAULTS))
+
+    def set(self, name: str, hu_au_data: dict) -> bool:
+        self._unindex(name)
+        self.entries[name] = {key: hu_au_data.get(key, default) for key, default in self.DEFAULTS.items()}
+        self._index(name)
+        return self.save()
+
+    def remove(self, name: str) -> bool:
+        self._unindex(name)
+        if self.entries.pop(name, None) is None:
+            return True
+        return self.save()
+
+    def rename(self, old_name: str, new_name: str) -> bool:
+        if old_name not in self.entries:
+            return True
+        hu_au_data = self.entries[old_name]
+        self._unindex(old_name)
+        del self.entries[old_name]
+        self.entries[new_name] = hu_au_data
+        self._index(new_name)
+        return self.save()
+
+    def due_between(self, start=None, end=None) -> list:
+        # Fahrzeuge mit Fälligkeit in [start, end), sortiert nach Datum; None = offen
+        lo = bisect.bisect_left(self._due, (start.isoformat(),)) if start else 0
+        hi = bisect.bisect_left(self._due, (end.isoformat(),)) if end else len(self._due)
+        return [name for _, name in self._due[lo:hi]]
+
+    def names_by_due(self) -> list:
+        return [name for _, name in self._due]
+
+    def ordered_entries(self, vehicle_names) -> list:
+        # Reihenfolge nach Fälligkeit, Fahrzeuge ohne Termin am Ende
+        vehicle_names = list(vehicle_names)
+        wanted = set(vehicle_names)
+        ordered = [name for name in self.names_by_due() if name in wanted]
+        known = set(ordered)
+        ordered += [name for name in vehicle_names if name not in known]
+        
+        entries = []
+        for name in ordered:
+            entry = self.get(name)
+            entry['vehicle'] = name
+            entries.append(entry)
+        return entries
+
+    def update_status(self, entries: list, today=None):
+        today = today or datetime.now().date()
+        month_start = today.replace(day=1)
+        next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+        after_next_start = (next_month_start + timedelta(days=32)).replace(day=1)
+        
+        # Zeiträume als Bereichsabfragen auf die sortierte Fälligkeitsliste
+        buckets = {}
+        for name in self.due_between(None, today):
+            buckets[name] = 'überfällig'
+        for name in self.due_between(today, next_month_start):
+            buckets[name] = 'diesen_monat'
+        for name in self.due_between(next_month_start, after_next_start):
+            buckets[name] = 'nächsten_monat'
+        for name in self.due_between(after_next_start, today + timedelta(days=91)):  # 3 Monate
+            buckets[name] = '3_monate'
+        
+        for entry in entries:
+            bucket = buckets.get(entry['vehicle'])
+            has_due = bool(self.due_date(entry))
+            
+            # Prüfe zuerst Nachprüfungen
+            if entry['needs_retest'] and self.valid_date(entry['retest_date']):
+                if bucket == 'überfällig':
+                    entry['status'] = 'Nachprüfung überfällig'
+                elif bucket == 'diesen_monat':
+                    entry['status'] = 'Nachprüfung diesen Monat'
+                elif bucket == 'nächsten_monat':
+                    entry['status'] = 'Nachprüfung nächsten Monat'
+                else:
+                    entry['status'] = 'Nachprüfung anstehend'
+            
+            # Normale AU prüfungen
+            elif has_due:
+                if bucket == 'überfällig':
+                    entry['status'] = 'Überfällig'
+                elif bucket == 'diesen_monat':
+                    entry['status'] = 'Diesen Monat fällig'
+                elif bucket == 'nächsten_monat':
+                    entry['status'] = 'Nächsten Monat fällig'
+                elif bucket == '3_monate':
+                    entry['status'] = 'In 3 Monaten fällig'
+                else:
+                    entry['status'] = 'Zukunft'
+            
+            else:
+                entry['status'] = 'Keine Daten'
+
+
 class Template:
     def __init__(self, name: str, columns: list = None, description: str = ""):
         self.name = name
@@ -1160,6 +2279,98 @@ class UeberWindow(QtWidgets.QDialog):
         else:
             self.logo_lbl.setText("[Logo nicht gefunden]")
 
+class ActivityManifest:
+    # Kurzübersicht aller Aktivitäten eines Fahrzeugs (eine JSON-Zeile pro Aktivität)
+    MANIFEST_NAME = "manifest.jsonl"
+
+    def __init__(self, vehicle: Vehicle):
+        self.activities_dir = vehicle.get_vehicle_dir() / "activities"
+        self.manifest_file = self.activities_dir / self.MANIFEST_NAME
+
+    @staticmethod
+    def make_entry(activity_data: dict, datei: str) -> dict:
+        return {
+            "activity_id": activity_data.get("activity_id", ""),
+            "datum": activity_data.get("datum", ""),
+            "activity_type": activity_data.get("activity_type", ""),
+            "km_stand": activity_data.get("km_stand", ""),
+            "erstellt_durch": activity_data.get("erstellt_durch", ""),
+            "beschreibung": activity_data.get("beschreibung", ""),
+            "materialien": [
+                {"teilenummer": mat.get("teilenummer", ""), "bezeichnung": mat.get("bezeichnung", "")}
+                for mat in activity_data.get("verwendete_materialien", [])
+            ],
+            "datei": datei,
+        }
+
+    def append(self, activity_data: dict, activity_file: Path):
+        # fehlt das Manifest noch, zuerst aus den vorhandenen Dateien aufbauen
+        if not self.manifest_file.exists():
+            self.rebuild()
+            return
+        entry = self.make_entry(activity_data, activity_file.relative_to(self.activities_dir).as_posix())
+        try:
+            with open(self.manifest_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"Fehler beim Schreiben des Aktivitäten-Manifests: {e}")
+
+    def load(self) -> list:
+        if not self.manifest_file.exists():
+            return self.rebuild()
+        entries = {}
+        try:
+            with open(self.manifest_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # abgebrochene letzte Zeile ignorieren
+                        continue
+                    # spätere Zeilen überschreiben frühere zur selben Datei
+                    entries[entry.get("datei", "")] = entry
+        except Exception as e:
+            print(f"Fehler beim Laden des Aktivitäten-Manifests: {e}")
+        return list(entries.values())
+
+    def rebuild(self) -> list:
+        # einmalige Migration: Manifest aus den Jahresordnern erzeugen
+        entries = []
+        if not self.activities_dir.exists():
+            return entries
+        for year_dir in sorted(self.activities_dir.iterdir()):
+            if not year_dir.is_dir():
+                continue
+            for activity_file in sorted(year_dir.glob("*.json")):
+                try:
+                    with open(activity_file, "r", encoding="utf-8") as f:
+                        activity_data = json.load(f)
+                    entries.append(self.make_entry(activity_data, activity_file.relative_to(self.activities_dir).as_posix()))
+                except Exception as e:
+                    print(f"Fehler beim Laden von {activity_file}: {e}")
+        try:
+            tmp_file = self.manifest_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp_file, self.manifest_file)
+        except Exception as e:
+            print(f"Fehler beim Schreiben des Aktivitäten-Manifests: {e}")
+        return entries
+
+    def load_activity(self, entry: dict):
+        activity_file = self.activities_dir / entry.get("datei", "")
+        try:
+            with open(activity_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Fehler beim Laden von {activity_file}: {e}")
+            return None
+
+
 class ActivityDocumentationDialog(QtWidgets.QDialog):
     def __init__(self, vehicle: Vehicle, activity_type: str = "", parent=None):
         super().__init__(parent)
@@ -1504,7 +2715,7 @@ class ActivityDocumentationDialog(QtWidgets.QDialog):
                 
                 # Lagerbestand anpassen wenn aus Lager
                 if material_data['aus_lager_entnommen']:
-                    self._update_stock(tn_item.text(), menge)
+                    self._update_stock(tn_item.text(), menge, activity_data['activity_id'])
                 
                 activity_data['verwendete_materialien'].append(material_data)
         
@@ -1517,18 +2728,21 @@ class ActivityDocumentationDialog(QtWidgets.QDialog):
         
         self.accept()
     
+    def done(self, result):
+        # SQLite-Verbindung des eigenen StorageManager beim Schließen freigeben
+        self.storage_manager.close()
+        super().done(result)
+    
     def _is_from_storage(self, teilenummer: str) -> bool:
-        return any(item.teilenummer == teilenummer for item in self.storage_manager.items)
-    
-    def _update_stock(self, teilenummer: str, menge: float):
-        for i, item in enumerate(self.storage_manager.items):
-            if item.teilenummer == teilenummer:
-                item.anzahl -= menge
-                if item.anzahl < 0:
-                    item.anzahl = 0
-                item.geaendert_am = datetime.now().strftime("%Y-%m-%d")
-                self.storage_manager.update_item(i, item)
-                break
+        return self.storage_manager.get_by_part_number(teilenummer) is not None
+    
+    def _update_stock(self, teilenummer: str, menge: float, activity_id: str = ""):
+        item = self.storage_manager.get_by_part_number(teilenummer)
+        if item is not None:
+            # Bestand nicht unter 0 buchen
+            delta = -min(menge, max(item.anzahl, 0))
+            self.storage_manager.adjust_stock(teilenummer, delta, "Aktivität", activity_id,
+                                              self.mechaniker_edit.text().strip())
     
     def _save_activity(self, activity_data):
         # Verzeichnis erstellen
@@ -1539,6 +2753,7 @@ class ActivityDocumentationDialog(QtWidgets.QDialog):
         activity_file = activity_dir / f"{activity_data['activity_id']}_{activity_data['datum']}_{activity_data['activity_type'].lower().replace(' ', '_')}.json"
         with open(activity_file, 'w', encoding='utf-8') as f:
             json.dump(activity_data, f, indent=2, ensure_ascii=False)
+        ActivityManifest(self.vehicle).append(activity_data, activity_file)
         
         if activity_data['km_stand'] > self.vehicle.last_service.get('ölwechsel_km', 0):
             self.vehicle.last_service['ölwechsel_km'] = activity_data['km_stand']
@@ -1547,13 +2762,7 @@ class ActivityDocumentationDialog(QtWidgets.QDialog):
         self._auto_save_vehicle()
     
     def _auto_save_vehicle(self):
-        try:
-            self.vehicle.ensure_directories()
-            vehicle_file = self.vehicle.get_vehicle_dir() / "vehicle.json"
-            with open(vehicle_file, "w", encoding="utf-8") as f:
-                json.dump(self.vehicle.to_dict(), f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            QtWidgets.QMessageBox.warning(self, "Auto-Save Fehler", f"Fehler beim Speichern: {e}")
+        VehicleSaveScheduler.instance().schedule(self.vehicle)
 
 class ServiceHistoryDialog(QtWidgets.QDialog):
     def __init__(self, parent=None):
@@ -1955,13 +3164,7 @@ class ServiceDialog(QtWidgets.QDialog):
         self._auto_save_vehicle()
 
     def _auto_save_vehicle(self):
-        try:
-            self.vehicle.ensure_directories()
-            vehicle_file = self.vehicle.get_vehicle_dir() / "vehicle.json"
-            with open(vehicle_file, "w", encoding="utf-8") as f:
-                json.dump(self.vehicle.to_dict(), f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Auto-Save Fehler: {e}")
+        VehicleSaveScheduler.instance().schedule(self.vehicle)
     
     def get_service_data(self):
         # Ölwechsel daten
@@ -2399,21 +3602,17 @@ class VehicleDialog(QtWidgets.QDialog):
     def add_attachment(self):
         fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Datei auswählen", "", "Alle Dateien (*);;Bilder (*.png *.jpg *.jpeg *.bmp);;PDF (*.pdf)")
         if fname:
-            # Erstellen von Fahrzeugverzeichnissen
-            self.vehicle.ensure_directories()
-            
-            # Datei in Fahrzeug-Scans-Verzeichnis kopieren
-            scan_filename = Path(fname).name
-            scan_path = self.vehicle.get_scans_dir() / scan_filename
-            shutil.copy2(fname, scan_path)
-            
-            with open(fname, 'rb') as f:
-                file_data = base64.b64encode(f.read()).decode('utf-8')
+            # Datei einmalig im Blob-Speicher ablegen, im Fahrzeug nur die Referenz
+            try:
+                digest, size = AttachmentStore().put_file(fname)
+            except Exception as e:
+                QtWidgets.QMessageBox.warning(self, "Fehler", f"Datei konnte nicht übernommen werden: {e}")
+                return
             
             attachment = {
-                'filename': scan_filename,
-                'scan_path': str(scan_path),
-                'data': file_data,
+                'filename': Path(fname).name,
+                'blob': digest,
+                'size': size,
                 'mimetype': 'application/octet-stream'
             }
             
@@ -2429,7 +3628,8 @@ class VehicleDialog(QtWidgets.QDialog):
         current_row = self.attachments_list.currentRow()
         if current_row >= 0:
             
-            # Datei aus Fahrzeug scansverzeichnis löschen
+            # Datei aus Fahrzeug scansverzeichnis löschen (Blobs bleiben, sie können mehrfach referenziert sein;
+            # nicht mehr referenzierte räumt AttachmentStore.collect_garbage() vor dem Backup auf)
             attachment = self.vehicle.attachments[current_row]
             if 'scan_path' in attachment:
                 scan_path = Path(attachment['scan_path'])
@@ -2521,12 +3721,15 @@ class ImageViewDialog(QtWidgets.QDialog):
         self.image_label.setScaledContents(False)
         
 # Bild
-        if 'scan_path' in attachment and Path(attachment['scan_path']).exists():
-            pixmap = QtGui.QPixmap(attachment['scan_path'])
+        store = AttachmentStore()
+        image_path = store.get_path(attachment)
+        if image_path:
+            pixmap = QtGui.QPixmap(str(image_path))
         else:
-            image_data = base64.b64decode(attachment['data'])
             pixmap = QtGui.QPixmap()
-            pixmap.loadFromData(image_data)
+            image_data = store.read_bytes(attachment)
+            if image_data:
+                pixmap.loadFromData(image_data)
         
         if not pixmap.isNull():
             scaled_pixmap = pixmap.scaled(1000, 700, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation) 
@@ -2891,50 +4094,1078 @@ class UnitsViewDialog(QtWidgets.QDialog): # ansicht der maßeinheiten
             item = self.units_tree.topLevelItem(i)
             item.setExpanded(False)
 
-class DefectReportsDialog(QtWidgets.QDialog):
-    def __init__(self, vehicle: Vehicle, parent=None):
-        super().__init__(parent)
-        self.vehicle = vehicle
-        self.setWindowTitle(f"Beanstandungsaufnahme - {vehicle.name}")
-        
-        # Autoscaling
-        screen = QtWidgets.QApplication.primaryScreen()
-        screen_geometry = screen.availableGeometry()
-        self.setMinimumSize(790, 500)
-        self.resize(int(screen_geometry.width() * 0.9), int(screen_geometry.height() * 0.85))
-        
-        layout = QtWidgets.QVBoxLayout(self)
-        
-        # Fahrzeug info oben
-        vehicle_info = QtWidgets.QGroupBox("Fahrzeuginformation")
-        vehicle_layout = QtWidgets.QHBoxLayout()
-        vehicle_layout.addWidget(QtWidgets.QLabel(f"Fahrzeug: {vehicle.name}"))
-        vehicle_layout.addWidget(QtWidgets.QLabel(f"FIN: {vehicle.specifications.get('fin', '')}"))
-        vehicle_layout.addWidget(QtWidgets.QLabel(f"Aktueller KM-Stand: {vehicle.last_service.get('ölwechsel_km', '0')} km"))
-        vehicle_layout.addStretch()
-        vehicle_info.setLayout(vehicle_layout)
-        layout.addWidget(vehicle_info)
-        
-        # für hauptinhalt
-        scroll_area = QtWidgets.QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        container = QtWidgets.QWidget()
-        container_layout = QtWidgets.QVBoxLayout(container)
-        
-        # Neue Beanstandung
-        new_report_group = QtWidgets.QGroupBox("Neue Beanstandung erfassen")
-        new_report_layout = QtWidgets.QFormLayout()
-        
-        # Erste Zeile: Datum und KM-Stand
-        date_km_layout = QtWidgets.QHBoxLayout()
-        
-        self.date_edit = QtWidgets.QDateEdit()
-        self.date_edit.setCalendarPopup(True)
-        self.date_edit.setDate(QtCore.QDate.currentDate())
-        date_km_layout.addWidget(QtWidgets.QLabel("Datum:"))
-        date_km_layout.addWidget(self.date_edit)
-        
-        self.km_edit = QtWidgets.QSpinBox()
+# Gemeinsame Styles aller HTML-Berichte, werden einmal je Exportordner als Datei abgelegt
+REPORT_CSS = """@charset "utf-8";
+/* o3Measurement Berichte */
+body { font-family: Arial, sans-serif; margin: 20px; }
+.header { background: #2c3e50; color: white; padding: 20px; border-radius: 5px; }
+.table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+.table th, .table td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+.table th { background-color: #f2f2f2; }
+.summary { margin-top: 20px; padding: 15px; background: #e9ecef; border-radius: 5px; }
+.footer-note { margin-top: 20px; color: #666; }
+
+/* Beanstandungen */
+.status-behoben { background-color: #d4edda; }
+.status-storniert { background-color: #e2e3e5; }
+.priority-kritisch { background-color: #f8d7da; font-weight: bold; }
+.priority-hoch { background-color: #fff3cd; }
+.report-detail { margin: 10px 0; padding: 10px; background: #f8f9fa; border-left: 4px solid #007bff; }
+
+/* Lagerbestand */
+.filter-bar { background: #ecf0f1; padding: 15px; border-radius: 5px; margin: 20px 0; display: flex; flex-wrap: wrap; gap: 15px; align-items: end; }
+.filter-group { display: flex; flex-direction: column; min-width: 150px; }
+.filter-group label { font-weight: bold; margin-bottom: 5px; color: #2c3e50; }
+.filter-input { padding: 8px; border: 1px solid #bdc3c7; border-radius: 4px; }
+.report-storage .stats { display: flex; justify-content: space-between; margin-bottom: 15px; padding: 10px; background: #34495e; color: white; border-radius: 4px; }
+.report-storage .table th { cursor: pointer; position: relative; }
+.report-storage .table th:hover { background-color: #e8e8e8; }
+.sort-indicator { margin-left: 5px; }
+.low-stock { background-color: #f8d7da; }
+.table-row { transition: background-color 0.2s; }
+.table-row:hover { background-color: #f5f5f5; }
+.hidden { display: none; }
+.results-info { margin: 10px 0; padding: 8px; background: #d4edda; border-radius: 4px; color: #155724; }
+
+/* HU/AU */
+.status-überfällig { background-color: #f8d7da; font-weight: bold; }
+.status-diesen-monat { background-color: #fff3cd; }
+.status-nächsten-monat { background-color: #e6ee9c; }
+.status-nachprüfung { background-color: #d1ecf1; }
+.status-erledigt { background-color: #d4edda; }
+.stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 10px; margin-bottom: 20px; }
+.stat-item { padding: 15px; border-radius: 5px; text-align: center; color: white; font-weight: bold; }
+.stat-value { font-size: 24px; }
+.stat-überfällig { background: #dc3545; }
+.stat-diesen-monat { background: #fd7e14; }
+.stat-nächsten-monat { background: #ffc107; color: #000; }
+.stat-nachprüfung { background: #17a2b8; }
+.stat-erledigt { background: #28a745; }
+
+/* Fuhrpark-Übersicht */
+.report-fleet .table a { margin-right: 12px; }
+.fleet-error { color: #c0392b; font-weight: bold; }
+
+/* Fahrzeug */
+.report-vehicle .section { margin: 20px 0; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }
+.specs-table { width: 100%; border-collapse: collapse; }
+.specs-table th, .specs-table td { padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }
+.specs-table th { background: #f2f2f2; }
+.fluids-table, .parts-table { width: 100%; border-collapse: collapse; }
+.fluids-table th, .fluids-table td, .parts-table th, .parts-table td { padding: 8px; text-align: left; border: 1px solid #ddd; }
+.attachments { display: flex; flex-wrap: wrap; gap: 10px; }
+.attachment { border: 1px solid #ddd; padding: 10px; border-radius: 5px; }
+.attachment img { max-width: 200px; max-height: 200px; cursor: pointer; transition: transform 0.2s; }
+.modal { display: none; position: fixed; z-index: 9999; padding-top: 50px; left: 0; top: 0; width: 100%; height: 100%; background-color: rgba(0,0,0,0.8); }
+.modal img { margin: auto; display: block; max-width: 90%; max-height: 90%; border-radius: 5px; }
+
+/* Aktivitäten (dunkel) */
+.report-dark { background-color: #0f0f12; color: #e6eef8; }
+.report-dark .header { margin-bottom: 20px; }
+.report-dark .footer-note { margin-top: 30px; border-top: 1px solid #2a2a33; padding-top: 15px; }
+.report-dark .section { background: #1b1b20; border: 1px solid #2a2a33; border-radius: 5px; padding: 15px; margin-bottom: 15px; }
+.report-dark table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+.report-dark .section table { margin: 10px 0; }
+.report-dark th, .report-dark td { border: 1px solid #2a2a33; padding: 8px; text-align: left; }
+.report-dark th { background: #2c3e50; color: white; }
+.report-dark .stats { background: #34495e; padding: 15px; border-radius: 5px; margin: 20px 0; }
+.activity { background: #1b1b20; border: 1px solid #2a2a33; border-radius: 5px; padding: 15px; margin-bottom: 15px; }
+.activity-header { display: flex; justify-content: space-between; border-bottom: 1px solid #2a2a33; padding-bottom: 10px; margin-bottom: 10px; }
+.activity-type { font-weight: bold; color: #90caf9; font-size: 18px; }
+.activity-date { color: #9aa; }
+.material-list { background: #16161a; padding: 10px; border-radius: 3px; margin: 10px 0; }
+.work-list { margin: 10px 0; }
+.work-item { padding: 5px 0; border-bottom: 1px dashed #2a2a33; }
+"""
+
+# Skripte der Berichte (Bildvorschau, Filter und Sortierung im Lagerbestand)
+REPORT_JS = """// o3Measurement Berichte
+function showModal(src) {
+    var modal = document.getElementById('imgModal');
+    var modalImg = document.getElementById('modalImg');
+    modal.style.display = 'block';
+    modalImg.src = src;
+}
+
+var currentSortColumn = -1;
+var sortDirection = 1;
+
+// Filter
+function filterTable() {
+    var searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    var categoryFilter = document.getElementById('categoryFilter').value;
+    var manufacturerFilter = document.getElementById('manufacturerFilter').value;
+    var locationFilter = document.getElementById('locationFilter').value;
+    var stockFilter = document.getElementById('stockFilter').value;
+
+    var rows = document.querySelectorAll('#storageTable tbody tr');
+    var totalParts = rows.length;
+    var visibleCount = 0;
+
+    rows.forEach(function (row) {
+        var teilenummer = row.getAttribute('data-teilenummer').toLowerCase();
+        var hersteller = row.getAttribute('data-hersteller').toLowerCase();
+        var bezeichnung = row.getAttribute('data-bezeichnung').toLowerCase();
+        var kategorie = row.getAttribute('data-kategorie');
+        var lagerplatz = row.getAttribute('data-lagerplatz');
+        var anzahl = parseInt(row.getAttribute('data-anzahl'));
+        var mindestbestand = parseInt(row.getAttribute('data-mindestbestand'));
+
+        // Text suche
+        var textMatch = !searchTerm ||
+            teilenummer.includes(searchTerm) ||
+            hersteller.includes(searchTerm) ||
+            bezeichnung.includes(searchTerm);
+
+        // Filter
+        var categoryMatch = !categoryFilter || kategorie === categoryFilter;
+        var manufacturerMatch = !manufacturerFilter || hersteller === manufacturerFilter.toLowerCase();
+        var locationMatch = !locationFilter || lagerplatz === locationFilter;
+
+        // Bestand
+        var stockMatch = true;
+        if (stockFilter === 'low') {
+            stockMatch = anzahl <= mindestbestand;
+        } else if (stockFilter === 'normal') {
+            stockMatch = anzahl > mindestbestand;
+        }
+
+        if (textMatch && categoryMatch && manufacturerMatch && locationMatch && stockMatch) {
+            row.classList.remove('hidden');
+            visibleCount++;
+        } else {
+            row.classList.add('hidden');
+        }
+    });
+
+    // Ergebnisse ausgeben
+    var resultsInfo = document.getElementById('resultsInfo');
+    if (visibleCount === totalParts) {
+        resultsInfo.textContent = 'Zeige alle ' + totalParts + ' Einträge';
+    } else {
+        resultsInfo.textContent = 'Zeige ' + visibleCount + ' von ' + totalParts + ' Einträgen';
+    }
+}
+
+// Sortierung
+function sortTable(columnIndex) {
+    var table = document.getElementById('storageTable');
+    var tbody = table.querySelector('tbody');
+    var rows = Array.from(tbody.querySelectorAll('tr:not(.hidden)'));
+
+    if (currentSortColumn === columnIndex) {
+        sortDirection = -sortDirection;
+    } else {
+        currentSortColumn = columnIndex;
+        sortDirection = 1;
+    }
+
+    rows.sort(function (a, b) {
+        var aValue = a.cells[columnIndex].textContent;
+        var bValue = b.cells[columnIndex].textContent;
+
+        if (columnIndex === 6 || columnIndex === 7) {
+            aValue = parseInt(aValue) || 0;
+            bValue = parseInt(bValue) || 0;
+            return (aValue - bValue) * sortDirection;
+        }
+
+        return aValue.localeCompare(bValue) * sortDirection;
+    });
+
+    // Sortierte Reihenfolge
+    rows.forEach(function (row) { tbody.appendChild(row); });
+
+    updateSortIndicators(columnIndex);
+}
+
+function updateSortIndicators(activeColumn) {
+    var headers = document.querySelectorAll('#storageTable th');
+    headers.forEach(function (header, index) {
+        var indicator = header.querySelector('.sort-indicator');
+        if (index === activeColumn) {
+            indicator.textContent = sortDirection === 1 ? ' ↑' : ' ↓';
+        } else {
+            indicator.textContent = ' ↕';
+        }
+    });
+}
+
+(function () {
+    var now = document.getElementById('now');
+    if (now) {
+        now.textContent = new Date().toLocaleString();
+    }
+    if (!document.getElementById('storageTable')) {
+        return;
+    }
+    // Event für Filter
+    document.getElementById('searchInput').addEventListener('input', filterTable);
+    document.getElementById('categoryFilter').addEventListener('change', filterTable);
+    document.getElementById('manufacturerFilter').addEventListener('change', filterTable);
+    document.getElementById('locationFilter').addEventListener('change', filterTable);
+    document.getElementById('stockFilter').addEventListener('change', filterTable);
+    updateSortIndicators(-1);
+})();
+"""
+
+# Berichtsvorlagen; $name wird escaped eingesetzt, vorgerenderte Blöcke kommen über raw
+REPORT_TEMPLATES = {
+    "comment": "<!-- $name $version by openw3rk INVENT -->",
+    "head": """<!DOCTYPE html>
+$comment
+<html lang="de">
+<head>
+    <meta charset="utf-8">
+    <title>$title</title>
+    <link rel="stylesheet" href="$stylesheet">
+</head>
+<body class="$body_class">
+""",
+    "tail": """$scripts
+</body>
+</html>
+""",
+    "script": """<script src="$src"></script>""",
+    "footer": """
+    <div class='footer-note'>
+        <p>Erstellt mit:<br>$name $version<br>$copyright</p>
+    </div>
+""",
+
+    # Beanstandungen
+    "defects": """
+    <div class='header'>
+        <h1>Beanstandungen - $vehicle</h1>
+        <p>FIN: $fin | Exportiert am: $exported</p>
+    </div>
+
+    <h2>Übersichtstabelle</h2>
+    <table class='table'>
+        <tr>
+            <th>Datum</th>
+            <th>KM-Stand</th>
+            <th>Beschreibung</th>
+            <th>Status</th>
+            <th>Priorität</th>
+            <th>Anmerkung</th>
+        </tr>
+$rows
+    </table>
+
+    <h2>Detaillierte Berichte</h2>
+$details
+$footer""",
+    "defect_row": """        <tr>
+            <td>$datum</td>
+            <td>$km_stand km</td>
+            <td>$beschreibung</td>
+            <td class='$status_class'>$status</td>
+            <td class='$priority_class'>$prioritaet</td>
+            <td>$anmerkung</td>
+        </tr>
+""",
+    "defect_detail": """    <div class='report-detail'>
+        <h3>Beanstandung #$nr - $datum</h3>
+        <p><strong>KM-Stand:</strong> $km_stand km</p>
+        <p><strong>Status:</strong> $status | <strong>Priorität:</strong> $prioritaet</p>
+        <p><strong>Beschreibung:</strong><br>$beschreibung</p>
+        <p><strong>Anmerkung:</strong><br>$anmerkung</p>
+    </div>
+""",
+
+    # Lagerbestand
+    "storage": """
+    <div class='header'>
+        <h1>Lagerbestand - Export</h1>
+        <p>Erstellt am: $exported | Gesamt: $total_parts im Bestand</p>
+    </div>
+
+    <!-- Filter- und Suchleiste -->
+    <div class="filter-bar">
+        <div class="filter-group">
+            <label for="searchInput">Suche:</label>
+            <input type="text" id="searchInput" class="filter-input" placeholder="Suchen...">
+        </div>
+
+        <div class="filter-group">
+            <label for="categoryFilter">Kategorie:</label>
+            <select id="categoryFilter" class="filter-input">
+                <option value="">Alle Kategorien</option>
+$categories
+            </select>
+        </div>
+
+        <div class="filter-group">
+            <label for="manufacturerFilter">Hersteller:</label>
+            <select id="manufacturerFilter" class="filter-input">
+                <option value="">Alle Hersteller</option>
+$manufacturers
+            </select>
+        </div>
+
+        <div class="filter-group">
+            <label for="locationFilter">Lagerplatz:</label>
+            <select id="locationFilter" class="filter-input">
+                <option value="">Alle Lagerplätze</option>
+$locations
+            </select>
+        </div>
+
+        <div class="filter-group">
+            <label for="stockFilter">Bestand:</label>
+            <select id="stockFilter" class="filter-input">
+                <option value="">Alle</option>
+                <option value="low">Niedriger Bestand</option>
+                <option value="normal">Normaler Bestand</option>
+            </select>
+        </div>
+    </div>
+
+    <div class="stats">
+        <div>Gesamt: <strong>$total_parts</strong> Einträge</div>
+        <div>Gesamtstückzahl: <strong>$total_items</strong></div>
+        <div>Niedriger Bestand: <strong>$low_stock_count</strong></div>
+    </div>
+
+    <div id="resultsInfo" class="results-info">
+        Zeige Bestand: $total_parts Einträge
+    </div>
+
+    <table class='table' id="storageTable">
+        <thead>
+            <tr>
+                <th onclick="sortTable(0)">Teilenummer <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(1)">Hersteller <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(2)">Bezeichnung <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(3)">Kategorie <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(4)">Lagerplatz <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(5)">Fach <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(6)">Anzahl <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(7)">Mindestbestand <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(8)">Einheit <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(9)">Hersteller-TNr <span class="sort-indicator">↕</span></th>
+                <th onclick="sortTable(10)">Zusatzinfos <span class="sort-indicator">↕</span></th>
+            </tr>
+        </thead>
+        <tbody>
+$rows
+        </tbody>
+    </table>
+
+    <div class='summary'>
+        <h3>Zusammenfassung</h3>
+        <p><strong>Gesamtanzahl Teile:</strong> $total_parts</p>
+        <p><strong>Gesamtstückzahl:</strong> $total_items</p>
+        <p><strong>Einträge mit niedrigem Bestand:</strong> $low_stock_count</p>
+        <p><strong>Lagerplätze:</strong> $location_count</p>
+        <p><strong>Hersteller:</strong> $manufacturer_count</p>
+        <p><strong>Kategorien:</strong> $category_count</p>
+    </div>
+$footer""",
+    "storage_option": """                <option value="$value">$value</option>
+""",
+    "storage_row": """            <tr class='table-row $row_class'
+                data-teilenummer="$teilenummer"
+                data-hersteller="$hersteller"
+                data-bezeichnung="$bezeichnung"
+                data-kategorie="$kategorie"
+                data-lagerplatz="$lagerplatz"
+                data-fach="$fach"
+                data-anzahl="$anzahl"
+                data-mindestbestand="$mindestbestand"
+                data-einheit="$einheit"
+                data-hersteller-tnr="$hersteller_teilenummer"
+                data-zusatzinfos="$zusatzinfos">
+                <td>$teilenummer</td>
+                <td>$hersteller</td>
+                <td>$bezeichnung</td>
+                <td>$kategorie</td>
+                <td>$lagerplatz</td>
+                <td>$fach</td>
+                <td>$anzahl</td>
+                <td>$mindestbestand</td>
+                <td>$einheit</td>
+                <td>$hersteller_teilenummer</td>
+                <td>$zusatzinfos</td>
+            </tr>
+""",
+
+    # HU/AU Übersicht
+    "hu_au": """
+    <div class='header'>
+        <h1>HU/AU Übersicht - Alle Fahrzeuge</h1>
+        <p>Exportiert am: $exported</p>
+    </div>
+
+    <!-- Statistik HU/AU -->
+    <div class='stats-grid'>
+        <div class='stat-item stat-überfällig'>
+            <div class='stat-value'>$overdue</div>
+            <div>Überfällig</div>
+        </div>
+        <div class='stat-item stat-diesen-monat'>
+            <div class='stat-value'>$this_month</div>
+            <div>Diesen Monat</div>
+        </div>
+        <div class='stat-item stat-nächsten-monat'>
+            <div class='stat-value'>$next_month</div>
+            <div>Nächsten Monat</div>
+        </div>
+        <div class='stat-item stat-nachprüfung'>
+            <div class='stat-value'>$retest</div>
+            <div>Nachprüfungen</div>
+        </div>
+        <div class='stat-item stat-erledigt'>
+            <div class='stat-value'>$done</div>
+            <div>Erledigt</div>
+        </div>
+    </div>
+
+    <table class='table'>
+        <tr>
+            <th>Fahrzeug</th>
+            <th>HU fällig</th>
+            <th>AU fällig</th>
+            <th>Status</th>
+            <th>Nächste Prüfung</th>
+            <th>Letzte HU</th>
+            <th>Letzte AU</th>
+            <th>Nachprüfung nötig</th>
+            <th>Anmerkung</th>
+        </tr>
+$rows
+    </table>
+
+    <div class='summary'>
+        <h3>Zusammenfassung</h3>
+        <p><strong>Gesamt Fahrzeuge:</strong> $total</p>
+        <p><strong>Überfällig:</strong> $overdue</p>
+        <p><strong>Diesen Monat fällig:</strong> $this_month</p>
+        <p><strong>Nächsten Monat fällig:</strong> $next_month</p>
+        <p><strong>Nachprüfungen:</strong> $retest</p>
+        <p><strong>Erledigt:</strong> $done</p>
+    </div>
+$footer""",
+    "hu_au_row": """        <tr>
+            <td>$vehicle</td>
+            <td>$hu_au_due</td>
+            <td>$au_due</td>
+            <td class='$status_class'>$status</td>
+            <td>$next_check</td>
+            <td>$last_hu_au</td>
+            <td>$last_au</td>
+            <td>$retest_info</td>
+            <td>$notes</td>
+        </tr>
+""",
+
+    # Aktivitäten
+    "activities": """
+    <div class="header">
+        <h1>Aktivitäten-Historie - $vehicle</h1>
+        <p>FIN: $fin | Exportiert am: $exported</p>
+    </div>
+
+    <div class="stats">
+        <h3>Statistik</h3>
+        <p><strong>Gesamtaktivitäten:</strong> $count</p>
+        <p><strong>Zeitraum:</strong> $first_date bis $last_date</p>
+        <p><strong>Letzter KM-Stand:</strong> $last_km km</p>
+    </div>
+$activities
+    <div class="footer-note">
+        <p>Erstellt mit $name $version<br>
+        $copyright<br>
+        https://openw3rk.de | https://o3measurement.openw3rk.de</p>
+    </div>
+""",
+    "activity": """
+    <div class="activity">
+        <div class="activity-header">
+            <div class="activity-type">$activity_type</div>
+            <div class="activity-date">$datum | $km_stand km</div>
+        </div>
+
+        <p><strong>Beschreibung:</strong><br>$beschreibung</p>
+
+        <p><strong>Durchgeführt durch:</strong> $erstellt_durch</p>
+$work$materials    </div>
+""",
+    "activity_work": """        <div class="work-list">
+            <strong>Durchgeführte Arbeiten:</strong>
+$items        </div>
+""",
+    "activity_work_item": """            <div class="work-item">• $arbeit ($dauer_minuten Min) $bemerkungen</div>
+""",
+    "activity_materials": """        <div class="material-list">
+            <strong>Verwendete Materialien:</strong>
+            <table>
+                <tr><th>Teilenummer</th><th>Bezeichnung</th><th>Menge</th><th>Einheit</th></tr>
+$rows            </table>
+        </div>
+""",
+    "material_row": """                <tr><td>$teilenummer</td><td>$bezeichnung</td><td>$menge_verbraucht</td><td>$einheit</td></tr>
+""",
+    "activity_single": """
+    <div class="header">
+        <h1>$activity_type</h1>
+        <p>Fahrzeug: $fahrzeug | Datum: $datum | KM-Stand: $km_stand km</p>
+    </div>
+
+    <div class="section">
+        <h3>Beschreibung</h3>
+        <p>$beschreibung</p>
+    </div>
+$work$materials
+    <div class="footer-note">
+        <p>Durchgeführt durch: $erstellt_durch</p>
+        <p>Erstellt mit $name $version<br>$copyright<br>
+        Erstellt am: $erstellt_am</p>
+    </div>
+""",
+    "activity_single_work": """    <div class="section">
+        <h3>Durchgeführte Arbeiten</h3>
+        <table>
+            <tr><th>Aktivität</th><th>Dauer (Min)</th><th>Bemerkungen</th></tr>
+$rows        </table>
+    </div>
+""",
+    "activity_single_work_row": """            <tr><td>$arbeit</td><td>$dauer_minuten</td><td>$bemerkungen</td></tr>
+""",
+    "activity_single_materials": """    <div class="section">
+        <h3>Verwendete Materialien</h3>
+        <table>
+            <tr><th>Teilenummer</th><th>Bezeichnung</th><th>Menge</th><th>Einheit</th></tr>
+$rows        </table>
+    </div>
+""",
+
+    # Fahrzeug
+    "vehicle_comment": """<!--
+
+***********************************************************************
+* o3Measurement Version $version by openw3rk INVENT - VEHICLE SOLUTIONS *
+*             https://openw3rk.de | https://vs.openw3rk.de            *
+*                  - Copyright (c) openw3rk INVENT -                  *
+***********************************************************************
+
+-->
+<!--
+
+INFORMATION:
+o3Measurement EXPORT | VEHICLE: $vehicle
+o3Measurement EXPORT | VEHICLE DESCRIPTION: $description
+
+-->""",
+    "vehicle": """
+    <div class='header'>
+        <h1>$vehicle</h1>
+        <p>$description</p>
+    </div>
+
+    <div id="imgModal" class="modal" onclick="this.style.display='none'">
+        <img id="modalImg">
+    </div>
+$sections
+    <div class='footer'>
+        <h5>Erstellt mit:<br>$name Version $version<br>openw3rk INVENT - Vehicle Solutions</h5>
+        <p>Zeitpunkt: <span id="now"></span></p>
+    </div>
+""",
+    "vehicle_section": """
+    <div class='section'>
+        <h2>$title</h2>
+$content    </div>
+""",
+    "vehicle_table": """        <table class='$table_class'>
+$rows        </table>
+""",
+    "vehicle_spec_row": """            <tr><th>$key</th><td>$value</td></tr>
+""",
+    "vehicle_fluids_head": """            <tr><th>Flüssigkeit</th><th>Spezifikation</th><th>Menge</th></tr>
+""",
+    "vehicle_fluid_row": """            <tr><td>$name</td><td>$spezifikation</td><td>$menge</td></tr>
+""",
+    "vehicle_parts_head": """            <tr><th>Bauteil</th><th>Teilenummer</th><th>Motor Code</th></tr>
+""",
+    "vehicle_part_row": """            <tr><td>$bauteil</td><td>$teilenummer</td><td>$motor_code</td></tr>
+""",
+    "vehicle_last_oil": """        <p><strong>Letzter Ölwechsel:</strong> $km km am $datum</p>
+""",
+    "vehicle_intervals": """        <h3>Service-Intervalle</h3>
+        <table class='fluids-table'>
+            <tr><th>Service</th><th>Intervall</th></tr>
+$rows        </table>
+""",
+    "vehicle_interval_row": """            <tr><td>$service</td><td>$interval $unit</td></tr>
+""",
+    "vehicle_attachments": """        <div class='attachments'>
+$items        </div>
+""",
+    "vehicle_image": """            <div class='attachment'>
+                <img src='$src' alt='$filename' data-full='$full' loading='lazy' onclick="showModal(this.dataset.full || this.src)"><br>
+                $filename
+            </div>
+""",
+    "fleet_index": """
+    <div class='header'>
+        <h1>Fuhrpark-Berichte</h1>
+        <p>Erstellt am: $exported | Fahrzeuge: $count</p>
+    </div>
+
+    <div class='summary'>
+        <p><a href="$hu_au_href">HU/AU Übersicht aller exportierten Fahrzeuge</a></p>
+        <p><strong>Fehlgeschlagen:</strong> $failed</p>
+    </div>
+
+    <table class='table'>
+        <tr>
+            <th>Fahrzeug</th>
+            <th>Beschreibung</th>
+            <th>Berichte</th>
+            <th>Hinweis</th>
+        </tr>
+$rows
+    </table>
+$footer""",
+    "fleet_index_row": """        <tr>
+            <td>$vehicle</td>
+            <td>$description</td>
+            <td>$links</td>
+            <td class='$error_class'>$error</td>
+        </tr>
+""",
+    "fleet_link": """<a href="$href">$title</a>""",
+    "vehicle_file": """            <div class='attachment'>
+                <strong>$filename</strong><br>
+                ($mimetype)
+            </div>
+""",
+}
+
+
+class ReportRenderer:
+    STYLESHEET = "o3report.css"
+    SCRIPT = "o3report.js"
+    FIELD_RE = re.compile(r"\$(\w+)")
+
+    def __init__(self, templates: dict, assets: dict):
+        self._sources = templates
+        self._compiled = {}
+        # Assets einmal kodieren, geschrieben wird nur bei fehlender oder abweichender Datei
+        self._assets = {name: content.encode("utf-8") for name, content in assets.items()}
+        # ändert sich mit Vorlagen, Assets oder Version; Teil jedes Eingabe-Hashs der Berichte
+        self.fingerprint = hashlib.sha256(json.dumps([o3VERSION, templates, assets], sort_keys=True).encode("utf-8")).hexdigest()
+        self._written = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def escape(value):
+        if value is None:
+            return ""
+        return html_escape(value if value.__class__ is str else str(value))
+
+    @classmethod
+    def escape_lines(cls, value):
+        return cls.escape(value).replace("\n", "<br>")
+
+    def compiled(self, name):
+        # Vorlage einmal in einen Formatstring mit Positionsfeldern übersetzen
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            source = self._sources[name].replace("{", "{{").replace("}", "}}")
+            fields = []
+            def field(match):
+                key = match.group(1)
+                if key not in fields:
+                    fields.append(key)
+                return "{%d}" % fields.index(key)
+            compiled = self._compiled[name] = (self.FIELD_RE.sub(field, source).format, tuple(fields))
+        return compiled
+
+    def render(self, template, raw=None, multiline=(), **fields):
+        fmt, names = self.compiled(template)
+        values = []
+        for key in names:
+            if raw is not None and key in raw:
+                values.append(raw[key])
+            elif key in multiline:
+                values.append(self.escape_lines(fields[key]))
+            else:
+                values.append(self.escape(fields[key]))
+        return fmt(*values)
+
+    def rows(self, template, items, multiline=()):
+        # Schneller Pfad für Zeilenfragmente: Feldliste steht fest, nur escapen und einsetzen
+        fmt, names = self.compiled(template)
+        esc = self.escape
+        esc_lines = self.escape_lines
+        converters = [esc_lines if key in multiline else esc for key in names]
+        pairs = list(zip(names, converters))
+        return ''.join(fmt(*[convert(item[key]) for key, convert in pairs]) for item in items)
+
+    def page(self, title, body_class, content, comment=None, script=False):
+        if comment is None:
+            comment = self.render("comment", name=o3NAME, version=o3VERSION)
+        head = self.render("head", raw={"comment": comment}, title=title,
+                           stylesheet=self.STYLESHEET, body_class=body_class)
+        scripts = self.render("script", src=self.SCRIPT) if script else ""
+        return head + content + self.render("tail", raw={"scripts": scripts})
+
+    def footer(self):
+        return self.render("footer", name=o3NAME, version=o3VERSION, copyright=o3COPYRIGHT)
+
+    def write_assets(self, folder):
+        folder = Path(folder)
+        with self._lock:
+            for name, data in self._assets.items():
+                target = folder / name
+                try:
+                    st = target.stat()
+                    known = self._written.get(str(target))
+                    if known == (st.st_size, st.st_mtime_ns):
+                        continue
+                    if st.st_size == len(data) and target.read_bytes() == data:
+                        self._written[str(target)] = (st.st_size, st.st_mtime_ns)
+                        continue
+                except OSError:
+                    pass
+                tmp = target.with_name(target.name + ".tmp")
+                with open(tmp, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp, target)
+                st = target.stat()
+                self._written[str(target)] = (st.st_size, st.st_mtime_ns)
+
+    def write(self, path, html):
+        # Bericht plus gemeinsame Assets im selben Ordner
+        path = Path(path)
+        self.write_assets(path.parent)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp, path)
+
+
+REPORT_RENDERER = ReportRenderer(REPORT_TEMPLATES, {ReportRenderer.STYLESHEET: REPORT_CSS, ReportRenderer.SCRIPT: REPORT_JS})
+
+
+# Berichte als Funktionen, damit sie auch ohne Dialog (Sammel-Export) nutzbar sind
+def render_defects_report(vehicle):
+    reports = vehicle.defect_reports
+    rows = REPORT_RENDERER.rows("defect_row", ({
+        'datum': report['datum'],
+        'km_stand': report['km_stand'],
+        'beschreibung': report['beschreibung'],
+        'status_class': "status-behoben" if report['status'] == 'Behoben' else "status-storniert" if report['status'] == 'Storniert' else "",
+        'status': report['status'],
+        'priority_class': "priority-kritisch" if report['priorität'] == 'Kritisch' else "priority-hoch" if report['priorität'] == 'Hoch' else "",
+        'prioritaet': report['priorität'],
+        'anmerkung': report.get('Anmerkung', ''),
+    } for report in reports))
+    details = REPORT_RENDERER.rows("defect_detail", ({
+        'nr': i,
+        'datum': report['datum'],
+        'km_stand': report['km_stand'],
+        'status': report['status'],
+        'prioritaet': report['priorität'],
+        'beschreibung': report['beschreibung'],
+        'anmerkung': report.get('Anmerkung', 'Keine Anmerkung eingetragen'),
+    } for i, report in enumerate(reports, 1)), multiline=('beschreibung', 'anmerkung'))
+
+    content = REPORT_RENDERER.render("defects", raw={'rows': rows, 'details': details, 'footer': REPORT_RENDERER.footer()},
+                                     vehicle=vehicle.name,
+                                     fin=vehicle.specifications.get('fin', ''),
+                                     exported=datetime.now().strftime("%d.%m.%Y %H:%M"))
+    return REPORT_RENDERER.page(f"Beanstandungen - {vehicle.name}", "report-defects", content)
+
+
+def render_storage_report(items):
+    # Daten für Filter
+    categories = sorted(set(item.kategorie for item in items if item.kategorie))
+    manufacturers = sorted(set(item.hersteller for item in items if item.hersteller))
+    locations = sorted(set(item.lagerplatz for item in items if item.lagerplatz))
+    
+    # Zusammenfassungsdaten
+    total_items = sum(item.anzahl for item in items)
+    low_stock_count = sum(1 for item in items if item.anzahl <= item.mindestbestand)
+    total_parts = len(items)
+    
+    def options(values):
+        return REPORT_RENDERER.rows("storage_option", ({'value': value} for value in values))
+    
+    # Tabellendaten
+    rows = REPORT_RENDERER.rows("storage_row", ({
+        'row_class': "low-stock" if item.anzahl <= item.mindestbestand else "",
+        'teilenummer': item.teilenummer,
+        'hersteller': item.hersteller,
+        'bezeichnung': item.bezeichnung,
+        'kategorie': item.kategorie,
+        'lagerplatz': item.lagerplatz,
+        'fach': item.fach,
+        'anzahl': item.anzahl,
+        'mindestbestand': item.mindestbestand,
+        'einheit': item.einheit,
+        'hersteller_teilenummer': item.hersteller_teilenummer,
+        'zusatzinfos': item.zusatzinfos,
+    } for item in items))
+    
+    content = REPORT_RENDERER.render("storage",
+                                     raw={'categories': options(categories), 'manufacturers': options(manufacturers),
+                                          'locations': options(locations), 'rows': rows, 'footer': REPORT_RENDERER.footer()},
+                                     exported=datetime.now().strftime("%d.%m.%Y %H:%M"),
+                                     total_parts=total_parts, total_items=total_items, low_stock_count=low_stock_count,
+                                     location_count=len(locations), manufacturer_count=len(manufacturers),
+                                     category_count=len(categories))
+    return REPORT_RENDERER.page("Lagerbestand - Export", "report-storage", content, script=True)
+
+
+def render_hu_au_report(entries):
+    current_date = datetime.now()
+
+    # Statistik berechnen
+    stats = {
+        'gesamt': len(entries),
+        'überfällig': 0,
+        'diesen_monat': 0,
+        'nächsten_monat': 0,
+        'nachprüfung': 0,
+        'erledigt': 0
+    }
+
+    for entry in entries:
+        if 'überfällig' in entry['status'].lower():
+            stats['überfällig'] += 1
+        elif 'diesen monat' in entry['status'].lower():
+            stats['diesen_monat'] += 1
+        elif 'nächsten monat' in entry['status'].lower():
+            stats['nächsten_monat'] += 1
+        elif 'nachprüfung' in entry['status'].lower():
+            stats['nachprüfung'] += 1
+        elif entry['status'] == 'Erledigt':
+            stats['erledigt'] += 1
+
+    rows = []
+    for entry in entries:
+        # Status-Klasse für CSS
+        status_class = ""
+        if 'überfällig' in entry['status'].lower():
+            status_class = 'status-überfällig'
+        elif 'diesen monat' in entry['status'].lower():
+            status_class = 'status-diesen-monat'
+        elif 'nächsten monat' in entry['status'].lower():
+            status_class = 'status-nächsten-monat'
+        elif 'nachprüfung' in entry['status'].lower():
+            status_class = 'status-nachprüfung'
+        elif entry['status'] == 'Erledigt':
+            status_class = 'status-erledigt'
+
+        # Nachprüfungs-Info
+        retest_info = "Nein"
+        if entry['needs_retest']:
+            if entry['retest_date']:
+                retest_info = f"Ja ({entry['retest_date']})"
+            else:
+                retest_info = "Ja"
+
+        rows.append(dict(entry, status_class=status_class, retest_info=retest_info))
+
+    content = REPORT_RENDERER.render("hu_au", raw={'rows': REPORT_RENDERER.rows("hu_au_row", rows), 'footer': REPORT_RENDERER.footer()},
+                                     exported=current_date.strftime("%d.%m.%Y %H:%M"),
+                                     total=stats['gesamt'], overdue=stats['überfällig'],
+                                     this_month=stats['diesen_monat'], next_month=stats['nächsten_monat'],
+                                     retest=stats['nachprüfung'], done=stats['erledigt'])
+    return REPORT_RENDERER.page("HU/AU Übersicht", "report-hu-au", content)
+
+
+def render_activities_report(vehicle, activities_to_export):
+    # Aktivitäten auflisten
+    blocks = []
+    for activity in activities_to_export:
+        work = ""
+        if activity.get('durchgeführte_arbeiten'):
+            items = REPORT_RENDERER.rows("activity_work_item", ({
+                'arbeit': arbeit.get('arbeit', ''),
+                'dauer_minuten': arbeit.get('dauer_minuten', 0),
+                'bemerkungen': f"- {arbeit.get('bemerkungen', '')}" if arbeit.get('bemerkungen') else "",
+            } for arbeit in activity['durchgeführte_arbeiten']))
+            work = REPORT_RENDERER.render("activity_work", raw={'items': items})
+
+        materials = ""
+        if activity.get('verwendete_materialien'):
+            materials = REPORT_RENDERER.render("activity_materials", raw={'rows': render_material_rows(activity['verwendete_materialien'])})
+
+        blocks.append(REPORT_RENDERER.render("activity", raw={'work': work, 'materials': materials}, multiline=('beschreibung',),
+                                             activity_type=activity.get('activity_type', ''),
+                                             datum=activity.get('datum', ''),
+                                             km_stand=activity.get('km_stand', ''),
+                                             beschreibung=activity.get('beschreibung', ''),
+                                             erstellt_durch=activity.get('erstellt_durch', '')))
+
+    first = activities_to_export[-1] if activities_to_export else {}
+    last = activities_to_export[0] if activities_to_export else {}
+    content = REPORT_RENDERER.render("activities", raw={'activities': ''.join(blocks)},
+                                     vehicle=vehicle.name,
+                                     fin=vehicle.specifications.get('fin', ''),
+                                     exported=datetime.now().strftime("%d.%m.%Y %H:%M"),
+                                     count=len(activities_to_export),
+                                     first_date=first.get('datum', ''),
+                                     last_date=last.get('datum', ''),
+                                     last_km=last.get('km_stand', ''),
+                                     name=o3NAME, version=o3VERSION, copyright=o3COPYRIGHT)
+    return REPORT_RENDERER.page(f"Aktivitäten-Historie - {vehicle.name}", "report-dark report-activities", content)
+
+
+def render_material_rows(materials):
+    return REPORT_RENDERER.rows("material_row", ({
+        'teilenummer': material.get('teilenummer', ''),
+        'bezeichnung': material.get('bezeichnung', ''),
+        'menge_verbraucht': material.get('menge_verbraucht', ''),
+        'einheit': material.get('einheit', ''),
+    } for material in materials))
+
+
+def copy_vehicle_attachments(vehicle, export_dir):
+    # Originale neben den Bericht legen, unveränderte Dateien (gleiche Größe) bleiben liegen
+    store = AttachmentStore()
+    export_dir = Path(export_dir)
+    for attachment in vehicle.attachments:
+        target = export_dir / attachment['filename']
+        size = attachment.get('size')
+        if size and target.exists() and target.stat().st_size == size:
+            continue
+        source_path = store.get_path(attachment)
+        if source_path:
+            shutil.copyfile(source_path, target)
+        elif attachment.get('data'):
+            with open(target, 'wb') as f:
+                f.write(store.read_bytes(attachment))
+
+
+def render_vehicle_report(vehicle, include_images=False, export_dir=None):
+    render = REPORT_RENDERER.render
+    rows = REPORT_RENDERER.rows
+
+    def section(title, content):
+        return render("vehicle_section", raw={'content': content}, title=title)
+
+    def table(table_class, body):
+        return render("vehicle_table", raw={'rows': body}, table_class=table_class)
+
+    # Spezifikationen
+    specs = vehicle.specifications
+    sections = [section("Fahrzeugspezifikationen", table("specs-table", rows("vehicle_spec_row", (
+        {'key': key.capitalize(), 'value': value}
+        for key, value in specs.items() if key != 'fluessigkeiten' and value))))]
+
+    # Flüssigkeiten
+    fluids = specs.get('fluessigkeiten', {})
+    if fluids:
+        body = render("vehicle_fluids_head") + rows("vehicle_fluid_row", (
+            {'name': fluid_name, 'spezifikation': fluid_spec.get('spezifikation', ''), 'menge': fluid_spec.get('menge', '')}
+            for fluid_name, fluid_spec in fluids.items()))
+        sections.append(section("Flüssigkeiten", table("fluids-table", body)))
+
+    if vehicle.parts:
+        body = render("vehicle_parts_head") + rows("vehicle_part_row", (
+            {'bauteil': part.get('bauteil', ''), 'teilenummer': part.get('teilenummer', ''), 'motor_code': part.get('motor_code', '')}
+            for part in vehicle.parts))
+        sections.append(section("Bauteile und Teilenummern", table("parts-table", body)))
+
+    if vehicle.service_history or vehicle.service_intervals:
+        content = ""
+        if vehicle.last_service.get('ölwechsel_km'):
+            content += render("vehicle_last_oil", km=vehicle.last_service.get('ölwechsel_km'),
+                              datum=vehicle.last_service.get('ölwechsel_datum', ''))
+        if vehicle.service_intervals:
+            content += render("vehicle_intervals", raw={'rows': rows("vehicle_interval_row", (
+                {'service': service, 'interval': interval, 'unit': SERVICE_TYPES.get(service, {}).get('unit', 'km')}
+                for service, interval in vehicle.service_intervals.items()))})
+        sections.append(section("Service-Informationen", content))
+
+    # Anhänge/scans
+    if vehicle.attachments and include_images:
+        store = AttachmentStore()
+        images = [attachment for attachment in vehicle.attachments if attachment['mimetype'] == 'image']
+        # Vorschaubilder statt Originale einbetten, das Original öffnet per Klick
+        thumbs = dict(zip((id(attachment) for attachment in images), ThumbnailCache(store=store).thumbnails(images)))
+        if export_dir:
+            (Path(export_dir) / "thumbs").mkdir(exist_ok=True)
+        items = []
+        for attachment in vehicle.attachments:
+            if attachment['mimetype'] == 'image':
+                thumb = thumbs.get(id(attachment))
+                if export_dir:
+                    full_src = url_quote(attachment['filename'])
+                    if thumb:
+                        shutil.copyfile(thumb, Path(export_dir) / "thumbs" / thumb.name)
+                        img_src = f"thumbs/{thumb.name}"
+                    else:
+                        img_src = full_src
+                else:
+                    full_src = ""
+                    # Bytes erst hier lesen, ohne Vorschau notfalls das Original
+                    if thumb:
+                        image_data = thumb.read_bytes()
+                    else:
+                        image_data = store.read_bytes(attachment) or b""
+                    img_src = f"data:image/jpeg;base64,{base64.b64encode(image_data).decode('ascii')}"
+                items.append(render("vehicle_image", src=img_src, full=full_src, filename=attachment['filename']))
+            else:
+                items.append(render("vehicle_file", filename=attachment['filename'], mimetype=attachment['mimetype']))
+        sections.append(section("Dokumente und Scans", render("vehicle_attachments", raw={'items': ''.join(items)})))
+
+    comment = render("vehicle_comment", version=o3VERSION, vehicle=vehicle.name, description=vehicle.description)
+    content = render("vehicle", raw={'sections': ''.join(sections)}, vehicle=vehicle.name,
+                     description=vehicle.description, name=o3NAME, version=o3VERSION)
+    return REPORT_RENDERER.page(vehicle.name, "report-vehicle", content, comment=comment, script=True)
+
+
+class DefectReportsDialog(QtWidgets.QDialog):
+    def __init__(self, vehicle: Vehicle, parent=None):
+        super().__init__(parent)
+        self.vehicle = vehicle
+        self.setWindowTitle(f"Beanstandungsaufnahme - {vehicle.name}")
+        
+        # Autoscaling
+        screen = QtWidgets.QApplication.primaryScreen()
+        screen_geometry = screen.availableGeometry()
+        self.setMinimumSize(790, 500)
+        self.resize(int(screen_geometry.width() * 0.9), int(screen_geometry.height() * 0.85))
+        
+        layout = QtWidgets.QVBoxLayout(self)
+        
+        # Fahrzeug info oben
+        vehicle_info = QtWidgets.QGroupBox("Fahrzeuginformation")
+        vehicle_layout = QtWidgets.QHBoxLayout()
+        vehicle_layout.addWidget(QtWidgets.QLabel(f"Fahrzeug: {vehicle.name}"))
+        vehicle_layout.addWidget(QtWidgets.QLabel(f"FIN: {vehicle.specifications.get('fin', '')}"))
+        vehicle_layout.addWidget(QtWidgets.QLabel(f"Aktueller KM-Stand: {vehicle.last_service.get('ölwechsel_km', '0')} km"))
+        vehicle_layout.addStretch()
+        vehicle_info.setLayout(vehicle_layout)
+        layout.addWidget(vehicle_info)
+        
+        # für hauptinhalt
+        scroll_area = QtWidgets.QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        container = QtWidgets.QWidget()
+        container_layout = QtWidgets.QVBoxLayout(container)
+        
+        # Neue Beanstandung
+        new_report_group = QtWidgets.QGroupBox("Neue Beanstandung erfassen")
+        new_report_layout = QtWidgets.QFormLayout()
+        
+        # Erste Zeile: Datum und KM-Stand
+        date_km_layout = QtWidgets.QHBoxLayout()
+        
+        self.date_edit = QtWidgets.QDateEdit()
+        self.date_edit.setCalendarPopup(True)
+        self.date_edit.setDate(QtCore.QDate.currentDate())
+        date_km_layout.addWidget(QtWidgets.QLabel("Datum:"))
+        date_km_layout.addWidget(self.date_edit)
+        
+        self.km_edit = QtWidgets.QSpinBox()
         self.km_edit.setRange(0, 1000000)
         self.km_edit.setValue(self.vehicle.last_service.get('ölwechsel_km', 0))
         date_km_layout.addWidget(QtWidgets.QLabel("KM-Stand:"))
@@ -3084,13 +5315,7 @@ class DefectReportsDialog(QtWidgets.QDialog):
         QtWidgets.QMessageBox.information(self, "Erfolg", "Beanstandung wurde hinzugefügt und gespeichert.")
     
     def _auto_save_vehicle(self):
-        try:
-            self.vehicle.ensure_directories()
-            vehicle_file = self.vehicle.get_vehicle_dir() / "vehicle.json"
-            with open(vehicle_file, "w", encoding="utf-8") as f:
-                json.dump(self.vehicle.to_dict(), f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            QtWidgets.QMessageBox.warning(self, "Auto-Save Fehler", f"Fehler beim Speichern: {e}")
+        VehicleSaveScheduler.instance().schedule(self.vehicle)
     
     def remove_defect_report(self):
         current_row = self.defects_table.currentRow()
@@ -3130,87 +5355,11 @@ class DefectReportsDialog(QtWidgets.QDialog):
                                                         str(VEHICLES_BASE_DIR / f"{self.vehicle.name}_beanstandungen.html"), 
                                                         "HTML Dateien (*.html)")
         if fname:
-            html = self._generate_defects_html()
-            with open(fname, 'w', encoding='utf-8') as f:
-                f.write(html)
+            REPORT_RENDERER.write(fname, self._generate_defects_html())
             QtWidgets.QMessageBox.information(self, "Erfolg", f"Beanstandungen exportiert: {fname}")
     
     def _generate_defects_html(self):
-        html = f"""
-        <html>
-        <head>
-            <meta charset='utf-8'>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background: #2c3e50; color: white; padding: 20px; border-radius: 5px; }}
-                .table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-                .table th, .table td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                .table th {{ background-color: #f2f2f2; }}
-                .status-behoben {{ background-color: #d4edda; }}
-                .status-storniert {{ background-color: #e2e3e5; }}
-                .priority-kritisch {{ background-color: #f8d7da; font-weight: bold; }}
-                .priority-hoch {{ background-color: #fff3cd; }}
-                .report-detail {{ margin: 10px 0; padding: 10px; background: #f8f9fa; border-left: 4px solid #007bff; }}
-            </style>
-        </head>
-        <body>
-            <div class='header'>
-                <h1>Beanstandungen - {self.vehicle.name}</h1>
-                <p>FIN: {self.vehicle.specifications.get('fin', '')} | Exportiert am: {datetime.now().strftime("%d.%m.%Y %H:%M")}</p>
-            </div>
-            
-            <h2>Übersichtstabelle</h2>
-            <table class='table'>
-                <tr>
-                    <th>Datum</th>
-                    <th>KM-Stand</th>
-                    <th>Beschreibung</th>
-                    <th>Status</th>
-                    <th>Priorität</th>
-                    <th>Anmerkung</th>
-                </tr>
-        """
-        
-        for report in self.vehicle.defect_reports:
-            status_class = "status-behoben" if report['status'] == 'Behoben' else "status-storniert" if report['status'] == 'Storniert' else ""
-            priority_class = "priority-kritisch" if report['priorität'] == 'Kritisch' else "priority-hoch" if report['priorität'] == 'Hoch' else ""
-            
-            html += f"""
-                <tr>
-                    <td>{report['datum']}</td>
-                    <td>{report['km_stand']} km</td>
-                    <td>{report['beschreibung']}</td>
-                    <td class='{status_class}'>{report['status']}</td>
-                    <td class='{priority_class}'>{report['priorität']}</td>
-                    <td>{report.get('Anmerkung', '')}</td>
-                </tr>
-            """
-        
-        html += """
-            </table>
-            
-            <h2>Detaillierte Berichte</h2>
-        """
-        
-        for i, report in enumerate(self.vehicle.defect_reports, 1):
-            html += f"""
-            <div class='report-detail'>
-                <h3>Beanstandung #{i} - {report['datum']}</h3>
-                <p><strong>KM-Stand:</strong> {report['km_stand']} km</p>
-                <p><strong>Status:</strong> {report['status']} | <strong>Priorität:</strong> {report['priorität']}</p>
-                <p><strong>Beschreibung:</strong><br>{report['beschreibung'].replace(chr(10), '<br>')}</p>
-                <p><strong>Anmerkung:</strong><br>{report.get('Anmerkung', 'Keine Anmerkung eingetragen').replace(chr(10), '<br>')}</p>
-            </div>
-            """
-        
-        html += f"""
-            <div style='margin-top: 20px; color: #666;'>
-                <p>Erstellt mit:<br>o3Measurement {o3VERSION}<br>{o3COPYRIGHT}</p>
-            </div>
-        </body>
-        </html>
-        """
-        return html
+        return render_defects_report(self.vehicle)
 
 class DefectReportDetailDialog(QtWidgets.QDialog):
     def __init__(self, report_data: dict, parent=None, read_only=False):
@@ -3346,67 +5495,549 @@ class StorageItem:
         item.geaendert_am = d.get('geaendert_am', '')
         return item
 
+# Volltextsuche im Lager: Trigramm-Index über die Suchfelder plus Mengen je Kategorie/Hersteller/Lagerplatz.
+# Teilstring-Suchen prüfen nur noch die Kandidaten aus dem Index statt alle Teile.
+class StorageSearchIndex:
+    SEARCH_FIELDS = ('teilenummer', 'hersteller', 'bezeichnung', 'kategorie', 'lagerplatz',
+                     'zusatzinfos', 'hersteller_teilenummer')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.items = {}  # db_id -> StorageItem
+        self._texts = {}  # db_id -> kleingeschriebene Suchfelder, getrennt durch \x00
+        self._keys = {}  # db_id -> (kategorie, hersteller, lagerplatz)
+        self._trigrams = {}  # Trigramm -> Menge von db_ids
+        self.by_category = {}
+        self.by_manufacturer = {}
+        self.by_location = {}
+
+    @staticmethod
+    def _item_trigrams(text):
+        trigrams = set()
+        for field in text.split("\x00"):
+            for i in range(len(field) - 2):
+                trigrams.add(field[i:i + 3])
+        return trigrams
+
+    def add(self, item):
+        key = item.db_id
+        text = "\x00".join((getattr(item, field) or "").lower() for field in self.SEARCH_FIELDS)
+        keys = (item.kategorie, item.hersteller, item.lagerplatz)
+        self.items[key] = item
+        self._texts[key] = text
+        self._keys[key] = keys
+        for trigram in self._item_trigrams(text):
+            self._trigrams.setdefault(trigram, set()).add(key)
+        for postings, value in zip((self.by_category, self.by_manufacturer, self.by_location), keys):
+            postings.setdefault(value, set()).add(key)
+
+    def remove(self, item):
+        key = item.db_id
+        if key not in self.items:
+            return
+        # Mit den gespeicherten Werten austragen, das Objekt kann inzwischen verändert sein
+        for trigram in self._item_trigrams(self._texts.pop(key)):
+            postings = self._trigrams.get(trigram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._trigrams[trigram]
+        for postings, value in zip((self.by_category, self.by_manufacturer, self.by_location), self._keys.pop(key)):
+            entries = postings.get(value)
+            if entries is not None:
+                entries.discard(key)
+                if not entries:
+                    del postings[value]
+        del self.items[key]
+
+    def query(self, search_term="", kategorie="", hersteller="", lagerplatz=""):
+        candidates = None
+        # Exakte Filter über die Mengen, kleinste zuerst
+        filter_sets = []
+        for postings, value in ((self.by_category, kategorie), (self.by_manufacturer, hersteller),
+                                (self.by_location, lagerplatz)):
+            if value:
+                filter_sets.append(postings.get(value, set()))
+        
+        search_term = search_term.lower()
+        if len(search_term) >= 3:
+            # Seltenstes Trigramm reicht als Kandidatenmenge, der Rest wird am Text geprüft
+            trigram_sets = [self._trigrams.get(search_term[i:i + 3], set()) for i in range(len(search_term) - 2)]
+            filter_sets.append(min(trigram_sets, key=len))
+        
+        for key_set in sorted(filter_sets, key=len):
+            candidates = key_set if candidates is None else candidates & key_set
+            if not candidates:
+                return []
+        
+        if candidates is None:
+            candidates = self.items.keys()
+        
+        # Trigramme liefern nur Kandidaten, Treffer werden am Text bestätigt
+        # (bei genau 3 Zeichen ist der Trigramm-Treffer bereits exakt)
+        if search_term and len(search_term) != 3:
+            texts = self._texts
+            candidates = [key for key in candidates if search_term in texts[key]]
+        
+        items = self.items
+        return [items[key] for key in sorted(candidates)]
+
+
+# Lagerbestand in SQLite (WAL), jede Änderung schreibt nur die betroffene Zeile.
+# lagerbestand.json bleibt als Import/Export-Format erhalten (Kompatibilität, Backups).
+# Bestandsänderungen (anzahl) landen als Zeile im Bewegungsjournal lagerbewegungen.jsonl.
+# Die Datenbank ist der Snapshot bis journal_offset, der Rest des Journals wird beim Laden nachgespielt.
 class StorageManager:
+    ITEM_FIELDS = ('teilenummer', 'hersteller', 'bezeichnung', 'kategorie', 'lagerplatz', 'fach',
+                   'anzahl', 'mindestbestand', 'einheit', 'zusatzinfos', 'hersteller_teilenummer',
+                   'erstellt_am', 'geaendert_am')
+    JOURNAL_COMPACT_BYTES = 256 * 1024  # ab dieser Journal-Länge seit dem Snapshot wird verdichtet
+    _compact_lock = threading.Lock()
+
     def __init__(self):
         self.storage_file = STORAGE_DIR / "lagerbestand.json"
+        self.db_file = STORAGE_DIR / "lagerbestand.db"
+        self.journal_file = STORAGE_DIR / "lagerbewegungen.jsonl"
         self.items = []
+        # Indizes Teilenummer/Hersteller-Teilenummer -> Liste der Teile (Teilenummern sind nicht erzwungen eindeutig)
+        self._by_part_number = {}
+        self._by_manufacturer_part_number = {}
+        self.search_index = StorageSearchIndex()
+        self.conn = None
+        self._open_database()
         self.load_storage()
-    
+
+    def _open_database(self):
+        self.conn = sqlite3.connect(str(self.db_file))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    teilenummer TEXT, hersteller TEXT, bezeichnung TEXT, kategorie TEXT,
+                    lagerplatz TEXT, fach TEXT, anzahl INTEGER, mindestbestand INTEGER,
+                    einheit TEXT, zusatzinfos TEXT, hersteller_teilenummer TEXT,
+                    erstellt_am TEXT, geaendert_am TEXT
+                )""")
+            for column in ('teilenummer', 'hersteller', 'kategorie', 'lagerplatz'):
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_items_{column} ON items({column})")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _json_mtime(self):
+        try:
+            return str(self.storage_file.stat().st_mtime_ns)
+        except OSError:
+            return None
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
     def load_storage(self):
-        if self.storage_file.exists():
-            try:
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.items = [StorageItem.from_dict(item) for item in data]
-            except Exception as e:
-                print(f"Fehler beim Laden des Lagerbestands: {e}")
-                self.items = []
-        else:
+        # Neue/zurückgespielte lagerbestand.json übernehmen (Erstmigration, Backup-Restore)
+        json_mtime = self._json_mtime()
+        if json_mtime and json_mtime != self._get_meta('json_mtime'):
+            self.import_json(self.storage_file)
+        
+        try:
+            # Snapshot und Journal-Offset in einer Lesetransaktion holen (Verdichtung läuft evtl. parallel)
+            columns = ", ".join(self.ITEM_FIELDS)
+            self.conn.execute("BEGIN")
+            rows = self.conn.execute(f"SELECT id, {columns} FROM items ORDER BY id").fetchall()
+            journal_offset = int(self._get_meta('journal_offset', 0))
+            self.conn.commit()
+            self.items = [self._item_from_row(row) for row in rows]
+            self._replay_journal(journal_offset)
+        except Exception as e:
+            print(f"Fehler beim Laden des Lagerbestands: {e}")
             self.items = []
-    
-    def save_storage(self):
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        self._by_part_number = {}
+        self._by_manufacturer_part_number = {}
+        self.search_index.clear()
+        for item in self.items:
+            self._index_item(item)
+
+    def _index_item(self, item):
+        if item.teilenummer:
+            self._by_part_number.setdefault(item.teilenummer, []).append(item)
+        if item.hersteller_teilenummer:
+            self._by_manufacturer_part_number.setdefault(item.hersteller_teilenummer, []).append(item)
+        if getattr(item, 'db_id', None) is not None:
+            self.search_index.add(item)
+
+    def _unindex_item(self, item):
+        self.search_index.remove(item)
+        for index, key in ((self._by_part_number, item.teilenummer),
+                           (self._by_manufacturer_part_number, item.hersteller_teilenummer)):
+            entries = index.get(key)
+            if entries and item in entries:
+                entries.remove(item)
+                if not entries:
+                    del index[key]
+
+    def get_by_part_number(self, part_number):
+        entries = self._by_part_number.get(part_number)
+        return entries[0] if entries else None
+
+    def get_by_manufacturer_part_number(self, part_number):
+        entries = self._by_manufacturer_part_number.get(part_number)
+        return entries[0] if entries else None
+
+    def _item_from_row(self, row):
+        item = StorageItem.from_dict(dict(zip(self.ITEM_FIELDS, row[1:])))
+        item.db_id = row[0]
+        return item
+
+    def _item_values(self, item, fields=None):
+        return tuple(getattr(item, field) for field in (fields or self.ITEM_FIELDS))
+
+    def _insert_row(self, item):
+        columns = ", ".join(self.ITEM_FIELDS)
+        placeholders = ", ".join("?" for _ in self.ITEM_FIELDS)
+        cursor = self.conn.execute(f"INSERT INTO items ({columns}) VALUES ({placeholders})",
+                                   self._item_values(item))
+        item.db_id = cursor.lastrowid
+        item.journal_anzahl = item.anzahl
+
+    def _update_row(self, item):
+        # anzahl wird nicht direkt geschrieben, sie ändert sich nur über das Journal
+        fields = [field for field in self.ITEM_FIELDS if field != 'anzahl']
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        self.conn.execute(f"UPDATE items SET {assignments} WHERE id = ?",
+                          self._item_values(item, fields) + (item.db_id,))
+
+    def _journal_size(self):
         try:
-            data = [item.to_dict() for item in self.items]
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            return self.journal_file.stat().st_size
+        except OSError:
+            return 0
+
+    def add_item(self, item):
+        try:
+            with self.conn:
+                self._insert_row(item)
+            self.items.append(item)
+            self._index_item(item)
         except Exception as e:
             print(f"Fehler beim Speichern des Lagerbestands: {e}")
     
-    def add_item(self, item):
-        self.items.append(item)
-        self.save_storage()
-    
     def update_item(self, index, item):
         if 0 <= index < len(self.items):
+            self._replace_item(index, self.items[index], item)
+
+    def update_part(self, part_number, item):
+        old_item = self.get_by_part_number(part_number)
+        if old_item is not None:
+            self._replace_item(None, old_item, item)
+
+    def _replace_item(self, index, old_item, item):
+        item.db_id = getattr(old_item, 'db_id', None)
+        journal_anzahl = getattr(old_item, 'journal_anzahl', old_item.anzahl)
+        try:
+            with self.conn:
+                if item.db_id is None:
+                    self._insert_row(item)
+                else:
+                    self._update_row(item)
+            if index is None:
+                index = self.items.index(old_item)
+            self._unindex_item(old_item)
             self.items[index] = item
-            self.save_storage()
+            self._index_item(item)
+            # Geänderter Bestand im Bearbeiten-Dialog wird als Korrekturbuchung erfasst
+            if item.db_id is not None and item.anzahl != journal_anzahl:
+                item.journal_anzahl = journal_anzahl
+                self._append_movement(item, item.anzahl - journal_anzahl, "Korrektur")
+        except Exception as e:
+            print(f"Fehler beim Speichern des Lagerbestands: {e}")
+
+    def adjust_stock(self, part_number, delta, reason="", activity_id="", user=""):
+        # Bestandsänderung: eine Zeile ans Journal anhängen statt Datenbank/Datei neu zu schreiben
+        item = self.get_by_part_number(part_number)
+        if item is None or not delta:
+            return item
+        item.anzahl += delta
+        item.geaendert_am = datetime.now().strftime("%Y-%m-%d")
+        self._append_movement(item, delta, reason, activity_id, user)
+        return item
+
+    def _append_movement(self, item, delta, reason="", activity_id="", user=""):
+        entry = {
+            'zeitpunkt': datetime.now().isoformat(timespec='seconds'),
+            'teil_id': item.db_id,
+            'teilenummer': item.teilenummer,
+            'delta': delta,
+            'grund': reason,
+            'activity_id': activity_id,
+            'benutzer': user or getpass.getuser()
+        }
+        try:
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            item.journal_anzahl = getattr(item, 'journal_anzahl', item.anzahl - delta) + delta
+        except Exception as e:
+            print(f"Fehler beim Schreiben des Lagerjournals: {e}")
+            return
+        self._maybe_compact()
+
+    def _read_journal(self, offset):
+        # Liefert vollständige Journalzeilen ab offset und den Offset hinter der letzten davon
+        if not self.journal_file.exists():
+            return [], offset
+        with open(self.journal_file, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        entries = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                print(f"Ungültige Zeile im Lagerjournal übersprungen: {line[:80]}")
+        return entries, offset + end
+
+    def _replay_journal(self, offset):
+        entries, _ = self._read_journal(offset)
+        items_by_id = {item.db_id: item for item in self.items}
+        for entry in entries:
+            item = items_by_id.get(entry.get('teil_id'))
+            if item is not None:
+                item.anzahl += entry.get('delta', 0)
+                item.geaendert_am = entry.get('zeitpunkt', '')[:10] or item.geaendert_am
+        for item in self.items:
+            item.journal_anzahl = item.anzahl
+
+    def _maybe_compact(self):
+        try:
+            pending = self._journal_size() - int(self._get_meta('journal_offset', 0))
+        except Exception:
+            return
+        if pending > self.JOURNAL_COMPACT_BYTES and not StorageManager._compact_lock.locked():
+            threading.Thread(target=self.compact_journal, daemon=True).start()
+
+    def compact_journal(self):
+        # Journal seit dem letzten Snapshot in die Datenbank übernehmen (läuft im Hintergrund-Thread)
+        if not StorageManager._compact_lock.acquire(blocking=False):
+            return
+        conn = None
+        try:
+            conn = sqlite3.connect(str(self.db_file), timeout=30)
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'journal_offset'").fetchone()
+            offset = int(row[0]) if row else 0
+            entries, new_offset = self._read_journal(offset)
+            for entry in entries:
+                conn.execute("UPDATE items SET anzahl = anzahl + ?, geaendert_am = ? WHERE id = ?",
+                             (entry.get('delta', 0), entry.get('zeitpunkt', '')[:10], entry.get('teil_id')))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('journal_offset', ?)", (str(new_offset),))
+            conn.commit()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            print(f"Fehler beim Verdichten des Lagerjournals: {e}")
+        finally:
+            if conn:
+                conn.close()
+            StorageManager._compact_lock.release()
+
+    def get_movements(self, teilenummer=None):
+        # Komplette Bewegungshistorie aus dem Journal
+        entries, _ = self._read_journal(0)
+        if teilenummer:
+            entries = [entry for entry in entries if entry.get('teilenummer') == teilenummer]
+        return entries
     
     def remove_item(self, index):
         if 0 <= index < len(self.items):
+            self._delete_item(index, self.items[index])
+
+    def remove_part(self, part_number):
+        item = self.get_by_part_number(part_number)
+        if item is not None:
+            self._delete_item(self.items.index(item), item)
+
+    def _delete_item(self, index, item):
+        db_id = getattr(item, 'db_id', None)
+        try:
+            with self.conn:
+                if db_id is not None:
+                    self.conn.execute("DELETE FROM items WHERE id = ?", (db_id,))
             self.items.pop(index)
-            self.save_storage()
+            self._unindex_item(item)
+        except Exception as e:
+            print(f"Fehler beim Speichern des Lagerbestands: {e}")
+
+    def import_json(self, json_path):
+        # Ersetzt den kompletten Bestand durch den Inhalt der JSON-Datei
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            items = [StorageItem.from_dict(item) for item in data]
+            with self.conn:
+                self.conn.execute("DELETE FROM items")
+                for item in items:
+                    self._insert_row(item)
+                # Importierter Bestand ersetzt alles, offene Journalzeilen gelten nicht mehr
+                self._set_meta('journal_offset', self._journal_size())
+                if Path(json_path) == self.storage_file:
+                    self._set_meta('json_mtime', self._json_mtime())
+            self.items = items
+            self._rebuild_indexes()
+            return True
+        except Exception as e:
+            print(f"Fehler beim Import des Lagerbestands: {e}")
+            return False
+
+    def export_json(self, json_path=None):
+        # Schreibt den Bestand im alten JSON-Format (für Backups und andere Versionen)
+        json_path = Path(json_path) if json_path else self.storage_file
+        try:
+            data = [item.to_dict() for item in self.items]
+            tmp_path = json_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, json_path)
+            if json_path == self.storage_file:
+                with self.conn:
+                    self._set_meta('json_mtime', self._json_mtime())
+            return True
+        except Exception as e:
+            print(f"Fehler beim Export des Lagerbestands: {e}")
+            return False
     
     def search_items(self, search_term):
-        search_term = search_term.lower()
-        results = []
-        for item in self.items:
-            if (search_term in item.teilenummer.lower() or 
-                search_term in item.hersteller.lower() or 
-                search_term in item.bezeichnung.lower() or 
-                search_term in item.kategorie.lower() or 
-                search_term in item.lagerplatz.lower() or
-                search_term in item.zusatzinfos.lower()):
-                results.append(item)
-        return results
+        return self.search_index.query(search_term)
+
+    def filter_items(self, search_term="", kategorie="", hersteller="", lagerplatz=""):
+        return self.search_index.query(search_term, kategorie, hersteller, lagerplatz)
+
+    def _distinct_values(self, column):
+        rows = self.conn.execute(
+            f"SELECT DISTINCT {column} FROM items WHERE {column} IS NOT NULL AND {column} != '' ORDER BY {column}"
+        ).fetchall()
+        return [row[0] for row in rows]
     
     def get_categories(self):
-        return sorted(set(item.kategorie for item in self.items if item.kategorie))
+        return self._distinct_values('kategorie')
     
     def get_locations(self):
-        return sorted(set(item.lagerplatz for item in self.items if item.lagerplatz))
+        return self._distinct_values('lagerplatz')
     
     def get_manufacturers(self):
-        return sorted(set(item.hersteller for item in self.items if item.hersteller))
+        return self._distinct_values('hersteller')
+
+# Tabellenmodell für den Lagerbestand: nur sichtbare Zeilen werden gezeichnet, keine Widget-Items pro Zelle.
+# Gefiltert wird über den Suchindex, sortiert direkt im Modell (ein sorted() statt lessThan-Aufrufen pro Vergleich).
+class StorageTableModel(QtCore.QAbstractTableModel):
+    COLUMNS = [
+        ("Teilenummer", 'teilenummer'), ("Hersteller", 'hersteller'), ("Bezeichnung", 'bezeichnung'),
+        ("Kategorie", 'kategorie'), ("Lagerplatz", 'lagerplatz'), ("Fach", 'fach'),
+        ("Anzahl", 'anzahl'), ("Mindestbestand", 'mindestbestand'), ("Einheit", 'einheit'),
+        ("Hersteller-TNr", 'hersteller_teilenummer'), ("Zusatzinfos", 'zusatzinfos'), ("Geändert am", 'geaendert_am')
+    ]
+    ANZAHL_COLUMN = 6
+    ItemRole = QtCore.Qt.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._rows = {}  # id(StorageItem) -> Zeile
+        self._sort_column = -1
+        self._sort_order = QtCore.Qt.AscendingOrder
+        self._low_stock_brush = QtGui.QBrush(QtGui.QColor('#3a1e1e'))
+
+    def set_items(self, items):
+        self.beginResetModel()
+        self._items = list(items)
+        self._sort_items()
+        self.endResetModel()
+
+    def _sort_items(self):
+        if 0 <= self._sort_column < len(self.COLUMNS):
+            field = self.COLUMNS[self._sort_column][1]
+
+            def sort_key(item):
+                value = getattr(item, field)
+                if isinstance(value, (int, float)):
+                    return (0, value, "")
+                return (1, 0, (value or "").lower())
+
+            self._items.sort(key=sort_key, reverse=self._sort_order == QtCore.Qt.DescendingOrder)
+        self._rows = {id(item): row for row, item in enumerate(self._items)}
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        # Auswahl/aktuelle Zeile über die Teile-Objekte mitnehmen
+        persistent = self.persistentIndexList()
+        persistent_items = [(self.item_at(index.row()), index.column()) for index in persistent]
+        self._sort_items()
+        new_indexes = []
+        for item, column in persistent_items:
+            row = self.row_of(item) if item is not None else -1
+            new_indexes.append(self.index(row, column) if row >= 0 else QtCore.QModelIndex())
+        self.changePersistentIndexList(persistent, new_indexes)
+        self.layoutChanged.emit()
+
+    def item_at(self, row):
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    def row_of(self, item):
+        return self._rows.get(id(item), -1)
+
+    def refresh_item(self, item):
+        # Nur die Zeile eines geänderten Teils neu zeichnen
+        row = self.row_of(item)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.COLUMNS[section][0]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        column = index.column()
+        if role == QtCore.Qt.DisplayRole:
+            value = getattr(item, self.COLUMNS[column][1])
+            return str(value) if value is not None else ""
+        # bei niedrigem bestand warnen, farblich
+        if role == QtCore.Qt.BackgroundRole and column == self.ANZAHL_COLUMN:
+            if item.anzahl <= item.mindestbestand:
+                return self._low_stock_brush
+            return None
+        if role == self.ItemRole:
+            return item
+        return None
+
 
 class StorageManagerDialog(QtWidgets.QDialog):
     def __init__(self, parent=None):
@@ -3476,16 +6107,16 @@ class StorageManagerDialog(QtWidgets.QDialog):
         table_group = QtWidgets.QGroupBox("Lagerbestand")
         table_layout = QtWidgets.QVBoxLayout()
         
-        self.storage_table = QtWidgets.QTableWidget()
-        self.storage_table.setColumnCount(12)
-        self.storage_table.setHorizontalHeaderLabels([
-            "Teilenummer", "Hersteller", "Bezeichnung", "Kategorie", 
-            "Lagerplatz", "Fach", "Anzahl", "Mindestbestand", "Einheit",
-            "Hersteller-TNr", "Zusatzinfos", "Geändert am"
-        ])
+        # Modell statt QTableWidget, gefiltert wird über den Suchindex des StorageManagers
+        self.storage_model = StorageTableModel(self)
+        
+        self.storage_table = QtWidgets.QTableView()
+        self.storage_table.setModel(self.storage_model)
         self.storage_table.setAlternatingRowColors(False)
         self.storage_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.storage_table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
         self.storage_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.storage_table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
         self.storage_table.doubleClicked.connect(self.edit_item)
         self.storage_table.setSortingEnabled(True)
         
@@ -3502,31 +6133,26 @@ class StorageManagerDialog(QtWidgets.QDialog):
         self.storage_table.setColumnWidth(9, 120)
         self.storage_table.setColumnWidth(10, 200)
         self.storage_table.setColumnWidth(11, 100)
-        self.storage_table.horizontalHeader().sortIndicatorChanged.connect(self.on_sort_changed)
         
         table_layout.addWidget(self.storage_table)
         table_group.setLayout(table_layout)
         layout.addWidget(table_group)
         
         self._load_table_data()
-    
-    def on_sort_changed(self, logical_index, order):
-        # Auswahl speichern
-        current_selection = None
-        if self.storage_table.currentRow() >= 0:
-            current_item = self.storage_table.item(self.storage_table.currentRow(), 0)
-            if current_item:
-                current_selection = current_item.text()
-        
-        if current_selection:
-            QtCore.QTimer.singleShot(50, lambda: self.restore_selection(current_selection))
+
+    def _current_storage_item(self):
+        index = self.storage_table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.storage_model.item_at(index.row())
 
     def restore_selection(self, teilenummer):
-        for row in range(self.storage_table.rowCount()):
-            if self.storage_table.item(row, 0) and self.storage_table.item(row, 0).text() == teilenummer:
-                self.storage_table.setCurrentCell(row, 0)
-                self.storage_table.scrollToItem(self.storage_table.item(row, 0))
-                break
+        item = self.storage_manager.get_by_part_number(teilenummer)
+        row = self.storage_model.row_of(item) if item is not None else -1
+        if row >= 0:
+            index = self.storage_model.index(row, 0)
+            self.storage_table.setCurrentIndex(index)
+            self.storage_table.scrollTo(index)
 
     def _create_control_buttons(self, layout):
         control_layout = QtWidgets.QHBoxLayout()
@@ -3561,6 +6187,11 @@ class StorageManagerDialog(QtWidgets.QDialog):
         layout.addWidget(box)
     
     def _update_filter_combos(self):
+        # Combos ohne Zwischen-Filterung neu füllen, danach einmal filtern
+        combos = (self.category_combo, self.manufacturer_combo, self.location_combo)
+        for combo in combos:
+            combo.blockSignals(True)
+        
         # Kategorien
         self.category_combo.clear()
         self.category_combo.addItem("Alle Kategorien", "")
@@ -3578,79 +6209,27 @@ class StorageManagerDialog(QtWidgets.QDialog):
         self.location_combo.addItem("Alle Lagerplätze", "")
         for location in self.storage_manager.get_locations():
             self.location_combo.addItem(location, location)
+        
+        for combo in combos:
+            combo.blockSignals(False)
+        self.filter_items()
     
     def _load_table_data(self, items=None):
-        current_selection = None
-        if self.storage_table.currentRow() >= 0:
-            current_item = self.storage_table.item(self.storage_table.currentRow(), 0)
-            if current_item:
-                current_selection = current_item.text()
+        current_item = self._current_storage_item()
         
         if items is None:
             items = self.storage_manager.items
         
-        self.storage_table.setRowCount(len(items))
-        
-        for row, item in enumerate(items):
-            self.storage_table.setItem(row, 0, QtWidgets.QTableWidgetItem(item.teilenummer))
-            self.storage_table.setItem(row, 1, QtWidgets.QTableWidgetItem(item.hersteller))
-            self.storage_table.setItem(row, 2, QtWidgets.QTableWidgetItem(item.bezeichnung))
-            self.storage_table.setItem(row, 3, QtWidgets.QTableWidgetItem(item.kategorie))
-            self.storage_table.setItem(row, 4, QtWidgets.QTableWidgetItem(item.lagerplatz))
-            self.storage_table.setItem(row, 5, QtWidgets.QTableWidgetItem(item.fach))
-            
-    # bei niedrigem bestand warnen, farblich
-            anzahl_item = QtWidgets.QTableWidgetItem(str(item.anzahl))
-            if item.anzahl <= item.mindestbestand:
-                anzahl_item.setBackground(QtGui.QColor('#3a1e1e'))
-            self.storage_table.setItem(row, 6, anzahl_item)
-
-            self.storage_table.setItem(row, 7, QtWidgets.QTableWidgetItem(str(item.mindestbestand)))
-            self.storage_table.setItem(row, 8, QtWidgets.QTableWidgetItem(item.einheit))
-            self.storage_table.setItem(row, 9, QtWidgets.QTableWidgetItem(item.hersteller_teilenummer))
-            self.storage_table.setItem(row, 10, QtWidgets.QTableWidgetItem(item.zusatzinfos))
-            self.storage_table.setItem(row, 11, QtWidgets.QTableWidgetItem(item.geaendert_am))
-        
+        self.storage_model.set_items(items)
         self.count_label.setText(f"{len(items)} Einträge")
         
-        if current_selection:
-            for row in range(self.storage_table.rowCount()):
-                if self.storage_table.item(row, 0) and self.storage_table.item(row, 0).text() == current_selection:
-                    self.storage_table.setCurrentCell(row, 0)
-                    break
+        if current_item is not None:
+            self.restore_selection(current_item.teilenummer)
 
     def filter_items(self):
-        self.storage_table.setSortingEnabled(False)
-        
-        search_term = self.search_edit.text().lower()
-        category_filter = self.category_combo.currentData()
-        manufacturer_filter = self.manufacturer_combo.currentData()
-        location_filter = self.location_combo.currentData()
-        
-        filtered_items = []
-        for item in self.storage_manager.items:
-            # Text suche
-            text_match = (not search_term or 
-                        search_term in item.teilenummer.lower() or 
-                        search_term in item.hersteller.lower() or 
-                        search_term in item.bezeichnung.lower() or 
-                        search_term in item.kategorie.lower() or 
-                        search_term in item.lagerplatz.lower() or
-                        search_term in item.zusatzinfos.lower() or
-                        search_term in item.hersteller_teilenummer.lower())
-            
-            # Filter
-            category_match = not category_filter or item.kategorie == category_filter
-            manufacturer_match = not manufacturer_filter or item.hersteller == manufacturer_filter
-            location_match = not location_filter or item.lagerplatz == location_filter
-            
-            if text_match and category_match and manufacturer_match and location_match:
-                filtered_items.append(item)
+        filtered_items = self._get_current_filtered_items()
         
         self._load_table_data(filtered_items)
-        
-        # Sortierung wieder aktivieren
-        self.storage_table.setSortingEnabled(True)
 
     
     def add_item(self):
@@ -3658,43 +6237,30 @@ class StorageManagerDialog(QtWidgets.QDialog):
         if dlg.exec_() == QtWidgets.QDialog.Accepted:
             new_item = dlg.get_item_data()
             self.storage_manager.add_item(new_item)
-            self._load_table_data()
             self._update_filter_combos()
     
     def edit_item(self):
-        current_row = self.storage_table.currentRow()
-        if current_row >= 0:
-            teilenummer_item = self.storage_table.item(current_row, 0)
-            if teilenummer_item:
-                teilenummer = teilenummer_item.text()
-                for i, item in enumerate(self.storage_manager.items):
-                    if item.teilenummer == teilenummer:
-                        dlg = StorageItemDialog(self, item)
-                        if dlg.exec_() == QtWidgets.QDialog.Accepted:
-                            updated_item = dlg.get_item_data()
-                            self.storage_manager.update_item(i, updated_item)
-                            self.filter_items()
-                            self._update_filter_combos()
-                        break
+        item = self._current_storage_item()
+        if item is not None:
+            teilenummer = item.teilenummer
+            dlg = StorageItemDialog(self, item)
+            if dlg.exec_() == QtWidgets.QDialog.Accepted:
+                updated_item = dlg.get_item_data()
+                self.storage_manager.update_part(teilenummer, updated_item)
+                self._update_filter_combos()
+                self.restore_selection(updated_item.teilenummer)
 
     def remove_item(self):
-        current_row = self.storage_table.currentRow()
-        if current_row >= 0:
+        item = self._current_storage_item()
+        if item is not None:
             reply = QtWidgets.QMessageBox.question(self, "Löschen", 
                                                 "Teil wirklich löschen?",
                                                 QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
             if reply == QtWidgets.QMessageBox.Yes:
-                teilenummer_item = self.storage_table.item(current_row, 0)
-                if teilenummer_item:
-                    teilenummer = teilenummer_item.text()
-                    # Item im StorageManager
-                    for i, item in enumerate(self.storage_manager.items):
-                        if item.teilenummer == teilenummer:
-                            self.storage_manager.remove_item(i)
-                            # Filter immer beibehalten
-                            self.filter_items()
-                            self._update_filter_combos()
-                            break
+                # Item im StorageManager
+                self.storage_manager.remove_part(item.teilenummer)
+                # Combos neu füllen, filtert danach einmal
+                self._update_filter_combos()
 
     def increase_stock(self):
         self._change_stock(1)
@@ -3703,50 +6269,29 @@ class StorageManagerDialog(QtWidgets.QDialog):
         self._change_stock(-1)
 
     def _change_stock(self, change):
-        current_row = self.storage_table.currentRow()
-        if current_row >= 0:
-            teilenummer_item = self.storage_table.item(current_row, 0)
-            if teilenummer_item:
-                teilenummer = teilenummer_item.text()
-                for i, item in enumerate(self.storage_manager.items):
-                    if item.teilenummer == teilenummer:
-                        new_amount = item.anzahl + change
-                        if new_amount < 0:
-                            QtWidgets.QMessageBox.warning(self, "Fehler", "Bestand kann nicht negativ sein.")
-                            return
-                        
-                        item.anzahl = new_amount
-                        item.geaendert_am = datetime.now().strftime("%Y-%m-%d")
-                        self.storage_manager.update_item(i, item)
-                        self.filter_items()
-                        break
+        item = self._current_storage_item()
+        if item is not None:
+            if item.anzahl + change < 0:
+                QtWidgets.QMessageBox.warning(self, "Fehler", "Bestand kann nicht negativ sein.")
+                return
+            
+            self.storage_manager.adjust_stock(item.teilenummer, change, "Manuelle Buchung")
+            # Suchfelder ändern sich nicht, nur die Zeile aktualisieren
+            self.storage_model.refresh_item(item)
 
     def _get_current_filtered_items(self):
-        search_term = self.search_edit.text().lower()
-        category_filter = self.category_combo.currentData()
-        manufacturer_filter = self.manufacturer_combo.currentData()
-        location_filter = self.location_combo.currentData()
-        
-        filtered_items = []
-        for item in self.storage_manager.items:
-            text_match = (not search_term or 
-                        search_term in item.teilenummer.lower() or 
-                        search_term in item.hersteller.lower() or 
-                        search_term in item.bezeichnung.lower() or 
-                        search_term in item.kategorie.lower() or 
-                        search_term in item.lagerplatz.lower() or
-                        search_term in item.zusatzinfos.lower() or
-                        search_term in item.hersteller_teilenummer.lower())
-            
-            # Filter
-            category_match = not category_filter or item.kategorie == category_filter
-            manufacturer_match = not manufacturer_filter or item.hersteller == manufacturer_filter
-            location_match = not location_filter or item.lagerplatz == location_filter
-            
-            if text_match and category_match and manufacturer_match and location_match:
-                filtered_items.append(item)
-        
-        return filtered_items
+        # Suche und Filter über den Suchindex des StorageManagers
+        return self.storage_manager.filter_items(
+            self.search_edit.text(),
+            self.category_combo.currentData(),
+            self.manufacturer_combo.currentData(),
+            self.location_combo.currentData()
+        )
+
+    def done(self, result):
+        # SQLite-Verbindung des eigenen StorageManager beim Schließen freigeben
+        self.storage_manager.close()
+        super().done(result)
 
     # Export als html
     def export_storage(self):
@@ -3758,350 +6303,20 @@ class StorageManagerDialog(QtWidgets.QDialog):
                                                         str(STORAGE_DIR / "lagerbestand_export.html"), 
                                                         "HTML Dateien (*.html)")
         if fname:
-            html = self._generate_export_html()
-            with open(fname, 'w', encoding='utf-8') as f:
-                f.write(html)
-            QtWidgets.QMessageBox.information(self, "Erfolg", f"Lagerbestand exportiert: {fname}")
-
-        # Html export für lager
-
-    def _generate_export_html(self):
-        # Daten für Filter
-        categories = sorted(set(item.kategorie for item in self.storage_manager.items if item.kategorie))
-        manufacturers = sorted(set(item.hersteller for item in self.storage_manager.items if item.hersteller))
-        locations = sorted(set(item.lagerplatz for item in self.storage_manager.items if item.lagerplatz))
-        
-        # Zusammenfassungsdaten
-        total_items = sum(item.anzahl for item in self.storage_manager.items)
-        low_stock_count = sum(1 for item in self.storage_manager.items if item.anzahl <= item.mindestbestand)
-        total_parts = len(self.storage_manager.items)
-        
-        html = f"""
-        <!-- o3Measurement {o3VERSION} by openw3rk INVENT -->
-
-        <html>
-        <head>
-            <meta charset='utf-8'>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background: #2c3e50; color: white; padding: 20px; border-radius: 5px; }}
-                .filter-bar {{ 
-                    background: #ecf0f1; 
-                    padding: 15px; 
-                    border-radius: 5px; 
-                    margin: 20px 0;
-                    display: flex;
-                    flex-wrap: wrap;
-                    gap: 15px;
-                    align-items: end;
-                }}
-                .filter-group {{
-                    display: flex;
-                    flex-direction: column;
-                    min-width: 150px;
-                }}
-                .filter-group label {{
-                    font-weight: bold;
-                    margin-bottom: 5px;
-                    color: #2c3e50;
-                }}
-                .filter-input {{
-                    padding: 8px;
-                    border: 1px solid #bdc3c7;
-                    border-radius: 4px;
-                }}
-                .stats {{
-                    display: flex;
-                    justify-content: space-between;
-                    margin-bottom: 15px;
-                    padding: 10px;
-                    background: #34495e;
-                    color: white;
-                    border-radius: 4px;
-                }}
-                .table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-                .table th, .table td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                .table th {{ 
-                    background-color: #f2f2f2; 
-                    cursor: pointer;
-                    position: relative;
-                }}
-                .table th:hover {{ background-color: #e8e8e8; }}
-                .sort-indicator {{ margin-left: 5px; }}
-                .low-stock {{ background-color: #f8d7da; }}
-                .table-row {{ transition: background-color 0.2s; }}
-                .table-row:hover {{ background-color: #f5f5f5; }}
-                .summary {{ margin-top: 20px; padding: 15px; background: #e9ecef; border-radius: 5px; }}
-                .hidden {{ display: none; }}
-                .results-info {{ 
-                    margin: 10px 0; 
-                    padding: 8px; 
-                    background: #d4edda; 
-                    border-radius: 4px;
-                    color: #155724;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class='header'>
-                <h1>Lagerbestand - Export</h1>
-                <p>Erstellt am: {datetime.now().strftime("%d.%m.%Y %H:%M")} | Gesamt: {total_parts} im Bestand</p>
-            </div>
-            
-            <!-- Filter- und Suchleiste -->
-            <div class="filter-bar">
-                <div class="filter-group">
-                    <label for="searchInput">Suche:</label>
-                    <input type="text" id="searchInput" class="filter-input" 
-                        placeholder="Suchen...">
-                </div>
-                
-                <div class="filter-group">
-                    <label for="categoryFilter">Kategorie:</label>
-                    <select id="categoryFilter" class="filter-input">
-                        <option value="">Alle Kategorien</option>
-        """
+            # Export im Hintergrund, die Teileliste wird vorher übernommen
+            items = list(self.storage_manager.items)
 
-        for category in categories:
-            html += f'<option value="{category}">{category}</option>'
-        
-        html += """
-                    </select>
-                </div>
-                
-                <div class="filter-group">
-                    <label for="manufacturerFilter">Hersteller:</label>
-                    <select id="manufacturerFilter" class="filter-input">
-                        <option value="">Alle Hersteller</option>
-        """
+            def export_job(job):
+                job.set_progress(-1, f"{len(items)} Teile")
+                REPORT_RENDERER.write(fname, render_storage_report(items))
+                job.message = f"Lagerbestand exportiert: {fname}"
 
-        for manufacturer in manufacturers:
-            html += f'<option value="{manufacturer}">{manufacturer}</option>'
-        
-        html += """
-                    </select>
-                </div>
-                
-                <div class="filter-group">
-                    <label for="locationFilter">Lagerplatz:</label>
-                    <select id="locationFilter" class="filter-input">
-                        <option value="">Alle Lagerplätze</option>
-        """
-        
-        # Lagerplatz
-        for location in locations:
-            html += f'<option value="{location}">{location}</option>'
-        
-        html += f"""
-                    </select>
-                </div>
-                
-                <div class="filter-group">
-                    <label for="stockFilter">Bestand:</label>
-                    <select id="stockFilter" class="filter-input">
-                        <option value="">Alle</option>
-                        <option value="low">Niedriger Bestand</option>
-                        <option value="normal">Normaler Bestand</option>
-                    </select>
-                </div>
-            </div>
-            
-            <div class="stats">
-                <div>Gesamt: <strong>{total_parts}</strong> Einträge</div>
-                <div>Gesamtstückzahl: <strong>{total_items}</strong></div>
-                <div>Niedriger Bestand: <strong>{low_stock_count}</strong></div>
-            </div>
-            
-            <div id="resultsInfo" class="results-info">
-                Zeige Bestand: {total_parts} Einträge
-            </div>
-            
-            <table class='table' id="storageTable">
-                <thead>
-                    <tr>
-                        <th onclick="sortTable(0)">Teilenummer <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(1)">Hersteller <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(2)">Bezeichnung <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(3)">Kategorie <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(4)">Lagerplatz <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(5)">Fach <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(6)">Anzahl <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(7)">Mindestbestand <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(8)">Einheit <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(9)">Hersteller-TNr <span class="sort-indicator">↕</span></th>
-                        <th onclick="sortTable(10)">Zusatzinfos <span class="sort-indicator">↕</span></th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
-        # Tabellendaten
-        for item in self.storage_manager.items:
-            row_class = "low-stock" if item.anzahl <= item.mindestbestand else ""
-            
-            html += f"""
-                    <tr class='table-row {row_class}' 
-                        data-teilenummer="{item.teilenummer}"
-                        data-hersteller="{item.hersteller}"
-                        data-bezeichnung="{item.bezeichnung}"
-                        data-kategorie="{item.kategorie}"
-                        data-lagerplatz="{item.lagerplatz}"
-                        data-fach="{item.fach}"
-                        data-anzahl="{item.anzahl}"
-                        data-mindestbestand="{item.mindestbestand}"
-                        data-einheit="{item.einheit}"
-                        data-hersteller-tnr="{item.hersteller_teilenummer}"
-                        data-zusatzinfos="{item.zusatzinfos}">
-                        <td>{item.teilenummer}</td>
-                        <td>{item.hersteller}</td>
-                        <td>{item.bezeichnung}</td>
-                        <td>{item.kategorie}</td>
-                        <td>{item.lagerplatz}</td>
-                        <td>{item.fach}</td>
-                        <td>{item.anzahl}</td>
-                        <td>{item.mindestbestand}</td>
-                        <td>{item.einheit}</td>
-                        <td>{item.hersteller_teilenummer}</td>
-                        <td>{item.zusatzinfos}</td>
-                    </tr>
-            """
-        
-        html += f"""
-                </tbody>
-            </table>
-            
-            <div class='summary'>
-                <h3>Zusammenfassung</h3>
-                <p><strong>Gesamtanzahl Teile:</strong> {total_parts}</p>
-                <p><strong>Gesamtstückzahl:</strong> {total_items}</p>
-                <p><strong>Einträge mit niedrigem Bestand:</strong> {low_stock_count}</p>
-                <p><strong>Lagerplätze:</strong> {len(locations)}</p>
-                <p><strong>Hersteller:</strong> {len(manufacturers)}</p>
-                <p><strong>Kategorien:</strong> {len(categories)}</p>
-            </div>
-            
-            <div style='margin-top: 20px; color: #666;'>
-                <p>Erstellt mit:<br>{o3NAME} {o3VERSION}<br>{o3COPYRIGHT}</p>
-            </div>
+            JobRunner.instance().submit("Lagerbestand exportieren", export_job)
 
-            <script>
-                let currentSortColumn = -1;
-                let sortDirection = 1;
-                const totalParts = {total_parts};
-                
-                // Filter
-                function filterTable() {{
-                    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-                    const categoryFilter = document.getElementById('categoryFilter').value;
-                    const manufacturerFilter = document.getElementById('manufacturerFilter').value;
-                    const locationFilter = document.getElementById('locationFilter').value;
-                    const stockFilter = document.getElementById('stockFilter').value;
-                    
-                    const rows = document.querySelectorAll('#storageTable tbody tr');
-                    let visibleCount = 0;
-                    
-                    rows.forEach(row => {{
-                        const teilenummer = row.getAttribute('data-teilenummer').toLowerCase();
-                        const hersteller = row.getAttribute('data-hersteller').toLowerCase();
-                        const bezeichnung = row.getAttribute('data-bezeichnung').toLowerCase();
-                        const kategorie = row.getAttribute('data-kategorie');
-                        const lagerplatz = row.getAttribute('data-lagerplatz');
-                        const anzahl = parseInt(row.getAttribute('data-anzahl'));
-                        const mindestbestand = parseInt(row.getAttribute('data-mindestbestand'));
-                        
-                        // Text suche
-                        const textMatch = !searchTerm || 
-                            teilenummer.includes(searchTerm) || 
-                            hersteller.includes(searchTerm) || 
-                            bezeichnung.includes(searchTerm);
-                        
-                        // Filter
-                        const categoryMatch = !categoryFilter || kategorie === categoryFilter;
-                        const manufacturerMatch = !manufacturerFilter || hersteller === manufacturerFilter.toLowerCase();
-                        const locationMatch = !locationFilter || lagerplatz === locationFilter;
-                        
-                        // Bestand
-                        let stockMatch = true;
-                        if (stockFilter === 'low') {{
-                            stockMatch = anzahl <= mindestbestand;
-                        }} else if (stockFilter === 'normal') {{
-                            stockMatch = anzahl > mindestbestand;
-                        }}
-                        
-                        if (textMatch && categoryMatch && manufacturerMatch && locationMatch && stockMatch) {{
-                            row.classList.remove('hidden');
-                            visibleCount++;
-                        }} else {{
-                            row.classList.add('hidden');
-                        }}
-                    }});
-                    
-                    // Ergebnisse ausgeben
-                    const resultsInfo = document.getElementById('resultsInfo');
-                    if (visibleCount === totalParts) {{
-                        resultsInfo.textContent = 'Zeige alle ' + totalParts + ' Einträge';
-                    }} else {{
-                        resultsInfo.textContent = 'Zeige ' + visibleCount + ' von ' + totalParts + ' Einträgen';
-                    }}
-                }}
-                
-                // Sortierung
-                function sortTable(columnIndex) {{
-                    const table = document.getElementById('storageTable');
-                    const tbody = table.querySelector('tbody');
-                    const rows = Array.from(tbody.querySelectorAll('tr:not(.hidden)'));
-                    
-                    if (currentSortColumn === columnIndex) {{
-                        sortDirection = -sortDirection;
-                    }} else {{
-                        currentSortColumn = columnIndex;
-                        sortDirection = 1;
-                    }}
-                    
-                    rows.sort((a, b) => {{
-                        let aValue = a.cells[columnIndex].textContent;
-                        let bValue = b.cells[columnIndex].textContent;
-                        
-                        if (columnIndex === 6 || columnIndex === 7) {{
-                            aValue = parseInt(aValue) || 0;
-                            bValue = parseInt(bValue) || 0;
-                            return (aValue - bValue) * sortDirection;
-                        }}
-                        
-                        return aValue.localeCompare(bValue) * sortDirection;
-                    }});
-                    
-                    // Sortierte Reihenfolge
-                    rows.forEach(row => tbody.appendChild(row));
+        # Html export für lager
 
-                    updateSortIndicators(columnIndex);
-                }}
-                
-                function updateSortIndicators(activeColumn) {{
-                    const headers = document.querySelectorAll('#storageTable th');
-                    headers.forEach((header, index) => {{
-                        const indicator = header.querySelector('.sort-indicator');
-                        if (index === activeColumn) {{
-                            indicator.textContent = sortDirection === 1 ? ' ↑' : ' ↓';
-                        }} else {{
-                            indicator.textContent = ' ↕';
-                        }}
-                    }});
-                }}
-                
-                // Event für Filter
-                document.getElementById('searchInput').addEventListener('input', filterTable);
-                document.getElementById('categoryFilter').addEventListener('change', filterTable);
-                document.getElementById('manufacturerFilter').addEventListener('change', filterTable);
-                document.getElementById('locationFilter').addEventListener('change', filterTable);
-                document.getElementById('stockFilter').addEventListener('change', filterTable);
-                
-                updateSortIndicators(-1);
-            </script>
-        </body>
-        </html>
-        """
-        return html
+    def _generate_export_html(self):
+        return render_storage_report(self.storage_manager.items)
 
 class StorageItemDialog(QtWidgets.QDialog):
     def __init__(self, parent=None, item_data=None):
@@ -4215,9 +6430,10 @@ class StorageItemDialog(QtWidgets.QDialog):
 
 
 class hu_auManagerDialog(QtWidgets.QDialog):
-    def __init__(self, vehicles, parent=None):
+    def __init__(self, vehicle_names, hu_au_store: HuAuStore, parent=None):
         super().__init__(parent)
-        self.vehicles = vehicles
+        self.vehicle_names = vehicle_names
+        self.hu_au_store = hu_au_store
         self.setWindowTitle("HU/AU Verwaltung - Alle Fahrzeuge")
         
         screen = QtWidgets.QApplication.primaryScreen()
@@ -4348,89 +6564,28 @@ class hu_auManagerDialog(QtWidgets.QDialog):
         self.load_hu_au_data()
     
     def load_hu_au_data(self):
-        self.hu_au_entries = []
-        
-        for vehicle in self.vehicles:
-            vehicle_file = vehicle.get_vehicle_dir() / "vehicle.json"
-            if vehicle_file.exists():
-                try:
-                    with open(vehicle_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        hu_au_data = data.get('hu_au_data', {})
-                        
-                        entry = {
-                            'vehicle': vehicle.name,
-                            'vehicle_obj': vehicle,
-                            'hu_au_due': hu_au_data.get('hu_au_due', ''),
-                            'au_due': hu_au_data.get('au_due', ''),
-                            'status': hu_au_data.get('status', 'Offen'),
-                            'next_check': hu_au_data.get('next_check', ''),
-                            'notes': hu_au_data.get('notes', ''),
-                            'last_hu_au': hu_au_data.get('last_hu_au', ''),
-                            'last_au': hu_au_data.get('last_au', ''),
-                            'needs_retest': hu_au_data.get('needs_retest', False),
-                            'retest_date': hu_au_data.get('retest_date', ''),
-                            'original_due_date': hu_au_data.get('original_due_date', '')
-                        }
-                        self.hu_au_entries.append(entry)
-                        
-                except Exception as e:
-                    print(f"Fehler beim Laden von HU/AU Daten für {vehicle.name}: {e}")
+        self.hu_au_store.load()
+        self.hu_au_entries = self.hu_au_store.ordered_entries(self.vehicle_names)
         
         # Automatische Status-Berechnung
         self.auto_update_status()
         self.update_table()
     
     def auto_update_status(self):
-        current_date = datetime.now().date()
-        
-        for entry in self.hu_au_entries:
-            hu_au_due = self.parse_date(entry['hu_au_due'])
-            au_due = self.parse_date(entry['au_due'])
-            retest_date = self.parse_date(entry['retest_date'])
-            
-            # Prüfe zuerst Nachprüfungen
-            if entry['needs_retest'] and retest_date:
-                if retest_date < current_date:
-                    entry['status'] = 'Nachprüfung überfällig'
-                elif retest_date.month == current_date.month and retest_date.year == current_date.year:
-                    entry['status'] = 'Nachprüfung diesen Monat'
-                elif (retest_date.month == current_date.month + 1 and retest_date.year == current_date.year) or \
-                     (retest_date.month == 1 and current_date.month == 12 and retest_date.year == current_date.year + 1):
-                    entry['status'] = 'Nachprüfung nächsten Monat'
-                else:
-                    entry['status'] = 'Nachprüfung anstehend'
-            
-            # Normale AU prüfungen
-            elif hu_au_due or au_due:
-                due_date = hu_au_due or au_due 
-                if au_due and hu_au_due:
-                    due_date = min(hu_au_due, au_due)
-                
-                if due_date < current_date:
-                    entry['status'] = 'Überfällig'
-                elif due_date.month == current_date.month and due_date.year == current_date.year:
-                    entry['status'] = 'Diesen Monat fällig'
-                elif (due_date.month == current_date.month + 1 and due_date.year == current_date.year) or \
-                     (due_date.month == 1 and current_date.month == 12 and due_date.year == current_date.year + 1):
-                    entry['status'] = 'Nächsten Monat fällig'
-                elif due_date <= current_date + timedelta(days=90):  # 3 Monate
-                    entry['status'] = 'In 3 Monaten fällig'
-                else:
-                    entry['status'] = 'Zukunft'
-            
-            else:
-                entry['status'] = 'Keine Daten'
-        
+        self.hu_au_store.update_status(self.hu_au_entries)
         self.update_stats()
     
     def update_table(self):
         filtered_entries = self.get_filtered_entries()
         
+        # während des Befüllens nicht sortieren, sonst verrutschen die Zeilen
+        self.hu_au_table.setSortingEnabled(False)
         self.hu_au_table.setRowCount(len(filtered_entries))
         
         for row, entry in enumerate(filtered_entries):
-            self.hu_au_table.setItem(row, 0, QtWidgets.QTableWidgetItem(entry['vehicle']))
+            vehicle_item = QtWidgets.QTableWidgetItem(entry['vehicle'])
+            vehicle_item.setData(QtCore.Qt.UserRole, entry)
+            self.hu_au_table.setItem(row, 0, vehicle_item)
             self.hu_au_table.setItem(row, 1, QtWidgets.QTableWidgetItem(entry['hu_au_due']))
             self.hu_au_table.setItem(row, 2, QtWidgets.QTableWidgetItem(entry['au_due']))
             
@@ -4469,6 +6624,7 @@ class hu_auManagerDialog(QtWidgets.QDialog):
             
             self.hu_au_table.setItem(row, 8, QtWidgets.QTableWidgetItem(entry['notes']))
         
+        self.hu_au_table.setSortingEnabled(True)
         self.update_stats()
     
     def get_filtered_entries(self):
@@ -4548,99 +6704,60 @@ class hu_auManagerDialog(QtWidgets.QDialog):
         except:
             return None
     
+    def _current_entry(self):
+        current_row = self.hu_au_table.currentRow()
+        if current_row < 0:
+            return None
+        vehicle_item = self.hu_au_table.item(current_row, 0)
+        return vehicle_item.data(QtCore.Qt.UserRole) if vehicle_item else None
+    
     def add_hu_au_entry(self):
-        dlg = hu_auEntryDialog(self.vehicles, self)
+        dlg = hu_auEntryDialog(self.vehicle_names, self)
         if dlg.exec_() == QtWidgets.QDialog.Accepted:
             new_entry = dlg.get_hu_au_data()
             self.save_hu_au_entry(new_entry)
             self.load_hu_au_data()
     
     def edit_hu_au_entry(self):
-        current_row = self.hu_au_table.currentRow()
-        if current_row >= 0:
-            filtered_entries = self.get_filtered_entries()
-            if current_row < len(filtered_entries):
-                entry = filtered_entries[current_row]
-                dlg = hu_auEntryDialog(self.vehicles, self, entry)
-                if dlg.exec_() == QtWidgets.QDialog.Accepted:
-                    updated_entry = dlg.get_hu_au_data()
-                    self.save_hu_au_entry(updated_entry)
-                    self.load_hu_au_data()
+        entry = self._current_entry()
+        if entry:
+            dlg = hu_auEntryDialog(self.vehicle_names, self, entry)
+            if dlg.exec_() == QtWidgets.QDialog.Accepted:
+                updated_entry = dlg.get_hu_au_data()
+                self.save_hu_au_entry(updated_entry)
+                self.load_hu_au_data()
     
     def mark_as_retest(self):
-        current_row = self.hu_au_table.currentRow()
-        if current_row >= 0:
-            filtered_entries = self.get_filtered_entries()
-            if current_row < len(filtered_entries):
-                entry = filtered_entries[current_row]
+        entry = self._current_entry()
+        if entry:
+            # Dialog für Nachprüfungsdetails
+            dlg = RetestDialog(entry, self)
+            if dlg.exec_() == QtWidgets.QDialog.Accepted:
+                retest_data = dlg.get_retest_data()
                 
-                # Dialog für Nachprüfungsdetails
-                dlg = RetestDialog(entry, self)
-                if dlg.exec_() == QtWidgets.QDialog.Accepted:
-                    retest_data = dlg.get_retest_data()
-                    
-                    # Aktualisiere den Eintrag mit Nachprüfungsdaten
-                    entry.update(retest_data)
-                    self.save_hu_au_entry(entry)
-                    self.load_hu_au_data()
-                    
-                    QtWidgets.QMessageBox.information(self, "Nachprüfung", 
-                                                    "Nachprüfungstermin wurde eingetragen.")
+                # Aktualisiere den Eintrag mit Nachprüfungsdaten
+                entry.update(retest_data)
+                self.save_hu_au_entry(entry)
+                self.load_hu_au_data()
+                
+                QtWidgets.QMessageBox.information(self, "Nachprüfung", 
+                                                "Nachprüfungstermin wurde eingetragen.")
     
     def remove_hu_au_entry(self):
-        current_row = self.hu_au_table.currentRow()
-        if current_row >= 0:
+        entry = self._current_entry()
+        if entry:
             reply = QtWidgets.QMessageBox.question(self, "Löschen", 
                                                  "Eintrag wirklich löschen?",
                                                  QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
             if reply == QtWidgets.QMessageBox.Yes:
-                filtered_entries = self.get_filtered_entries()
-                if current_row < len(filtered_entries):
-                    entry = filtered_entries[current_row]
-                    self.save_hu_au_entry({
-                        'vehicle': entry['vehicle'],
-                        'hu_au_due': '',
-                        'au_due': '',
-                        'status': 'Offen',
-                        'next_check': '',
-                        'notes': '',
-                        'last_hu_au': '',
-                        'last_au': '',
-                        'needs_retest': False,
-                        'retest_date': '',
-                        'original_due_date': ''
-                    })
-                    self.load_hu_au_data()
+                if not self.hu_au_store.remove(entry['vehicle']):
+                    QtWidgets.QMessageBox.warning(self, "Fehler", "Fehler beim Speichern der HU/AU Daten.")
+                self.load_hu_au_data()
     
     def save_hu_au_entry(self, hu_au_data):
-        vehicle_name = hu_au_data['vehicle']
-        for vehicle in self.vehicles:
-            if vehicle.name == vehicle_name:
-                try:
-                    vehicle_file = vehicle.get_vehicle_dir() / "vehicle.json"
-                    if vehicle_file.exists():
-                        with open(vehicle_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        
-                        data['hu_au_data'] = {
-                            'hu_au_due': hu_au_data['hu_au_due'],
-                            'au_due': hu_au_data['au_due'],
-                            'status': hu_au_data['status'],
-                            'next_check': hu_au_data['next_check'],
-                            'notes': hu_au_data['notes'],
-                            'last_hu_au': hu_au_data['last_hu_au'],
-                            'last_au': hu_au_data['last_au'],
-                            'needs_retest': hu_au_data.get('needs_retest', False),
-                            'retest_date': hu_au_data.get('retest_date', ''),
-                            'original_due_date': hu_au_data.get('original_due_date', '')
-                        }
-                        
-                        with open(vehicle_file, 'w', encoding='utf-8') as f:
-                            json.dump(data, f, indent=2, ensure_ascii=False)
-                            
-                except Exception as e:
-                    QtWidgets.QMessageBox.warning(self, "Fehler", f"Fehler beim Speichern: {e}")
-                break
+        # nur hu_au.json wird geschrieben, vehicle.json bleibt unberührt
+        if not self.hu_au_store.set(hu_au_data['vehicle'], hu_au_data):
+            QtWidgets.QMessageBox.warning(self, "Fehler", "Fehler beim Speichern der HU/AU Daten.")
     
     def export_hu_au_overview(self):
         if not self.hu_au_entries:
@@ -4651,173 +6768,18 @@ class hu_auManagerDialog(QtWidgets.QDialog):
                                                         str(VEHICLES_BASE_DIR / "hu_au_uebersicht.html"), 
                                                         "HTML Dateien (*.html)")
         if fname:
-            html = self.generate_hu_au_html()
-            with open(fname, 'w', encoding='utf-8') as f:
-                f.write(html)
-            QtWidgets.QMessageBox.information(self, "Erfolg", f"HU/AU Übersicht exportiert: {fname}")
+            entries = [dict(entry) for entry in self.hu_au_entries]
+
+            def export_job(job):
+                job.set_progress(-1, f"{len(entries)} Fahrzeuge")
+                REPORT_RENDERER.write(fname, render_hu_au_report(entries))
+                job.message = f"HU/AU Übersicht exportiert: {fname}"
+
+            JobRunner.instance().submit("HU/AU Übersicht exportieren", export_job)
 
 # HU/AU html export
     def generate_hu_au_html(self):
-        current_date = datetime.now()
-        
-        # Statistik berechnen
-        stats = {
-            'gesamt': len(self.hu_au_entries),
-            'überfällig': 0,
-            'diesen_monat': 0,
-            'nächsten_monat': 0,
-            'nachprüfung': 0,
-            'erledigt': 0
-        }
-        
-        for entry in self.hu_au_entries:
-            if 'überfällig' in entry['status'].lower():
-                stats['überfällig'] += 1
-            elif 'diesen monat' in entry['status'].lower():
-                stats['diesen_monat'] += 1
-            elif 'nächsten monat' in entry['status'].lower():
-                stats['nächsten_monat'] += 1
-            elif 'nachprüfung' in entry['status'].lower():
-                stats['nachprüfung'] += 1
-            elif entry['status'] == 'Erledigt':
-                stats['erledigt'] += 1
-
-        html = f"""
-        <html>
-        <head>
-            <meta charset='utf-8'>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background: #2c3e50; color: white; padding: 20px; border-radius: 5px; }}
-                .table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-                .table th, .table td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                .table th {{ background-color: #f2f2f2; }}
-                .status-überfällig {{ background-color: #f8d7da; font-weight: bold; }}
-                .status-diesen-monat {{ background-color: #fff3cd; }}
-                .status-nächsten-monat {{ background-color: #e6ee9c; }}
-                .status-nachprüfung {{ background-color: #d1ecf1; }}
-                .status-erledigt {{ background-color: #d4edda; }}
-                .summary {{ margin-top: 20px; padding: 15px; background: #e9ecef; border-radius: 5px; }}
-                .stats-grid {{ 
-                    display: grid; 
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); 
-                    gap: 10px; 
-                    margin-bottom: 20px; 
-                }}
-                .stat-item {{ 
-                    padding: 15px; 
-                    border-radius: 5px; 
-                    text-align: center; 
-                    color: white;
-                    font-weight: bold;
-                }}
-                .stat-überfällig {{ background: #dc3545; }}
-                .stat-diesen-monat {{ background: #fd7e14; }}
-                .stat-nächsten-monat {{ background: #ffc107; color: #000; }}
-                .stat-nachprüfung {{ background: #17a2b8; }}
-                .stat-erledigt {{ background: #28a745; }}
-            </style>
-        </head>
-        <body>
-            <div class='header'>
-                <h1>HU/AU Übersicht - Alle Fahrzeuge</h1>
-                <p>Exportiert am: {current_date.strftime("%d.%m.%Y %H:%M")}</p>
-            </div>
-            
-            <!-- Statistik HU/AU -->
-            <div class='stats-grid'>
-                <div class='stat-item stat-überfällig'>
-                    <div style='font-size: 24px;'>{stats['überfällig']}</div>
-                    <div>Überfällig</div>
-                </div>
-                <div class='stat-item stat-diesen-monat'>
-                    <div style='font-size: 24px;'>{stats['diesen_monat']}</div>
-                    <div>Diesen Monat</div>
-                </div>
-                <div class='stat-item stat-nächsten-monat'>
-                    <div style='font-size: 24px;'>{stats['nächsten_monat']}</div>
-                    <div>Nächsten Monat</div>
-                </div>
-                <div class='stat-item stat-nachprüfung'>
-                    <div style='font-size: 24px;'>{stats['nachprüfung']}</div>
-                    <div>Nachprüfungen</div>
-                </div>
-                <div class='stat-item stat-erledigt'>
-                    <div style='font-size: 24px;'>{stats['erledigt']}</div>
-                    <div>Erledigt</div>
-                </div>
-            </div>
-            
-            <table class='table'>
-                <tr>
-                    <th>Fahrzeug</th>
-                    <th>HU fällig</th>
-                    <th>AU fällig</th>
-                    <th>Status</th>
-                    <th>Nächste Prüfung</th>
-                    <th>Letzte HU</th>
-                    <th>Letzte AU</th>
-                    <th>Nachprüfung nötig</th>
-                    <th>Anmerkung</th>
-                </tr>
-        """
-        
-        for entry in self.hu_au_entries:
-            # Status-Klasse für CSS
-            status_class = ""
-            if 'überfällig' in entry['status'].lower():
-                status_class = 'status-überfällig'
-            elif 'diesen monat' in entry['status'].lower():
-                status_class = 'status-diesen-monat'
-            elif 'nächsten monat' in entry['status'].lower():
-                status_class = 'status-nächsten-monat'
-            elif 'nachprüfung' in entry['status'].lower():
-                status_class = 'status-nachprüfung'
-            elif entry['status'] == 'Erledigt':
-                status_class = 'status-erledigt'
-            
-            # Nachprüfungs-Info
-            retest_info = "Nein"
-            if entry['needs_retest']:
-                if entry['retest_date']:
-                    retest_info = f"Ja ({entry['retest_date']})"
-                else:
-                    retest_info = "Ja"
-            
-            html += f"""
-                <tr>
-                    <td>{entry['vehicle']}</td>
-                    <td>{entry['hu_au_due']}</td>
-                    <td>{entry['au_due']}</td>
-                    <td class='{status_class}'>{entry['status']}</td>
-                    <td>{entry['next_check']}</td>
-                    <td>{entry['last_hu_au']}</td>
-                    <td>{entry['last_au']}</td>
-                    <td>{retest_info}</td>
-                    <td>{entry['notes']}</td>
-                </tr>
-            """
-        
-        html += f"""
-            </table>
-            
-            <div class='summary'>
-                <h3>Zusammenfassung</h3>
-                <p><strong>Gesamt Fahrzeuge:</strong> {stats['gesamt']}</p>
-                <p><strong>Überfällig:</strong> {stats['überfällig']}</p>
-                <p><strong>Diesen Monat fällig:</strong> {stats['diesen_monat']}</p>
-                <p><strong>Nächsten Monat fällig:</strong> {stats['nächsten_monat']}</p>
-                <p><strong>Nachprüfungen:</strong> {stats['nachprüfung']}</p>
-                <p><strong>Erledigt:</strong> {stats['erledigt']}</p>
-            </div>
-            
-            <div style='margin-top: 20px; color: #666;'>
-                <p>Erstellt mit:<br>{o3NAME} {o3VERSION}<br>{o3COPYRIGHT}</p>
-            </div>
-        </body>
-        </html>
-        """
-        return html
+        return render_hu_au_report(self.hu_au_entries)
 
 class RetestDialog(QtWidgets.QDialog):
     def __init__(self, entry_data, parent=None):
@@ -4876,9 +6838,9 @@ class RetestDialog(QtWidgets.QDialog):
 
 
 class hu_auEntryDialog(QtWidgets.QDialog):
-    def __init__(self, vehicles, parent=None, entry_data=None):
+    def __init__(self, vehicle_names, parent=None, entry_data=None):
         super().__init__(parent)
-        self.vehicles = vehicles
+        self.vehicle_names = vehicle_names
         self.entry_data = entry_data if entry_data else {}
         
         title = "HU/AU Eintrag bearbeiten" if entry_data else "Neuer HU/AU Eintrag"
@@ -4889,8 +6851,7 @@ class hu_auEntryDialog(QtWidgets.QDialog):
         
         # Fahrzeug-Auswahl
         self.vehicle_combo = QtWidgets.QComboBox()
-        for vehicle in vehicles:
-            self.vehicle_combo.addItem(vehicle.name)
+        self.vehicle_combo.addItems(vehicle_names)
         
         if entry_data and 'vehicle' in entry_data:
             idx = self.vehicle_combo.findText(entry_data['vehicle'])
@@ -5052,24 +7013,13 @@ class ActivitiesHistoryDialog(QtWidgets.QDialog):
         
         layout.addLayout(button_layout)
         
-        # Aktivitäten laden
+        # Aktivitäten laden (nur Manifest, volle Daten erst bei Details/Export)
+        self.manifest = ActivityManifest(vehicle)
         self.activities = []
         self.load_activities()
     
     def load_activities(self):
-        self.activities = []
-        activities_dir = self.vehicle.get_vehicle_dir() / "activities"
-        
-        if activities_dir.exists():
-            for year_dir in activities_dir.iterdir():
-                if year_dir.is_dir():
-                    for activity_file in year_dir.glob("*.json"):
-                        try:
-                            with open(activity_file, 'r', encoding='utf-8') as f:
-                                activity_data = json.load(f)
-                                self.activities.append(activity_data)
-                        except Exception as e:
-                            print(f"Fehler beim Laden von {activity_file}: {e}")
+        self.activities = self.manifest.load()
         
         # Nach Datum sortieren (neueste zuerst)
         self.activities.sort(key=lambda x: x.get('datum', ''), reverse=True)
@@ -5078,14 +7028,16 @@ class ActivitiesHistoryDialog(QtWidgets.QDialog):
     def update_table(self):
         filtered_activities = self.get_filtered_activities()
         
+        # während des Befüllens nicht sortieren, sonst verrutschen die Zeilen
+        self.activities_table.setSortingEnabled(False)
         self.activities_table.setRowCount(len(filtered_activities))
         
         for row, activity in enumerate(filtered_activities):
             # Materialien-Text erstellen
             materialien_text = ""
-            if activity.get('verwendete_materialien'):
-                material_count = len(activity['verwendete_materialien'])
-                material_names = [mat.get('bezeichnung', mat.get('teilenummer', '')) for mat in activity['verwendete_materialien'][:2]]
+            if activity.get('materialien'):
+                material_count = len(activity['materialien'])
+                material_names = [mat.get('bezeichnung') or mat.get('teilenummer', '') for mat in activity['materialien'][:2]]
                 materialien_text = f"{material_count} Materialien: {', '.join(material_names)}"
                 if material_count > 2:
                     materialien_text += " ..."
@@ -5095,13 +7047,17 @@ class ActivitiesHistoryDialog(QtWidgets.QDialog):
             if len(beschreibung) > 80:
                 beschreibung = beschreibung[:77] + "..."
             
-            self.activities_table.setItem(row, 0, QtWidgets.QTableWidgetItem(activity.get('datum', '')))
+            datum_item = QtWidgets.QTableWidgetItem(activity.get('datum', ''))
+            datum_item.setData(QtCore.Qt.UserRole, activity)
+            self.activities_table.setItem(row, 0, datum_item)
             self.activities_table.setItem(row, 1, QtWidgets.QTableWidgetItem(activity.get('activity_type', '')))
             self.activities_table.setItem(row, 2, QtWidgets.QTableWidgetItem(str(activity.get('km_stand', ''))))
             self.activities_table.setItem(row, 3, QtWidgets.QTableWidgetItem(beschreibung))
             self.activities_table.setItem(row, 4, QtWidgets.QTableWidgetItem(materialien_text))
             self.activities_table.setItem(row, 5, QtWidgets.QTableWidgetItem(activity.get('erstellt_durch', '')))
         
+        self.activities_table.setSortingEnabled(True)
+        
         # Statistik aktualisieren
         total = len(self.activities)
         filtered = len(filtered_activities)
@@ -5120,7 +7076,7 @@ class ActivitiesHistoryDialog(QtWidgets.QDialog):
                          search_text in activity.get('erstellt_durch', '').lower() or
                          any(search_text in mat.get('bezeichnung', '').lower() or 
                              search_text in mat.get('teilenummer', '').lower() 
-                             for mat in activity.get('verwendete_materialien', [])))
+                             for mat in activity.get('materialien', [])))
             
             # Typ-Filter
             type_match = (type_filter == "Alle Typen" or 
@@ -5137,9 +7093,13 @@ class ActivitiesHistoryDialog(QtWidgets.QDialog):
     def show_activity_details(self):
         current_row = self.activities_table.currentRow()
         if current_row >= 0:
-            filtered_activities = self.get_filtered_activities()
-            if current_row < len(filtered_activities):
-                activity = filtered_activities[current_row]
+            datum_item = self.activities_table.item(current_row, 0)
+            entry = datum_item.data(QtCore.Qt.UserRole) if datum_item else None
+            if entry:
+                activity = self.manifest.load_activity(entry)
+                if activity is None:
+                    QtWidgets.QMessageBox.warning(self, "Fehler", f"Aktivitätsdatei nicht gefunden: {entry.get('datei', '')}")
+                    return
                 dlg = ActivityDetailsDialog(activity, self)
                 dlg.exec_()
     
@@ -5156,167 +7116,16 @@ class ActivitiesHistoryDialog(QtWidgets.QDialog):
         )
         
         if fname:
-            html = self._generate_activities_html()
-            with open(fname, 'w', encoding='utf-8') as f:
-                f.write(html)
+            REPORT_RENDERER.write(fname, self._generate_activities_html())
             QtWidgets.QMessageBox.information(self, "Erfolg", f"Aktivitäten exportiert: {fname}")
     
     def _generate_activities_html(self):
-        activities_to_export = self.get_filtered_activities()
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="de">
-        <head>
-            <meta charset="utf-8">
-            <title>Aktivitäten-Historie - {self.vehicle.name}</title>
-            <style>
-                body {{ 
-                    font-family: Arial, sans-serif; 
-                    margin: 20px; 
-                    background-color: #0f0f12; 
-                    color: #e6eef8; 
-                }}
-                .header {{ 
-                    background: #2c3e50; 
-                    color: white; 
-                    padding: 20px; 
-                    border-radius: 5px; 
-                    margin-bottom: 20px;
-                }}
-                .activity {{ 
-                    background: #1b1b20; 
-                    border: 1px solid #2a2a33; 
-                    border-radius: 5px; 
-                    padding: 15px; 
-                    margin-bottom: 15px;
-                }}
-                .activity-header {{ 
-                    display: flex; 
-                    justify-content: space-between; 
-                    border-bottom: 1px solid #2a2a33; 
-                    padding-bottom: 10px; 
-                    margin-bottom: 10px;
-                }}
-                .activity-type {{ 
-                    font-weight: bold; 
-                    color: #90caf9; 
-                    font-size: 18px;
-                }}
-                .activity-date {{ 
-                    color: #9aa; 
-                }}
-                .material-list {{ 
-                    background: #16161a; 
-                    padding: 10px; 
-                    border-radius: 3px; 
-                    margin: 10px 0;
-                }}
-                .work-list {{ 
-                    margin: 10px 0;
-                }}
-                .work-item {{ 
-                    padding: 5px 0; 
-                    border-bottom: 1px dashed #2a2a33;
-                }}
-                .stats {{ 
-                    background: #34495e; 
-                    padding: 15px; 
-                    border-radius: 5px; 
-                    margin: 20px 0;
-                }}
-                table {{ 
-                    width: 100%; 
-                    border-collapse: collapse; 
-                    margin: 20px 0;
-                }}
-                th, td {{ 
-                    border: 1px solid #2a2a33; 
-                    padding: 8px; 
-                    text-align: left;
-                }}
-                th {{ 
-                    background: #2c3e50; 
-                    color: white;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>Aktivitäten-Historie - {self.vehicle.name}</h1>
-                <p>FIN: {self.vehicle.specifications.get('fin', '')} | Exportiert am: {datetime.now().strftime("%d.%m.%Y %H:%M")}</p>
-            </div>
-            
-            <div class="stats">
-                <h3>Statistik</h3>
-                <p><strong>Gesamtaktivitäten:</strong> {len(activities_to_export)}</p>
-                <p><strong>Zeitraum:</strong> {activities_to_export[-1].get('datum', '') if activities_to_export else ''} bis {activities_to_export[0].get('datum', '') if activities_to_export else ''}</p>
-                <p><strong>Letzter KM-Stand:</strong> {activities_to_export[0].get('km_stand', '') if activities_to_export else ''} km</p>
-            </div>
-        """
-        
-        # Aktivitäten auflisten
-        for activity in activities_to_export:
-            html += f"""
-            <div class="activity">
-                <div class="activity-header">
-                    <div class="activity-type">{activity.get('activity_type', '')}</div>
-                    <div class="activity-date">{activity.get('datum', '')} | {activity.get('km_stand', '')} km</div>
-                </div>
-                
-                <p><strong>Beschreibung:</strong><br>{activity.get('beschreibung', '').replace(chr(10), '<br>')}</p>
-                
-                <p><strong>Durchgeführt durch:</strong> {activity.get('erstellt_durch', '')}</p>
-            """
-            
-            # Aktivitäz anzeigen
-            if activity.get('durchgeführte_arbeiten'):
-                html += """
-                <div class="work-list">
-                    <strong>Durchgeführte Arbeiten:</strong>
-                """
-                for arbeit in activity['durchgeführte_arbeiten']:
-                    html += f"""
-                    <div class="work-item">
-                        • {arbeit.get('arbeit', '')} 
-                        ({arbeit.get('dauer_minuten', 0)} Min)
-                        {f"- {arbeit.get('bemerkungen', '')}" if arbeit.get('bemerkungen') else ""}
-                    </div>
-                    """
-                html += "</div>"
-            
-            # Materialien anzeigen
-            if activity.get('verwendete_materialien'):
-                html += """
-                <div class="material-list">
-                    <strong>Verwendete Materialien:</strong>
-                    <table>
-                        <tr><th>Teilenummer</th><th>Bezeichnung</th><th>Menge</th><th>Einheit</th></tr>
-                """
-                for material in activity['verwendete_materialien']:
-                    html += f"""
-                    <tr>
-                        <td>{material.get('teilenummer', '')}</td>
-                        <td>{material.get('bezeichnung', '')}</td>
-                        <td>{material.get('menge_verbraucht', '')}</td>
-                        <td>{material.get('einheit', '')}</td>
-                    </tr>
-                    """
-                html += "</table></div>"
-            
-            html += "</div>"
-        
-        html += f"""
-            <div style="margin-top: 30px; color: #666; border-top: 1px solid #2a2a33; padding-top: 15px;">
-                <p>Erstellt mit {o3NAME} {o3VERSION}<br>
-                {o3COPYRIGHT}<br>
-                https://openw3rk.de | https://o3measurement.openw3rk.de</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
+        activities_to_export = []
+        for entry in self.get_filtered_activities():
+            activity = self.manifest.load_activity(entry)
+            if activity is not None:
+                activities_to_export.append(activity)
+        return render_activities_report(self.vehicle, activities_to_export)
 
 
 class ActivityDetailsDialog(QtWidgets.QDialog):
@@ -5425,86 +7234,37 @@ class ActivityDetailsDialog(QtWidgets.QDialog):
         )
         
         if fname:
-            with open(fname, 'w', encoding='utf-8') as f:
-                f.write(html)
+            REPORT_RENDERER.write(fname, html)
             QtWidgets.QMessageBox.information(self, "Erfolg", f"Aktivität exportiert: {fname}")
     
     def _generate_single_activity_html(self):
         activity = self.activity_data
         
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="de">
-        <head>
-            <meta charset="utf-8">
-            <title>{activity.get('activity_type', '')} - {activity.get('datum', '')}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #0f0f12; color: #e6eef8; }}
-                .header {{ background: #2c3e50; color: white; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-                .section {{ background: #1b1b20; border: 1px solid #2a2a33; border-radius: 5px; padding: 15px; margin-bottom: 15px; }}
-                table {{ width: 100%; border-collapse: collapse; margin: 10px 0; }}
-                th, td {{ border: 1px solid #2a2a33; padding: 8px; text-align: left; }}
-                th {{ background: #2c3e50; color: white; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>{activity.get('activity_type', '')}</h1>
-                <p>Fahrzeug: {activity.get('fahrzeug', '')} | Datum: {activity.get('datum', '')} | KM-Stand: {activity.get('km_stand', '')} km</p>
-            </div>
-            
-            <div class="section">
-                <h3>Beschreibung</h3>
-                <p>{activity.get('beschreibung', '').replace(chr(10), '<br>')}</p>
-            </div>
-        """
-        
+        work = ""
         if activity.get('durchgeführte_arbeiten'):
-            html += """
-            <div class="section">
-                <h3>Durchgeführte Arbeiten</h3>
-                <table>
-                    <tr><th>Aktivität</th><th>Dauer (Min)</th><th>Bemerkungen</th></tr>
-            """
-            for arbeit in activity['durchgeführte_arbeiten']:
-                html += f"""
-                <tr>
-                    <td>{arbeit.get('arbeit', '')}</td>
-                    <td>{arbeit.get('dauer_minuten', '')}</td>
-                    <td>{arbeit.get('bemerkungen', '')}</td>
-                </tr>
-                """
-            html += "</table></div>"
-        
+            rows = REPORT_RENDERER.rows("activity_single_work_row", ({
+                'arbeit': arbeit.get('arbeit', ''),
+                'dauer_minuten': arbeit.get('dauer_minuten', ''),
+                'bemerkungen': arbeit.get('bemerkungen', ''),
+            } for arbeit in activity['durchgeführte_arbeiten']))
+            work = REPORT_RENDERER.render("activity_single_work", raw={'rows': rows})
+        
+        materials = ""
         if activity.get('verwendete_materialien'):
-            html += """
-            <div class="section">
-                <h3>Verwendete Materialien</h3>
-                <table>
-                    <tr><th>Teilenummer</th><th>Bezeichnung</th><th>Menge</th><th>Einheit</th></tr>
-            """
-            for material in activity['verwendete_materialien']:
-                html += f"""
-                <tr>
-                    <td>{material.get('teilenummer', '')}</td>
-                    <td>{material.get('bezeichnung', '')}</td>
-                    <td>{material.get('menge_verbraucht', '')}</td>
-                    <td>{material.get('einheit', '')}</td>
-                </tr>
-                """
-            html += "</table></div>"
-        
-        html += f"""
-            <div style="margin-top: 30px; color: #666; border-top: 1px solid #2a2a33; padding-top: 15px;">
-                <p>Durchgeführt durch: {activity.get('erstellt_durch', '')}<br><br>
-                <p>Erstellt mit {o3NAME} {o3VERSION}<br>{o3COPYRIGHT}<br>
-                Erstellt am: {activity.get('erstellt_am', '')}</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
+            rows = render_material_rows(activity['verwendete_materialien'])
+            materials = REPORT_RENDERER.render("activity_single_materials", raw={'rows': rows})
+        
+        content = REPORT_RENDERER.render("activity_single", raw={'work': work, 'materials': materials}, multiline=('beschreibung',),
+                                         activity_type=activity.get('activity_type', ''),
+                                         fahrzeug=activity.get('fahrzeug', ''),
+                                         datum=activity.get('datum', ''),
+                                         km_stand=activity.get('km_stand', ''),
+                                         beschreibung=activity.get('beschreibung', ''),
+                                         erstellt_durch=activity.get('erstellt_durch', ''),
+                                         erstellt_am=activity.get('erstellt_am', ''),
+                                         name=o3NAME, version=o3VERSION, copyright=o3COPYRIGHT)
+        title = f"{activity.get('activity_type', '')} - {activity.get('datum', '')}"
+        return REPORT_RENDERER.page(title, "report-dark report-activity", content)
 
 
 class MaterialSelectionDialog(QtWidgets.QDialog):
@@ -5614,85 +7374,187 @@ class MaterialSelectionDialog(QtWidgets.QDialog):
         return self.selected_materials
 
 # backups
+# Backups als Zip mit manifest.json: für jede gesicherte Datei Größe, mtime, SHA-256 und das Zip,
+# in dem ihr Inhalt liegt. Inkrementelle Backups bauen auf dem neuesten Backup im selben Ordner auf,
+# enthalten nur neue/geänderte Dateien und führen gelöschte Dateien als Tombstones ('deleted').
+# Das Manifest beschreibt immer den vollständigen Stand, die Wiederherstellung holt jede Datei
+# direkt aus dem Backup der Kette, in dem sie liegt.
 class BackupManager:
+    INFO_FILE = "backup_info.json"
+    MANIFEST_FILE = "manifest.json"
+    CHUNK_SIZE = 1024 * 1024
+    # Bereits komprimierte Formate (Scans, Bilder) werden nur gespeichert, nicht erneut gepackt
+    STORED_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".pdf", ".zip", ".gz", ".7z", ".mp4"}
+
     def __init__(self):
         self.backup_dir = Path.home() / ".o3measurement" / "backups"
         self.backup_dir.mkdir(parents=True, exist_ok=True)
     
+    def _collect_files(self, include_vehicles, include_templates, include_storage, include_data):
+        # (Datei, Name im Backup) aller zu sichernden Dateien
+        files = []
+        
+        # 1. Fahrzeuge sichern
+        if include_vehicles and VEHICLES_BASE_DIR.exists():
+            for file_path in VEHICLES_BASE_DIR.rglob("*"):
+                if file_path.is_file():
+                    files.append((file_path, f"vehicles/{file_path.relative_to(VEHICLES_BASE_DIR).as_posix()}"))
+        
+        # 2. Vorlagen sichern
+        if include_templates and TEMPLATES_DIR.exists():
+            for file_path in TEMPLATES_DIR.rglob("*.json"):
+                files.append((file_path, f"templates/{file_path.name}"))
+        
+        # 3. Lagerbestand sichern
+        if include_storage and STORAGE_DIR.exists():
+            # Lagerdatenbank als lagerbestand.json sichern, die laufende SQLite-Datei nicht kopieren
+            storage_manager = StorageManager()
+            storage_manager.export_json()
+            storage_manager.close()
+            for file_path in STORAGE_DIR.rglob("*"):
+                if file_path.is_file() and not file_path.name.startswith("lagerbestand.db"):
+                    files.append((file_path, f"storage/{file_path.relative_to(STORAGE_DIR).as_posix()}"))
+        
+        # 4. DATA_DIR sichern (NEU)
+        if include_data and DATA_DIR.exists():
+            for file_path in DATA_DIR.rglob("*"):
+                if file_path.is_file():
+                    files.append((file_path, f"data/{file_path.relative_to(DATA_DIR).as_posix()}"))
+        return files
+    
+    def _file_sha256(self, file_path):
+        sha = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                sha.update(chunk)
+        return sha.hexdigest()
+    
+    def _write_file(self, backup_zip, file_path, arcname):
+        # Datei ins Zip schreiben und dabei den SHA-256 bilden (nur ein Lesedurchgang)
+        zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+        zinfo.compress_type = zipfile.ZIP_STORED if file_path.suffix.lower() in self.STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+        sha = hashlib.sha256()
+        with open(file_path, "rb") as source, backup_zip.open(zinfo, "w", force_zip64=zinfo.file_size >= (1 << 31)) as target:
+            for chunk in iter(lambda: source.read(self.CHUNK_SIZE), b""):
+                sha.update(chunk)
+                target.write(chunk)
+        return sha.hexdigest()
+    
+    def read_manifest(self, backup_path):
+        # Manifest eines Backups oder None (ältere Backups ohne Manifest, fehlende Datei)
+        try:
+            with zipfile.ZipFile(backup_path, 'r') as backup_zip:
+                if self.MANIFEST_FILE not in backup_zip.namelist():
+                    return None
+                with backup_zip.open(self.MANIFEST_FILE) as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Fehler beim Lesen des Backup-Manifests {backup_path}: {e}")
+            return None
+    
+    def find_parent_backup(self, directory, exclude=None):
+        # Neuestes Backup mit Manifest im Ordner, dessen Kette vollständig vorhanden ist
+        candidates = []
+        for backup_file in Path(directory).glob("*.zip"):
+            if exclude is not None and backup_file.resolve() == Path(exclude).resolve():
+                continue
+            info = self.get_backup_info(backup_file)
+            if "error" not in info and info.get("manifest"):
+                candidates.append((info.get("backup_date", ""), backup_file))
+        for _, backup_file in sorted(candidates, reverse=True):
+            manifest = self.read_manifest(backup_file)
+            if manifest is None:
+                continue
+            referenced = {entry["backup"] for entry in manifest["files"].values()}
+            if all((backup_file.parent / name).exists() for name in referenced):
+                return backup_file, manifest
+            print(f"Backup-Kette von {backup_file.name} unvollständig, wird nicht als Basis verwendet")
+        return None, None
+    
     def create_full_backup(self, include_vehicles=True, include_templates=True, 
-                          include_storage=True, include_data=True, backup_path=None):
+                          include_storage=True, include_data=True, backup_path=None, progress=None,
+                          incremental=False):
+        # progress(prozent, text) wird je Datei aufgerufen (Hintergrundauftrag), darf JobCancelled auslösen.
+        # incremental=True: nur Änderungen gegenüber dem letzten Backup im Zielordner sichern
         try:
+            # Ausstehende Fahrzeug-Saves zuerst schreiben
+            VehicleSaveScheduler.instance().flush()
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             if not backup_path:
                 backup_path = self.backup_dir / f"o3measurement_backup_{timestamp}.zip"
+            backup_path = Path(backup_path)
+            
+            parent_path, parent_manifest = None, None
+            if incremental:
+                parent_path, parent_manifest = self.find_parent_backup(backup_path.parent, exclude=backup_path)
+            parent_files = parent_manifest["files"] if parent_manifest else {}
+            
+            includes = {
+                "vehicles": include_vehicles,
+                "templates": include_templates,
+                "storage": include_storage,
+                "data": include_data
+            }
             
             # Metadaten für Backup
             backup_info = {
                 "app_name": o3NAME,
                 "app_version": o3VERSION,
                 "backup_date": datetime.now().isoformat(),
-                "includes": {
-                    "vehicles": include_vehicles,
-                    "templates": include_templates,
-                    "storage": include_storage,
-                    "data": include_data
-                },
+                "includes": includes,
+                "type": "incremental" if parent_path else "full",
+                "parent": parent_path.name if parent_path else None,
+                "manifest": True,
                 "total_files": 0,
                 "total_size": 0
             }
             
+            # Blobs gelöschter Anhänge nicht mehr mitsichern
+            if include_vehicles:
+                backup_info["blobs_removed"] = AttachmentStore().collect_garbage()[0]
+            
+            # Zu sichernde Dateien vorab sammeln, damit der Fortschritt bekannt ist
+            files = self._collect_files(include_vehicles, include_templates, include_storage, include_data)
+            manifest_files = {}
+            
             with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as backup_zip:
                 files_added = 0
                 total_size = 0
                 
-                # Backup-Info hinzufügen
-                backup_info_file = "backup_info.json"
-                backup_zip.writestr(backup_info_file, json.dumps(backup_info, indent=2))
-                files_added += 1
-                
-                # 1. Fahrzeuge sichern
-                if include_vehicles and VEHICLES_BASE_DIR.exists():
-                    vehicle_files = list(VEHICLES_BASE_DIR.rglob("*"))
-                    for file_path in vehicle_files:
-                        if file_path.is_file():
-                            arcname = f"vehicles/{file_path.relative_to(VEHICLES_BASE_DIR)}"
-                            backup_zip.write(file_path, arcname)
-                            files_added += 1
-                            total_size += file_path.stat().st_size
-                
-                # 2. Vorlagen sichern
-                if include_templates and TEMPLATES_DIR.exists():
-                    template_files = list(TEMPLATES_DIR.rglob("*.json"))
-                    for file_path in template_files:
-                        arcname = f"templates/{file_path.name}"
-                        backup_zip.write(file_path, arcname)
+                for index, (file_path, arcname) in enumerate(files):
+                    if progress is not None:
+                        progress(index * 100 // max(len(files), 1), arcname)
+                    stat = file_path.stat()
+                    entry = {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+                    previous = parent_files.get(arcname)
+                    if previous and previous["size"] == stat.st_size:
+                        # Gleiche Größe und mtime -> unverändert, ohne die Datei zu lesen;
+                        # sonst entscheidet der Hash (z.B. neu geschriebene, aber gleiche Datei)
+                        if previous["mtime"] == stat.st_mtime_ns or self._file_sha256(file_path) == previous["sha256"]:
+                            entry["sha256"] = previous["sha256"]
+                            entry["backup"] = previous["backup"]
+                    if "backup" not in entry:
+                        entry["sha256"] = self._write_file(backup_zip, file_path, arcname)
+                        entry["backup"] = backup_path.name
                         files_added += 1
-                        total_size += file_path.stat().st_size
+                        total_size += stat.st_size
+                    manifest_files[arcname] = entry
                 
-                # 3. Lagerbestand sichern
-                if include_storage and STORAGE_DIR.exists():
-                    storage_files = list(STORAGE_DIR.rglob("*"))
-                    for file_path in storage_files:
-                        if file_path.is_file():
-                            arcname = f"storage/{file_path.relative_to(STORAGE_DIR)}"
-                            backup_zip.write(file_path, arcname)
-                            files_added += 1
-                            total_size += file_path.stat().st_size
+                # Tombstones: im Vorgänger vorhanden, jetzt gelöscht (nur in gesicherten Bereichen)
+                deleted = sorted(arcname for arcname in parent_files
+                                 if arcname not in manifest_files and includes.get(arcname.split('/', 1)[0]))
                 
-                # 4. DATA_DIR sichern (NEU)
-                if include_data and DATA_DIR.exists():
-                    data_files = list(DATA_DIR.rglob("*"))
-                    for file_path in data_files:
-                        if file_path.is_file():
-                            arcname = f"data/{file_path.relative_to(DATA_DIR)}"
-                            backup_zip.write(file_path, arcname)
-                            files_added += 1
-                            total_size += file_path.stat().st_size
-                
-                # Backup info aktualisieren
+                # Backup info und Manifest zum Schluss schreiben
                 backup_info["total_files"] = files_added
                 backup_info["total_size"] = total_size
-                backup_zip.writestr(backup_info_file, json.dumps(backup_info, indent=2))
+                backup_info["state_files"] = len(manifest_files)
+                backup_info["deleted_files"] = len(deleted)
+                backup_zip.writestr(self.MANIFEST_FILE, json.dumps({
+                    "parent": backup_info["parent"],
+                    "files": manifest_files,
+                    "deleted": deleted
+                }, ensure_ascii=False))
+                backup_zip.writestr(self.INFO_FILE, json.dumps(backup_info, indent=2))
             
             return {
                 "success": True,
@@ -5702,75 +7564,172 @@ class BackupManager:
                 "backup_info": backup_info
             }
             
+        except JobCancelled:
+            # Abgebrochenes Backup nicht als halbe Zip-Datei liegen lassen
+            if backup_path and Path(backup_path).exists():
+                Path(backup_path).unlink()
+            raise
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    def run_backup_job(self, job, **options):
+        # create_full_backup als Hintergrundauftrag, Fehler werden zum Fehler des Auftrags
+        result = self.create_full_backup(progress=job.set_progress, **options)
+        if not result["success"]:
+            raise RuntimeError(f"Backup konnte nicht erstellt werden: {result['error']}")
+        kind = "Inkrementelles Backup" if result["backup_info"]["type"] == "incremental" else "Backup"
+        job.message = (f"{kind} erstellt: {result['backup_path']} "
+                       f"({result['file_count']} Dateien, {result['total_size'] / 1024 / 1024:.2f} MB)")
+        return result
+    
+    def _restore_target(self, filename, sections):
+        # Zielpfad einer Datei aus dem Backup oder None, wenn sie nicht wiederhergestellt wird
+        section, _, rest = filename.partition('/')
+        if not rest or not sections.get(section):
+            return None  # backup_info.json, manifest.json, unbekannte Dateien, abgewählte Bereiche
+        if section == 'vehicles':
+            return VEHICLES_BASE_DIR / rest
+        if section == 'templates':
+            return TEMPLATES_DIR / Path(rest).name
+        if section == 'storage':
+            if Path(rest).name.startswith('lagerbestand.db'):
+                return None  # Datenbank wird aus lagerbestand.json neu aufgebaut
+            return STORAGE_DIR / rest
+        return DATA_DIR / rest
+    
+    def _chain_deletions(self, backup_path, manifest):
+        # Tombstones aller Backups der Kette, außer Dateien, die im Zielstand wieder vorhanden sind
+        deleted = set()
+        seen = set()
+        current = manifest
+        while current is not None:
+            deleted.update(current.get("deleted", []))
+            parent = current.get("parent")
+            if not parent or parent in seen:
+                break
+            seen.add(parent)
+            current = self.read_manifest(Path(backup_path).parent / parent)
+        return deleted - set(manifest["files"])
+    
     def restore_backup(self, backup_path, restore_vehicles=True, restore_templates=True,
                       restore_storage=True, restore_data=True, overwrite_existing=True):
         try:
-            if not Path(backup_path).exists():
+            backup_path = Path(backup_path)
+            if not backup_path.exists():
                 return {"success": False, "error": "Backup-Datei nicht gefunden"}
             
+            # Ausstehende Saves dürfen die wiederhergestellten Dateien nicht überschreiben
+            VehicleSaveScheduler.instance().flush()
+            
             restore_info = {
                 "files_restored": 0,
                 "files_skipped": 0,
                 "files_overwritten": 0,
+                "files_unchanged": 0,
+                "files_deleted": 0,
                 "errors": []
             }
+            sections = {
+                "vehicles": restore_vehicles,
+                "templates": restore_templates,
+                "storage": restore_storage,
+                "data": restore_data
+            }
             
-            with zipfile.ZipFile(backup_path, 'r') as backup_zip:
-                # Backup-Info lesen
+            # Backup-Info lesen
+            backup_info = self.get_backup_info(backup_path)
+            if "error" in backup_info:
                 backup_info = {}
-                if 'backup_info.json' in backup_zip.namelist():
-                    with backup_zip.open('backup_info.json') as f:
-                        backup_info = json.load(f)
-                
-                # Dateien extrahieren
-                for file_info in backup_zip.infolist():
+            manifest = self.read_manifest(backup_path)
+            
+            # (Name im Backup, Zip mit dem Inhalt, Manifest-Eintrag); ohne Manifest alles aus dem Zip selbst
+            if manifest is None:
+                with zipfile.ZipFile(backup_path, 'r') as backup_zip:
+                    files = [(name, backup_path, None) for name in backup_zip.namelist() if not name.endswith('/')]
+            else:
+                files = [(name, backup_path.parent / entry["backup"], entry) for name, entry in manifest["files"].items()]
+                # Kette vor dem ersten Schreibzugriff prüfen, sonst bliebe ein halber Stand zurück
+                missing = sorted({archive_path.name for _, archive_path, _ in files if not archive_path.exists()})
+                if missing:
+                    return {"success": False, "error": f"Backup der Kette fehlt: {', '.join(missing)}"}
+            
+            archives = {}
+            try:
+                for filename, archive_path, entry in files:
                     try:
-                        filename = file_info.filename
-                        
-                        # Verzeichnis struktur bestimmen
-                        if filename.startswith('vehicles/') and restore_vehicles:
-                            target_path = VEHICLES_BASE_DIR / Path(filename).relative_to('vehicles')
-                        elif filename.startswith('templates/') and restore_templates:
-                            target_path = TEMPLATES_DIR / Path(filename).name
-                        elif filename.startswith('storage/') and restore_storage:
-                            target_path = STORAGE_DIR / Path(filename).relative_to('storage')
-                        elif filename.startswith('data/') and restore_data:  # NEU
-                            target_path = DATA_DIR / Path(filename).relative_to('data')
-                        elif filename == 'backup_info.json':
-                            continue  # Backup-Info überspringen
-                        else:
-                            continue  # Unbekannte Dateien überspringen
+                        target_path = self._restore_target(filename, sections)
+                        if target_path is None:
+                            continue
                         
                         # Prüfen ob Datei bereits existiert
-                        if target_path.exists():
+                        exists = target_path.exists()
+                        if exists:
                             if not overwrite_existing:
                                 restore_info["files_skipped"] += 1
                                 continue
-                            else:
-                                restore_info["files_overwritten"] += 1
-                                target_path.unlink()
+                            if (entry is not None and target_path.stat().st_size == entry["size"]
+                                    and self._file_sha256(target_path) == entry["sha256"]):
+                                restore_info["files_unchanged"] += 1
+                                continue
+                        
+                        if archive_path not in archives:
+                            archives[archive_path] = zipfile.ZipFile(archive_path, 'r')
                         
                         # Verzeichnis erstellen falls nötig
                         target_path.parent.mkdir(parents=True, exist_ok=True)
                         
-                        # Datei extrahieren
-                        with backup_zip.open(filename) as source, open(target_path, 'wb') as target:
-                            target.write(source.read())
+                        # In eine temporäre Datei extrahieren und gegen das Manifest prüfen,
+                        # die vorhandene Datei wird erst danach ersetzt
+                        tmp_path = target_path.with_name(f"{target_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+                        try:
+                            sha = hashlib.sha256()
+                            with archives[archive_path].open(filename) as source, open(tmp_path, 'wb') as target:
+                                for chunk in iter(lambda: source.read(self.CHUNK_SIZE), b""):
+                                    sha.update(chunk)
+                                    target.write(chunk)
+                            if entry is not None and sha.hexdigest() != entry["sha256"]:
+                                raise ValueError("Prüfsumme stimmt nicht")
+                            os.replace(tmp_path, target_path)
+                        finally:
+                            if tmp_path.exists():
+                                tmp_path.unlink()
                         
+                        if exists:
+                            restore_info["files_overwritten"] += 1
                         restore_info["files_restored"] += 1
                         
                     except Exception as e:
                         restore_info["errors"].append(f"Fehler bei {filename}: {str(e)}")
-                
-                restore_info["success"] = True
-                restore_info["backup_info"] = backup_info
-                return restore_info
+            finally:
+                for archive in archives.values():
+                    archive.close()
+            
+            # Lagerdatenbank aus der gesicherten lagerbestand.json neu aufbauen; die Datei kann als
+            # unverändert übersprungen worden sein, dann erkennt load_storage() sie nicht als neu
+            storage_json = STORAGE_DIR / "lagerbestand.json"
+            if restore_storage and storage_json.exists() and any(name == "storage/lagerbestand.json" for name, _, _ in files):
+                storage_manager = StorageManager()
+                if not storage_manager.import_json(storage_json):
+                    restore_info["errors"].append("Lagerbestand konnte nicht neu eingelesen werden")
+                storage_manager.close()
+            
+            # Dateien, die zum Zeitpunkt des Backups gelöscht waren, entfernen
+            if manifest is not None and overwrite_existing:
+                for filename in sorted(self._chain_deletions(backup_path, manifest)):
+                    target_path = self._restore_target(filename, sections)
+                    if target_path is not None and target_path.exists():
+                        try:
+                            target_path.unlink()
+                            restore_info["files_deleted"] += 1
+                        except Exception as e:
+                            restore_info["errors"].append(f"Fehler bei {filename}: {str(e)}")
+            
+            restore_info["success"] = True
+            restore_info["backup_info"] = backup_info
+            return restore_info
                 
         except Exception as e:
             return {
@@ -5793,7 +7752,9 @@ class BackupManager:
                                 'version': info.get('app_version', ''),
                                 'files': info.get('total_files', 0),
                                 'size': backup_file.stat().st_size,
-                                'includes': info.get('includes', {})
+                                'includes': info.get('includes', {}),
+                                'type': info.get('type', 'full'),
+                                'parent': info.get('parent')
                             })
                 except:
                     # Fallback für Backups ohne Metadaten
@@ -5803,7 +7764,9 @@ class BackupManager:
                         'version': 'Unbekannt',
                         'files': 'Unbekannt',
                         'size': backup_file.stat().st_size,
-                        'includes': {}
+                        'includes': {},
+                        'type': 'full',
+                        'parent': None
                     })
         
         # Nach Datum sortieren
@@ -5876,6 +7839,19 @@ class BackupDialog(QtWidgets.QDialog):
         self.backup_data.setChecked(True)
         data_layout.addWidget(self.backup_data)
 
+        self.backup_incremental = QtWidgets.QCheckBox("Inkrementell (nur Änderungen seit letztem Backup)")
+        self.backup_incremental.setToolTip("Baut auf dem neuesten Backup im gewählten Ordner auf. "
+                                           "Zum Wiederherstellen müssen alle Backups der Kette vorhanden sein.")
+        self.backup_incremental.setChecked(False)
+        data_layout.addWidget(self.backup_incremental)
+        
+        incremental_hint = QtWidgets.QLabel("Inkrementelle Backups enthalten nur Änderungen und sind allein nicht "
+                                            "wiederherstellbar: die vorherigen Backup-Dateien müssen im selben Ordner "
+                                            "daneben liegen. Zum Weitergeben/Auslagern ein vollständiges Backup erstellen.")
+        incremental_hint.setWordWrap(True)
+        incremental_hint.setStyleSheet("color: #9aa; font-size: 9px; padding: 2px;")
+        data_layout.addWidget(incremental_hint)
+
         left_column.addWidget(data_group)
         
         # Speicherort
@@ -6155,6 +8131,8 @@ class BackupDialog(QtWidgets.QDialog):
                     f"Größe: {info.get('total_size', 0) / 1024 / 1024:.2f} MB\n"
                     f"Enthält: {', '.join(includes)}"
                 )
+                if info.get('type') == 'incremental':
+                    info_text += f"\nInkrementell, Basis: {info.get('parent')}"
             else:
                 info_text = f"Backup-Informationen nicht verfügbar\nDatei: {Path(backup_path).name}"
             
@@ -6186,23 +8164,46 @@ class BackupDialog(QtWidgets.QDialog):
         self.backup_btn.setEnabled(False)
         self.backup_status.setText("Backup wird erstellt...")
         
-        QtCore.QTimer.singleShot(100, lambda: self._execute_backup(backup_path))
+        self._execute_backup(backup_path)
 
     def _execute_backup(self, backup_path):
-        result = self.backup_manager.create_full_backup(
+        # Backup läuft als Hintergrundauftrag, der Dialog bleibt bedienbar
+        options = dict(
             include_vehicles=self.backup_vehicles.isChecked(),
             include_templates=self.backup_templates.isChecked(),
             include_storage=self.backup_storage.isChecked(),
             include_data=self.backup_data.isChecked(),
-            backup_path=backup_path
+            backup_path=backup_path,
+            incremental=self.backup_incremental.isChecked()
         )
-        
+        job = JobRunner.instance().submit("Backup erstellen",
+                                          lambda job: self.backup_manager.run_backup_job(job, **options),
+                                          on_finished=self._on_backup_finished,
+                                          on_failed=self._on_backup_failed)
+        job.signals.progress.connect(self._on_backup_progress)
+        job.signals.cancelled.connect(self._on_backup_cancelled)
+
+    def _on_backup_progress(self, percent, text):
+        self.backup_status.setText(f"Backup wird erstellt... {percent}%")
+
+    def _on_backup_cancelled(self):
+        self.backup_btn.setEnabled(True)
+        self.backup_status.setText("Backup abgebrochen")
+        self.backup_status.setStyleSheet("")
+
+    def _on_backup_failed(self, error):
+        self.backup_btn.setEnabled(True)
+        self.backup_status.setText(f"Fehler beim Backup: {error}")
+        self.backup_status.setStyleSheet("color: #ff6b6b;")
+
+    def _on_backup_finished(self, result):
         # UI wieder aktivieren bzw. antifreeze
         self.backup_btn.setEnabled(True)
         
         if result["success"]:
+            kind = "Inkrementelles Backup" if result["backup_info"]["type"] == "incremental" else "Backup"
             self.backup_status.setText(
-                f"Backup erfolgreich erstellt!\n"
+                f"{kind} erfolgreich erstellt!\n"
                 f"Datei: {result['backup_path']}\n"
                 f"Dateien: {result['file_count']}\n"
                 f"Größe: {result['total_size'] / 1024 / 1024:.2f} MB"
@@ -6224,6 +8225,8 @@ class BackupDialog(QtWidgets.QDialog):
                 backup_date = datetime.fromtimestamp(backup['date']).strftime("%d.%m.%Y %H:%M") if isinstance(backup['date'], (int, float)) else "Unbekannt"
             
             item_text = f"{backup_date} - v{backup['version']} - {backup['files']} Dateien - {backup['size'] / 1024 / 1024:.1f} MB"
+            if backup['type'] == 'incremental':
+                item_text += " - inkrementell"
             item = QtWidgets.QListWidgetItem(item_text)
             item.setData(QtCore.Qt.UserRole, backup['file'])
             self.backups_list.addItem(item)
@@ -6254,6 +8257,8 @@ class BackupDialog(QtWidgets.QDialog):
                     f"Größe: {info.get('total_size', 0) / 1024 / 1024:.2f} MB\n"
                     f"Enthält: {', '.join(includes)}"
                 )
+                if info.get('type') == 'incremental':
+                    info_text += f"\nInkrementell, Basis: {info.get('parent')}"
             else:
                 info_text = f"Backup-Informationen nicht verfügbar\nDatei: {backup_path.name}"
             
@@ -6301,6 +8306,7 @@ class BackupDialog(QtWidgets.QDialog):
             restore_vehicles=self.restore_vehicles.isChecked(),
             restore_templates=self.restore_templates.isChecked(),
             restore_storage=self.restore_storage.isChecked(),
+            restore_data=self.restore_data.isChecked(),
             overwrite_existing=self.overwrite_existing.isChecked()
         )
         
@@ -6318,6 +8324,12 @@ class BackupDialog(QtWidgets.QDialog):
             
             if result.get('files_skipped', 0) > 0:
                 status_text += f"Übersprungene Dateien: {result['files_skipped']}\n"
+            
+            if result.get('files_unchanged', 0) > 0:
+                status_text += f"Unveränderte Dateien: {result['files_unchanged']}\n"
+            
+            if result.get('files_deleted', 0) > 0:
+                status_text += f"Entfernte (gelöschte) Dateien: {result['files_deleted']}\n"
                 
             status_text += "Programm neu starten um Änderungen zu übernehmen."
             
@@ -6391,19 +8403,8 @@ class SaveTableDialog(QtWidgets.QDialog):
         # Template und Tabellendaten sammeln
         template_data = self.main_window._gather_template_from_ui().to_dict()
         
-        # Tabellendaten sammeln
-        table_data = []
-        for row in range(self.main_window.table.rowCount()):
-            row_data = []
-            for col in range(self.main_window.table.columnCount()):
-                item = self.main_window.table.item(row, col)
-                cell_data = {
-                    'text': item.text() if item else '',
-                    'background': item.background().color().name() if item and item.background().style() != QtCore.Qt.NoBrush else '',
-                    'foreground': item.foreground().color().name() if item and item.foreground().style() != QtCore.Qt.NoBrush else ''
-                }
-                row_data.append(cell_data)
-            table_data.append(row_data)
+        # Tabellendaten sammeln (nur Werte, Farben werden beim Laden neu berechnet)
+        columns = self.main_window.table_model.data_columns()
         
         # Prüfen ob Tabelle bereits existiert
         existing_table = None
@@ -6415,7 +8416,7 @@ class SaveTableDialog(QtWidgets.QDialog):
         if existing_table:
             # Bestehende Tabelle aktualisieren
             existing_table.template_data = template_data
-            existing_table.table_data = table_data
+            existing_table.set_columns(columns)
             existing_table.description = self.description_edit.toPlainText().strip()
             existing_table.modified_date = datetime.now().strftime("%Y-%m-%d %H:%M")
             saved_table = existing_table
@@ -6425,7 +8426,7 @@ class SaveTableDialog(QtWidgets.QDialog):
                 name=name,
                 description=self.description_edit.toPlainText().strip(),
                 template_data=template_data,
-                table_data=table_data,
+                columns=columns,
                 vehicle_name=self.current_vehicle.name
             )
         
@@ -6500,15 +8501,16 @@ class LoadTableDialog(QtWidgets.QDialog):
     def on_table_selected(self, current, previous):
         if current:
             table_id = current.data(QtCore.Qt.UserRole)
-            table = self.current_vehicle.load_table(table_id)
+            # Info aus den Metadaten, die Werte werden erst beim Laden gelesen
+            table = next((t for t in self.current_vehicle.saved_tables if t.table_id == table_id), None)
             if table:
                 info_text = (
                     f"Name: {table.name}\n"
                     f"Erstellt: {table.created_date}\n"
                     f"Geändert: {table.modified_date}\n"
                     f"Beschreibung: {table.description}\n"
-                    f"Zeilen: {len(table.table_data)}\n"
-                    f"Spalten: {len(table.template_data.get('columns', []))}"
+                    f"Zeilen: {table.row_count}\n"
+                    f"Spalten: {table.column_count}"
                 )
                 self.table_info.setText(info_text)
     
@@ -6564,9 +8566,11 @@ class LoadTableDialog(QtWidgets.QDialog):
 
 # erweiterte suche nach kfz
 class AdvancedVehicleSelectionDialog(QtWidgets.QDialog):
-    def __init__(self, vehicles, parent=None):
+    def __init__(self, vehicle_index, parent=None):
         super().__init__(parent)
-        self.vehicles = vehicles
+        # Arbeitet nur mit den Kurzinfos aus dem Index, volles Fahrzeug erst bei Auswahl
+        self.vehicle_index = vehicle_index
+        self.vehicles = vehicle_index.summaries()
         self.selected_vehicle = None
         self.setWindowTitle(f"{o3NAME} - Fahrzeuge suchen und auswählen")
         self.setMinimumSize(1000, 600)
@@ -6663,16 +8667,16 @@ class AdvancedVehicleSelectionDialog(QtWidgets.QDialog):
         drives = set()
         
         for vehicle in self.vehicles:
-            hsn = vehicle.specifications.get('hsn', '')
-            manufacturer = f"HSN {hsn}" if hsn else vehicle.name.split()[0]
+            hsn = vehicle.get('hsn', '')
+            manufacturer = f"HSN {hsn}" if hsn else vehicle['name'].split()[0]
             manufacturers.add(manufacturer)
             
             # Baujahr
-            baujahr = vehicle.specifications.get('baujahr', '')
+            baujahr = vehicle.get('baujahr', '')
             if baujahr:
                 years.add(baujahr)
             
-            antrieb = vehicle.specifications.get('antrieb', '')
+            antrieb = vehicle.get('antrieb', '')
             if antrieb:
                 drives.add(antrieb)
         
@@ -6694,34 +8698,36 @@ class AdvancedVehicleSelectionDialog(QtWidgets.QDialog):
         if vehicles is None:
             vehicles = self.vehicles
         
+        self.vehicles_table.setSortingEnabled(False)
         self.vehicles_table.setRowCount(len(vehicles))
         
         for row, vehicle in enumerate(vehicles):
             # Fahrzeugname
-            self.vehicles_table.setItem(row, 0, QtWidgets.QTableWidgetItem(vehicle.name))
+            self.vehicles_table.setItem(row, 0, QtWidgets.QTableWidgetItem(vehicle['name']))
             
             # Hersteller
-            hsn = vehicle.specifications.get('hsn', '')
-            manufacturer = self._get_from_hsn(hsn) if hsn else vehicle.name.split()[0]
+            hsn = vehicle.get('hsn', '')
+            manufacturer = self._get_from_hsn(hsn) if hsn else vehicle['name'].split()[0]
             self.vehicles_table.setItem(row, 1, QtWidgets.QTableWidgetItem(manufacturer))
             
             # FIN
-            fin = vehicle.specifications.get('fin', '')
+            fin = vehicle.get('fin', '')
             self.vehicles_table.setItem(row, 2, QtWidgets.QTableWidgetItem(fin))
             
             # Baujahr
-            baujahr = vehicle.specifications.get('baujahr', '')
+            baujahr = vehicle.get('baujahr', '')
             self.vehicles_table.setItem(row, 3, QtWidgets.QTableWidgetItem(baujahr))
             
             # Antrieb
-            antrieb = vehicle.specifications.get('antrieb', '')
+            antrieb = vehicle.get('antrieb', '')
             self.vehicles_table.setItem(row, 4, QtWidgets.QTableWidgetItem(antrieb))
             
             # Letzter Service
-            last_service = vehicle.last_service.get('ölwechsel_km', '')
+            last_service = vehicle.get('last_km', '')
             last_service_text = f"{last_service} km" if last_service else "Keine Daten"
             self.vehicles_table.setItem(row, 5, QtWidgets.QTableWidgetItem(last_service_text))
         
+        self.vehicles_table.setSortingEnabled(True)
         self.update_stats(len(vehicles))
     
     def filter_vehicles(self):
@@ -6736,25 +8742,25 @@ class AdvancedVehicleSelectionDialog(QtWidgets.QDialog):
             # Suchtext in verschiedenen Feldern prüfen
             search_match = (
                 not search_text or
-                search_text in vehicle.name.lower() or
-                search_text in vehicle.specifications.get('fin', '').lower() or
-                search_text in vehicle.specifications.get('hsn', '').lower() or
-                search_text in vehicle.specifications.get('motor', '').lower() or
-                search_text in vehicle.specifications.get('farbe', '').lower() or
-                search_text in vehicle.description.lower()
+                search_text in vehicle['name'].lower() or
+                search_text in vehicle.get('fin', '').lower() or
+                search_text in vehicle.get('hsn', '').lower() or
+                search_text in vehicle.get('motor', '').lower() or
+                search_text in vehicle.get('farbe', '').lower() or
+                search_text in vehicle.get('description', '').lower()
             )
             
             # Hersteller-Filter
-            hsn = vehicle.specifications.get('hsn', '')
-            manufacturer = self._get_from_hsn(hsn) if hsn else vehicle.name.split()[0]
+            hsn = vehicle.get('hsn', '')
+            manufacturer = self._get_from_hsn(hsn) if hsn else vehicle['name'].split()[0]
             manufacturer_match = not manufacturer_filter or manufacturer == manufacturer_filter
             
             # Baujahr-Filter
-            baujahr = vehicle.specifications.get('baujahr', '')
+            baujahr = vehicle.get('baujahr', '')
             year_match = not year_filter or baujahr == year_filter
             
             # Antriebs-Filter
-            antrieb = vehicle.specifications.get('antrieb', '')
+            antrieb = vehicle.get('antrieb', '')
             drive_match = not drive_filter or antrieb == drive_filter
             
             if search_match and manufacturer_match and year_match and drive_match:
@@ -6770,11 +8776,11 @@ class AdvancedVehicleSelectionDialog(QtWidgets.QDialog):
         current_row = self.vehicles_table.currentRow()
         if current_row >= 0:
             vehicle_name = self.vehicles_table.item(current_row, 0).text()
-            for vehicle in self.vehicles:
-                if vehicle.name == vehicle_name:
-                    self.selected_vehicle = vehicle
-                    self.accept()
-                    return
+            vehicle = self.vehicle_index.load_vehicle(vehicle_name)
+            if vehicle:
+                self.selected_vehicle = vehicle
+                self.accept()
+                return
         
         QtWidgets.QMessageBox.warning(self, "Keine Auswahl", "Bitte wählen Sie ein Fahrzeug aus der Liste aus.")
     
@@ -6782,17 +8788,107 @@ class AdvancedVehicleSelectionDialog(QtWidgets.QDialog):
         current_row = self.vehicles_table.currentRow()
         if current_row >= 0:
             vehicle_name = self.vehicles_table.item(current_row, 0).text()
-            for vehicle in self.vehicles:
-                if vehicle.name == vehicle_name:
-                    dlg = VehicleViewDialog(vehicle, self)
-                    dlg.exec_()
-                    return
+            vehicle = self.vehicle_index.load_vehicle(vehicle_name)
+            if vehicle:
+                dlg = VehicleViewDialog(vehicle, self)
+                dlg.exec_()
+                return
         
         QtWidgets.QMessageBox.warning(self, "Keine Auswahl", "Bitte wählen Sie ein Fahrzeug aus der Liste aus.")
     
     def get_selected_vehicle(self):
         return self.selected_vehicle
 
+# Nicht-modales Fenster mit allen Hintergrundaufträgen, je Auftrag Fortschritt und Abbrechen
+class JobProgressDialog(QtWidgets.QDialog):
+    def __init__(self, runner, parent=None):
+        super().__init__(parent)
+        self.runner = runner
+        self.rows = {}  # BackgroundJob -> (Fortschrittsbalken, Status-Label, Abbrechen-Button, Zeilen-Widget)
+        self.setWindowTitle("Hintergrundaufträge")
+        self.setMinimumSize(520, 220)
+        self.setModal(False)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        scroll = QtWidgets.QScrollArea()
+        scroll.setWidgetResizable(True)
+        container = QtWidgets.QWidget()
+        self.jobs_layout = QtWidgets.QVBoxLayout(container)
+        self.jobs_layout.addStretch()
+        scroll.setWidget(container)
+        layout.addWidget(scroll)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        self.clear_btn = QtWidgets.QPushButton("Erledigte entfernen")
+        self.clear_btn.clicked.connect(self.clear_finished)
+        close_btn = QtWidgets.QPushButton("Schließen")
+        close_btn.clicked.connect(self.hide)
+        button_layout.addWidget(self.clear_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        runner.jobAdded.connect(self.add_job)
+        runner.jobChanged.connect(self.update_job)
+        runner.jobDone.connect(self.update_job)
+
+    def add_job(self, job):
+        row = QtWidgets.QWidget()
+        row_layout = QtWidgets.QHBoxLayout(row)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        title = QtWidgets.QLabel(job.title)
+        title.setMinimumWidth(160)
+        bar = QtWidgets.QProgressBar()
+        bar.setRange(0, 100)
+        bar.setValue(0)
+        status = QtWidgets.QLabel(job.state)
+        status.setMinimumWidth(110)
+        status.setWordWrap(True)
+        cancel_btn = QtWidgets.QPushButton("Abbrechen")
+        cancel_btn.clicked.connect(lambda: self.runner.cancel(job))
+        row_layout.addWidget(title)
+        row_layout.addWidget(bar, 1)
+        row_layout.addWidget(status)
+        row_layout.addWidget(cancel_btn)
+        self.jobs_layout.insertWidget(self.jobs_layout.count() - 1, row)
+        self.rows[job] = (bar, status, cancel_btn, row)
+        job.signals.progress.connect(lambda percent, text: self._show_progress(job, percent, text))
+        self.show()
+        self.raise_()
+
+    def _show_progress(self, job, percent, text):
+        if job not in self.rows:
+            return
+        bar, status, _, _ = self.rows[job]
+        if percent < 0:
+            bar.setRange(0, 0)
+        else:
+            bar.setRange(0, 100)
+            bar.setValue(min(percent, 100))
+        if text:
+            status.setText(text)
+
+    def update_job(self, job):
+        if job not in self.rows:
+            return
+        bar, status, cancel_btn, _ = self.rows[job]
+        if job.state in (BackgroundJob.WAITING, BackgroundJob.RUNNING):
+            if job.state == BackgroundJob.RUNNING and status.text() == BackgroundJob.WAITING:
+                status.setText(job.state)
+            return
+        bar.setRange(0, 100)
+        bar.setValue(100 if job.state == BackgroundJob.DONE else bar.value())
+        status.setText(job.state if job.state != BackgroundJob.FAILED else f"Fehler: {job.message}")
+        status.setToolTip(job.message)
+        cancel_btn.setEnabled(False)
+
+    def clear_finished(self):
+        self.runner.clear_finished()
+        for job in list(self.rows):
+            if job not in self.runner.jobs:
+                self.rows.pop(job)[3].deleteLater()
+
+
 class UnsavedChangesDialog(QtWidgets.QMessageBox):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -6812,6 +8908,1122 @@ class UnsavedChangesDialog(QtWidgets.QMessageBox):
         self.button(QtWidgets.QMessageBox.Discard).setText("Nicht &speichern")
         self.button(QtWidgets.QMessageBox.Cancel).setText("&Abbrechen")
 
+# Laufende Statistik einer Messspalte (Welford), wird bei Zelländerungen fortgeschrieben.
+# lower/upper sind die Toleranzgrenzen in der Spalteneinheit, None ohne Sollwert.
+class ColumnStatistics:
+    def __init__(self, lower=None, upper=None):
+        self.lower = lower
+        self.upper = upper
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.out_of_tolerance = 0
+
+    def _outside(self, value):
+        return self.lower is not None and (value < self.lower or value > self.upper)
+
+    def add(self, value):
+        if math.isnan(value):
+            return
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        if self._outside(value):
+            self.out_of_tolerance += 1
+
+    def remove(self, value) -> bool:
+        # False wenn Minimum/Maximum entfernt wurde, dann muss die Spalte neu berechnet werden
+        if math.isnan(value):
+            return True
+        if value == self.minimum or value == self.maximum:
+            return False
+        if self._outside(value):
+            self.out_of_tolerance -= 1
+        self.n -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.n
+        self.m2 = max(self.m2 - delta * (value - self.mean), 0.0)
+        return True
+
+    def add_many(self, values):
+        # Gesamtberechnung beim Laden, mit NumPy in einem Durchgang über das Array
+        if np is None:
+            for value in values:
+                self.add(value)
+            return
+        data = np.asarray(values, dtype=np.float64)
+        data = data[~np.isnan(data)]
+        if data.size == 0:
+            return
+        self.n = int(data.size)
+        self.mean = float(data.mean())
+        self.m2 = float(((data - self.mean) ** 2).sum())
+        self.minimum = float(data.min())
+        self.maximum = float(data.max())
+        if self.lower is not None:
+            self.out_of_tolerance = int(np.count_nonzero((data < self.lower) | (data > self.upper)))
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else None
+
+    @property
+    def cp(self):
+        sigma = self.stddev
+        if not sigma or self.lower is None or self.upper <= self.lower:
+            return None
+        return (self.upper - self.lower) / (6 * sigma)
+
+    @property
+    def cpk(self):
+        sigma = self.stddev
+        if not sigma or self.lower is None or self.upper <= self.lower:
+            return None
+        return min(self.upper - self.mean, self.mean - self.lower) / (3 * sigma)
+
+
+# Messwert-Tabelle spaltenweise: je Spalte die Zelltexte, die geparsten Zahlenwerte
+# (array 'd', NaN = keine Zahl) und Statuscodes (array 'b'). Die Ansicht liest nur hieraus,
+# Speichern/Export/Prüfen arbeiten direkt auf den Spalten statt auf Tabellen-Items.
+class MeasurementTableModel(QtCore.QAbstractTableModel):
+    STATUS_NONE = 0
+    STATUS_OK = 1
+    STATUS_ERROR = 2
+    STATUS_NEUTRAL = 3  # geprüft, aber ohne Hervorhebung
+    STATUS_SETPOINT = 4
+
+    # Farben wie bisher an den Tabellen-Items
+    STATUS_COLORS = {
+        STATUS_OK: ('#1e3a1e', '#90ee90'),
+        STATUS_ERROR: ('#3a1e1e', '#ff6b6b'),
+        STATUS_NEUTRAL: ('#000000', '#ffffff'),
+        STATUS_SETPOINT: ('#2a2a33', '#99aaaa'),
+    }
+
+    StatusRole = QtCore.Qt.UserRole + 1
+    ValueRole = QtCore.Qt.UserRole + 2
+
+    cellEdited = QtCore.pyqtSignal(int, int)  # nur bei Eingaben über die Ansicht
+    statsChanged = QtCore.pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.headers = []
+        self.columns = []  # Spalteninfos der Vorlage, {} bei Datasets ohne Vorlage
+        self._texts = []  # je Spalte: Liste der Zelltexte
+        self._values = []  # je Spalte: array('d')
+        self._status = []  # je Spalte: array('b')
+        self._row_count = 0
+        self.setpoint_row = -1
+        self._stats = []  # je Spalte: ColumnStatistics, None = bei Bedarf neu berechnen
+        self._specs = []  # je Spalte: (Einheit, untere, obere Grenze) oder None
+        self.source = None  # gemapptes MappedDataset, solange Spalten direkt aus der Datei gelesen werden
+        self._brushes = {}
+        for code, (bg, fg) in self.STATUS_COLORS.items():
+            background = QtGui.QColor(0, 0, 0, 0) if code == self.STATUS_NEUTRAL else QtGui.QColor(bg)
+            self._brushes[code] = (QtGui.QBrush(background), QtGui.QBrush(QtGui.QColor(fg)))
+
+    @staticmethod
+    def header_for(col_info: dict) -> str:
+        unit = col_info.get('unit', '')
+        if unit:
+            return f"{col_info.get('name', '')} ({unit})"
+        return col_info.get('name', '')
+
+    @staticmethod
+    def parse_value(text: str) -> float:
+        # wie _remove_unit: alles ab dem ersten Leerzeichen ist die Einheit, "5mm" über das Einheiten-Register
+        if not text:
+            return math.nan
+        try:
+            return float(text.split(' ')[0])
+        except ValueError:
+            return UNIT_REGISTRY.parse(text)[0]
+
+    @staticmethod
+    def setpoint_value(setpoint, unit: str = ''):
+        # Sollwert als Zahl in der Spalteneinheit ("5 mm" bei einer cm-Spalte -> 0.5), None wenn keine Zahl
+        if setpoint is None:
+            return None
+        value, setpoint_unit = UNIT_REGISTRY.parse(str(setpoint))
+        if math.isnan(value):
+            return None
+        if unit and setpoint_unit and setpoint_unit != unit:
+            conversion = UNIT_REGISTRY.conversion(setpoint_unit, unit)
+            if conversion:
+                value = value * conversion[0] + conversion[1]
+        return value
+
+    @staticmethod
+    def _number_text(text: str, cell_unit: str) -> str:
+        # Zahlenteil einer Zelle, auch bei "5mm" ohne Leerzeichen
+        if cell_unit and ' ' not in text:
+            return text[:-len(cell_unit)]
+        return text.split(' ')[0]
+
+    def _build_column(self, texts, status=None):
+        texts = [str(t) if t is not None else '' for t in texts]
+        values = array('d', map(self.parse_value, texts))
+        codes = array('b', status) if status is not None else array('b', bytes(len(texts)))
+        return texts, values, codes
+
+    # --- Gesamter Inhalt ---
+
+    def reset(self, headers, columns=None, rows=None, row_status=None, setpoint_row=-1):
+        # rows/row_status zeilenweise (wie aus CSV/gespeicherter Tabelle), intern spaltenweise
+        rows = rows or []
+        self.beginResetModel()
+        self.source = None
+        self.headers = list(headers)
+        self.columns = list(columns) if columns is not None else [{} for _ in self.headers]
+        self._texts, self._values, self._status = [], [], []
+        for c in range(len(self.headers)):
+            texts = [row[c] if c < len(row) else '' for row in rows]
+            status = None
+            if row_status is not None:
+                status = [st[c] if c < len(st) else self.STATUS_NONE for st in row_status]
+            texts, values, codes = self._build_column(texts, status)
+            self._texts.append(texts)
+            self._values.append(values)
+            self._status.append(codes)
+        self._row_count = len(rows)
+        self.setpoint_row = setpoint_row
+        self._reset_stats()
+        self.endResetModel()
+
+    def reset_columns(self, headers, columns, column_texts):
+        # wie reset, aber Werte bereits spaltenweise (gespeicherte Tabellen)
+        self.beginResetModel()
+        self.source = None
+        self.headers = list(headers)
+        self.columns = list(columns)
+        row_count = max((len(column_texts[c]) for c in range(min(len(headers), len(column_texts)))), default=0)
+        self._texts, self._values, self._status = [], [], []
+        for c in range(len(self.headers)):
+            texts = list(column_texts[c]) if c < len(column_texts) else []
+            texts += [''] * (row_count - len(texts))
+            texts, values, codes = self._build_column(texts)
+            self._texts.append(texts)
+            self._values.append(values)
+            self._status.append(codes)
+        self._row_count = row_count
+        self.setpoint_row = -1
+        self._reset_stats()
+        self.endResetModel()
+
+    def reset_mapped(self, dataset):
+        # Binäres Dataset nur einblenden: Texte werden beim Anzeigen aus der Datei gelesen,
+        # Werte der f8-Spalten direkt aus dem Mapping verwendet
+        self.beginResetModel()
+        self.source = dataset
+        self.headers = list(dataset.headers)
+        self.columns = list(dataset.columns) if dataset.columns else [{} for _ in self.headers]
+        self._texts = [dataset.column_texts(c) for c in range(len(self.headers))]
+        self._values = [dataset.column_values(c) for c in range(len(self.headers))]
+        self._status = [array('b', bytes(dataset.row_count)) for _ in self.headers]
+        self._row_count = dataset.row_count
+        self.setpoint_row = dataset.setpoint_row
+        if 0 <= self.setpoint_row < self._row_count:
+            for codes in self._status:
+                codes[self.setpoint_row] = self.STATUS_SETPOINT
+        self._reset_stats()
+        self.endResetModel()
+
+    def materialize(self):
+        # Gemappte Spalten in normale Listen/Arrays übernehmen (vor Zeilenänderungen oder Überschreiben der Datei)
+        if self.source is None:
+            return
+        for c in range(len(self.headers)):
+            if not isinstance(self._texts[c], list):
+                self._texts[c] = list(self._texts[c])
+            values = self._values[c]
+            if values is None:
+                self._values[c] = array('d', map(self.parse_value, self._texts[c]))
+            elif not isinstance(values, array):
+                copy = array('d')
+                copy.frombytes(values.cast('B'))
+                self._values[c] = copy
+        self.source = None
+
+    def _column_values(self, column):
+        # Werte von Text-/Ganzzahlspalten eines gemappten Datasets erst bei Bedarf berechnen
+        values = self._values[column]
+        if values is None:
+            values = self._values[column] = array('d', map(self.parse_value, self._texts[column]))
+        return values
+
+    def clear(self):
+        self.reset([], [], [])
+
+    def set_columns(self, headers, columns):
+        # Neue Spaltenstruktur, vorhandene Werte bleiben nach Position erhalten
+        self.beginResetModel()
+        n = len(headers)
+        self._texts = self._texts[:n]
+        self._values = self._values[:n]
+        self._status = self._status[:n]
+        while len(self._texts) < n:
+            texts, values, codes = self._build_column([''] * self._row_count)
+            self._texts.append(texts)
+            self._values.append(values)
+            self._status.append(codes)
+        # Formatierung der Datenzeilen wird wie beim Neuaufbau zurückgesetzt
+        for c in range(n):
+            for r in range(self._row_count):
+                self._status[c][r] = self.STATUS_SETPOINT if r == self.setpoint_row else self.STATUS_NONE
+        self.headers = list(headers)
+        self.columns = list(columns)
+        self._stats = [None] * n
+        self._specs = (self._specs + [None] * n)[:n]
+        self.endResetModel()
+
+    def update_column(self, column: int, col_info: dict):
+        self.columns[column] = col_info
+        self.headers[column] = self.header_for(col_info)
+        self.headerDataChanged.emit(QtCore.Qt.Horizontal, column, column)
+
+    def move_column(self, source: int, target: int):
+        self.beginResetModel()
+        for lst in (self.headers, self.columns, self._texts, self._values, self._status, self._stats, self._specs):
+            lst.insert(target, lst.pop(source))
+        self.endResetModel()
+
+    def remove_column(self, column: int):
+        self.beginResetModel()
+        for lst in (self.headers, self.columns, self._texts, self._values, self._status, self._stats, self._specs):
+            del lst[column]
+        self.endResetModel()
+
+    # --- Zeilen ---
+
+    def insert_row(self, position: int, texts, status=None):
+        texts = list(texts)
+        self.materialize()
+        self.beginInsertRows(QtCore.QModelIndex(), position, position)
+        for c in range(len(self.headers)):
+            text = str(texts[c]) if c < len(texts) and texts[c] is not None else ''
+            self._texts[c].insert(position, text)
+            self._values[c].insert(position, self.parse_value(text))
+            self._status[c].insert(position, status if status is not None else self.STATUS_NONE)
+            if self._stats[c] is not None and status != self.STATUS_SETPOINT:
+                self._stats[c].add(self._stat_value(c, position))
+        self._row_count += 1
+        if 0 <= self.setpoint_row and position <= self.setpoint_row:
+            self.setpoint_row += 1
+        self.endInsertRows()
+        self.statsChanged.emit()
+
+    def append_rows(self, rows):
+        # Block von Zeilen anhängen (Import), überzählige Felder werden wie bisher ignoriert
+        if not rows or not self.headers:
+            return
+        self.materialize()
+        start = self._row_count
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + len(rows) - 1)
+        for c in range(len(self.headers)):
+            texts = [row[c] if c < len(row) else '' for row in rows]
+            self._texts[c].extend(texts)
+            self._values[c].extend(map(self.parse_value, texts))
+            self._status[c].frombytes(bytes(len(rows)))
+        self._row_count += len(rows)
+        # Große Blöcke: Statistik beim nächsten Zugriff in einem Durchgang neu berechnen
+        self._stats = [None] * len(self.headers)
+        self.endInsertRows()
+        self.statsChanged.emit()
+
+    def insert_setpoint_row(self, texts):
+        self.insert_row(0, texts, self.STATUS_SETPOINT)
+        self.setpoint_row = 0
+        self.headerDataChanged.emit(QtCore.Qt.Vertical, 0, 0)
+
+    def remove_row(self, row: int):
+        self.materialize()
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        for c in range(len(self.headers)):
+            if self._stats[c] is not None and row != self.setpoint_row:
+                if not self._stats[c].remove(self._stat_value(c, row)):
+                    self._stats[c] = None
+            del self._texts[c][row]
+            del self._values[c][row]
+            del self._status[c][row]
+        self._row_count -= 1
+        if row == self.setpoint_row:
+            self.setpoint_row = -1
+        elif row < self.setpoint_row:
+            self.setpoint_row -= 1
+        self.endRemoveRows()
+        self.statsChanged.emit()
+
+    # --- Zellen und Spalten ---
+
+    def text(self, row: int, column: int) -> str:
+        return self._texts[column][row]
+
+    def set_text(self, row: int, column: int, text: str):
+        # Programmatisch setzen, löst kein cellEdited aus
+        stats = self._stats[column] if row != self.setpoint_row else None
+        old_value = self._stat_value(column, row) if stats is not None else None
+        self._texts[column][row] = text
+        self._column_values(column)[row] = self.parse_value(text)
+        if stats is not None:
+            # Welford: alten Wert austragen, neuen eintragen
+            if stats.remove(old_value):
+                stats.add(self._stat_value(column, row))
+            else:
+                self._stats[column] = None
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index)
+        if row != self.setpoint_row:
+            self.statsChanged.emit()
+
+    def status(self, row: int, column: int) -> int:
+        return self._status[column][row]
+
+    def column_texts(self, column: int) -> list:
+        return self._texts[column]
+
+    def column_values(self, column: int) -> array:
+        return self._column_values(column)
+
+    def column_status(self, column: int) -> array:
+        return self._status[column]
+
+    def data_rows(self):
+        # Zeilennummern ohne Sollwert-Zeile
+        return (r for r in range(self._row_count) if r != self.setpoint_row)
+
+    def rows_as_text(self) -> list:
+        return [list(row) for row in zip(*self._texts)] if self._texts else [[] for _ in range(self._row_count)]
+
+    def data_columns(self) -> list:
+        # Werte je Spalte ohne Sollwert-Zeile (Format der gespeicherten Tabellen)
+        sp = self.setpoint_row
+        if sp < 0:
+            return [list(texts) for texts in self._texts]
+        return [texts[:sp] + texts[sp + 1:] for texts in self._texts]
+
+    # --- Statistik ---
+
+    def _reset_stats(self):
+        self._stats = [None] * len(self.headers)
+        self._specs = [None] * len(self.headers)
+
+    def set_column_specs(self, specs):
+        # Einheit und Toleranzgrenzen je Spalte, nur geänderte Spalten werden neu berechnet
+        changed = False
+        for c in range(len(self.headers)):
+            spec = specs[c] if c < len(specs) else None
+            if spec != self._specs[c]:
+                self._specs[c] = spec
+                self._stats[c] = None
+                changed = True
+        if changed:
+            self.statsChanged.emit()
+
+    def _stat_value(self, column: int, row: int) -> float:
+        # Zellwert in der Spalteneinheit, NaN bei Text oder nicht passender Einheit
+        value = self._column_values(column)[row]
+        spec = self._specs[column]
+        unit = spec[0] if spec else ''
+        if unit and not math.isnan(value):
+            cell_unit = UNIT_REGISTRY.unit_of(self._texts[column][row])
+            if cell_unit and cell_unit != unit:
+                conversion = UNIT_REGISTRY.conversion(cell_unit, unit)
+                if conversion is False:
+                    return math.nan
+                if conversion:
+                    value = value * conversion[0] + conversion[1]
+        return value
+
+    def _stat_values(self, column: int):
+        # Alle Werte der Spalte (ohne Sollwert-Zeile) in der Spalteneinheit für die Gesamtberechnung
+        n = self._row_count
+        base = self._column_values(column)
+        values = np.frombuffer(base, dtype=np.float64, count=n).copy() if np is not None else array('d', base)
+        spec = self._specs[column]
+        unit = spec[0] if spec else ''
+        if unit:
+            # Nur Zellen mit eigener Einheit brauchen eine Umrechnung
+            suffix = f" {unit}"
+            texts = self._texts[column]
+            for r in range(n):
+                text = texts[r]
+                if not text or text.endswith(suffix) or text[-1] in '0123456789.':
+                    continue
+                values[r] = self._stat_value(column, r)
+        if 0 <= self.setpoint_row < n:
+            values[self.setpoint_row] = math.nan
+        return values
+
+    def column_stats(self, column: int) -> ColumnStatistics:
+        stats = self._stats[column]
+        if stats is None:
+            spec = self._specs[column]
+            stats = ColumnStatistics(spec[1], spec[2]) if spec else ColumnStatistics()
+            stats.add_many(self._stat_values(column))
+            self._stats[column] = stats
+        return stats
+
+    def check_column(self, column: int, setpoint, tolerance: float, unit: str = '', highlight: bool = True, rows=None):
+        # Sollwert-Prüfung einer Spalte (oder einzelner Zeilen), Logik wie check_value
+        changed = self._check_column(column, setpoint, tolerance, unit, highlight, rows)
+        if changed:
+            self.dataChanged.emit(self.index(changed[0], column), self.index(changed[1], column))
+
+    def check_columns(self, checks) -> list:
+        # Alle Spalten in einem Durchgang prüfen: checks = [(spalte, sollwert, toleranz, einheit, hervorheben)].
+        # Danach ein einziges dataChanged für die ganze Tabelle statt eines Signals je Zelle.
+        for column, setpoint, tolerance, unit, highlight in checks:
+            self._check_column(column, setpoint, tolerance, unit, highlight)
+        if checks and self._row_count:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._row_count - 1, len(self.headers) - 1),
+                                  [QtCore.Qt.DisplayRole, QtCore.Qt.BackgroundRole, QtCore.Qt.ForegroundRole, self.StatusRole])
+        return self._status
+
+    def _check_column(self, column, setpoint, tolerance, unit, highlight, rows=None):
+        target = self.setpoint_value(setpoint, unit)
+        lower = upper = target
+        if target is not None and tolerance != 0:
+            tolerance_abs = abs(target) * (tolerance / 100.0)
+            lower, upper = target - tolerance_abs, target + tolerance_abs
+        if rows is None and np is not None:
+            return self._check_column_numpy(column, target, lower, upper, tolerance, unit, highlight)
+
+        texts, values, codes = self._texts[column], self._column_values(column), self._status[column]
+        unit_of, conversion = UNIT_REGISTRY.unit_of, UNIT_REGISTRY.conversion
+        if rows is None:
+            rows = self.data_rows()
+        first = last = None
+        for r in rows:
+            if r == self.setpoint_row:
+                continue
+            text = texts[r]
+            if not text.strip():
+                continue
+            value = values[r]
+            # Andere Einheit in der Zelle ("0.5 cm" in einer mm-Spalte) vor dem Vergleich umrechnen
+            cell_unit = unit_of(text) if unit else ''
+            convert = conversion(cell_unit, unit) if cell_unit and cell_unit != unit else None
+            if convert:
+                value = value * convert[0] + convert[1]
+            if target is None or math.isnan(value) or convert is False:
+                is_ok = False
+            elif tolerance == 0:
+                is_ok = value == target
+            else:
+                is_ok = lower <= value <= upper
+            clean = self._number_text(text, cell_unit)
+            if unit and clean and convert is None:
+                texts[r] = f"{clean} {unit}"
+            if tolerance > 0 or highlight:
+                codes[r] = self.STATUS_OK if is_ok else self.STATUS_ERROR
+            else:
+                codes[r] = self.STATUS_NEUTRAL
+            first = r if first is None else min(first, r)
+            last = r if last is None else max(last, r)
+        return (first, last) if first is not None else None
+
+    def _check_column_numpy(self, column, target, lower, upper, tolerance, unit, highlight):
+        # Werte- und Status-Arrays werden ohne Kopie als NumPy-Arrays bearbeitet
+        texts = self._texts[column]
+        n = self._row_count
+        if n == 0:
+            return None
+        values = np.frombuffer(self._column_values(column), dtype=np.float64, count=n)
+        codes = np.frombuffer(self._status[column], dtype=np.int8, count=n)
+        present = np.fromiter((bool(t.strip()) for t in texts), dtype=bool, count=n)
+        if 0 <= self.setpoint_row < n:
+            present[self.setpoint_row] = False
+        rows = np.flatnonzero(present)
+        if rows.size == 0:
+            return None
+
+        mismatch = None
+        if unit:
+            # Zellen mit umrechenbarer Einheit je Einheit sammeln, alle anderen bekommen die Spalteneinheit
+            unit_of, conversion = UNIT_REGISTRY.unit_of, UNIT_REGISTRY.conversion
+            suffix = f" {unit}"
+            foreign = {}
+            for r in rows.tolist():
+                text = texts[r]
+                cell_unit = unit_of(text)
+                if cell_unit and cell_unit != unit and conversion(cell_unit, unit) is not None:
+                    foreign.setdefault(cell_unit, []).append(r)
+                    continue
+                clean = self._number_text(text, cell_unit)
+                if clean:
+                    texts[r] = clean + suffix
+            if foreign:
+                values = values.copy()
+                mismatch = np.zeros(n, dtype=bool)
+                for cell_unit, indices in foreign.items():
+                    convert = conversion(cell_unit, unit)
+                    indices = np.array(indices)
+                    if convert is False:
+                        mismatch[indices] = True
+                    else:
+                        values[indices] = values[indices] * convert[0] + convert[1]
+
+        if target is None:
+            ok = np.zeros(n, dtype=bool)
+        elif tolerance == 0:
+            ok = values == target
+        else:
+            # NaN (keine Zahl) ergibt hier automatisch False
+            ok = (values >= lower) & (values <= upper)
+        if mismatch is not None:
+            ok &= ~mismatch
+
+        if tolerance > 0 or highlight:
+            codes[present] = np.where(ok[present], self.STATUS_OK, self.STATUS_ERROR)
+        else:
+            codes[present] = self.STATUS_NEUTRAL
+        return int(rows[0]), int(rows[-1])
+
+    # --- Qt-Schnittstelle ---
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole:
+            if orientation == QtCore.Qt.Horizontal:
+                return self.headers[section] if section < len(self.headers) else None
+            return "Sollwerte" if section == self.setpoint_row else str(section + 1)
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
+        if index.row() != self.setpoint_row or not self.columns[index.column()].get('readonly', True):
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self._texts[column][row]
+        if role == QtCore.Qt.BackgroundRole or role == QtCore.Qt.ForegroundRole:
+            brushes = self._brushes.get(self._status[column][row])
+            if brushes is None:
+                return None
+            return brushes[0] if role == QtCore.Qt.BackgroundRole else brushes[1]
+        if role == self.StatusRole:
+            return self._status[column][row]
+        if role == self.ValueRole:
+            value = self._column_values(column)[row]
+            return None if math.isnan(value) else value
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        text = str(value) if value is not None else ''
+        if text == self._texts[column][row]:
+            return True
+        self.set_text(row, column, text)
+        self.cellEdited.emit(row, column)
+        return True
+
+
+# Fußzeilen unter der Messtabelle: Statistik je Spalte aus MeasurementTableModel.column_stats.
+class ColumnStatsModel(QtCore.QAbstractTableModel):
+    ROWS = ["n", "Mittelwert", "Std.-Abw.", "Min", "Max", "Außer Toleranz", "Cp", "Cpk"]
+    CPK_TARGET = 1.33  # übliche Mindestanforderung an die Prozessfähigkeit
+
+    def __init__(self, measurements, parent=None):
+        super().__init__(parent)
+        self.measurements = measurements
+        self._ok_brush = QtGui.QBrush(QtGui.QColor(MeasurementTableModel.STATUS_COLORS[MeasurementTableModel.STATUS_OK][1]))
+        self._error_brush = QtGui.QBrush(QtGui.QColor(MeasurementTableModel.STATUS_COLORS[MeasurementTableModel.STATUS_ERROR][1]))
+        # Mehrere Änderungen kurz hintereinander (Import, Einfügen) nur einmal anzeigen
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(100)
+        self._refresh_timer.timeout.connect(self._refresh)
+        measurements.statsChanged.connect(self._refresh_timer.start)
+        measurements.modelReset.connect(self._on_reset)
+
+    @staticmethod
+    def format_number(value, digits=4):
+        if value is None:
+            return ''
+        return f"{value:.{digits}f}".rstrip('0').rstrip('.') or '0'
+
+    @classmethod
+    def stat_texts(cls, stats):
+        # Anzeige-Texte in der Reihenfolge von ROWS, leer wenn die Spalte keine Zahlen enthält
+        if stats.n == 0:
+            return [''] * len(cls.ROWS)
+        return [
+            str(stats.n),
+            cls.format_number(stats.mean),
+            cls.format_number(stats.stddev),
+            cls.format_number(stats.minimum),
+            cls.format_number(stats.maximum),
+            str(stats.out_of_tolerance) if stats.lower is not None else '',
+            cls.format_number(stats.cp, 2),
+            cls.format_number(stats.cpk, 2),
+        ]
+
+    def _on_reset(self):
+        self.beginResetModel()
+        self.endResetModel()
+
+    def _refresh(self):
+        if self.columnCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.ROWS) - 1, self.columnCount() - 1))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.ROWS)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.measurements.columnCount()
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Vertical:
+            return self.ROWS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == QtCore.Qt.DisplayRole:
+            return self.stat_texts(self.measurements.column_stats(column))[row]
+        if role == QtCore.Qt.ForegroundRole:
+            stats = self.measurements.column_stats(column)
+            if row == 5 and stats.out_of_tolerance:
+                return self._error_brush
+            if row in (6, 7):
+                value = stats.cp if row == 6 else stats.cpk
+                if value is not None:
+                    return self._ok_brush if value >= self.CPK_TARGET else self._error_brush
+        return None
+
+    def flags(self, index):
+        return QtCore.Qt.ItemIsEnabled if index.isValid() else QtCore.Qt.NoItemFlags
+
+
+# Binäres Dataset-Format (.o3ds) für DATA_DIR.
+# Aufbau: Magic, Version und Länge des JSON-Kopfs (Überschriften, Vorlagen-Spalten, Zeilenzahl,
+# Sollwert-Zeile, Lage der Blöcke), danach je Spalte ein Block fester Breite und am Ende die
+# Stringtabelle (uint64-Offsets + UTF-8-Daten). Blockarten:
+#   f8  - float64, leere Zelle = NaN
+#   i8  - int64, leere Zelle = INT_EMPTY
+#   str - uint32-Index in die Stringtabelle (gleiche Texte nur einmal)
+# Zahlenblöcke werden nur gewählt, wenn sich jeder Text exakt zurückschreiben lässt ("2.50" oder
+# "12 bar" landen in der Stringtabelle), damit CSV/JSON -> o3ds -> CSV/JSON verlustfrei bleibt.
+# Gelesen wird per mmap: Öffnen liest nur den Kopf, Zellen werden beim Anzeigen aus der Datei geholt.
+class MappedDataset:
+    MAGIC = b"O3DS"
+    VERSION = 1
+    SUFFIX = ".o3ds"
+    INT_EMPTY = -(1 << 63)
+    PREFIX = struct.Struct("<4sHHI")  # magic, version, reserviert, Länge JSON-Kopf
+    INDEX_CODE = 'I' if array('I').itemsize == 4 else 'L'
+    ITEM_SIZES = {"f8": 8, "i8": 8, "str": 4}
+    FORMATS = {"f8": 'd', "i8": 'q', "str": 'I'}
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            # ACCESS_COPY: Änderungen in der Tabelle schreiben nie in die Datei zurück
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(self._mm) < self.PREFIX.size:
+            raise ValueError("Keine o3ds-Datei")
+        magic, version, _, header_len = self.PREFIX.unpack_from(self._mm, 0)
+        if magic != self.MAGIC:
+            raise ValueError("Keine o3ds-Datei")
+        if version > self.VERSION:
+            raise ValueError(f"o3ds-Version {version} wird nicht unterstützt")
+        header = json.loads(self._mm[self.PREFIX.size:self.PREFIX.size + header_len].decode('utf-8'))
+        start = self._align(self.PREFIX.size + header_len)
+        self.headers = header.get("headers", [])
+        self.columns = header.get("columns")
+        self.row_count = header.get("rows", 0)
+        self.setpoint_row = header.get("setpoint_row", -1)
+        self._blocks = []
+        for block in header.get("blocks", []):
+            kind = block["kind"]
+            offset = start + block["offset"]
+            self._blocks.append((kind, self._view(offset, self.row_count, self.FORMATS[kind], self.ITEM_SIZES[kind])))
+        strings = header.get("strings", {"count": 0, "offset": 0})
+        offsets_at = start + strings["offset"]
+        self._string_offsets = self._view(offsets_at, strings["count"] + 1, 'Q', 8)
+        self._string_data = offsets_at + 8 * (strings["count"] + 1)
+        self._strings = {}
+
+    @staticmethod
+    def _align(n):
+        return (n + 7) & ~7
+
+    def _view(self, offset, count, code, size):
+        raw = memoryview(self._mm)[offset:offset + count * size]
+        if len(raw) != count * size:
+            raise ValueError("o3ds-Datei ist unvollständig")
+        if sys.byteorder == 'little':
+            return raw.cast(code)
+        # Dateien sind little-endian, auf anderen Systemen einmalig umkopieren
+        converted = array(self.INDEX_CODE if code == 'I' else code)
+        converted.frombytes(raw)
+        converted.byteswap()
+        return converted
+
+    def string(self, index):
+        text = self._strings.get(index)
+        if text is None:
+            a, b = self._string_offsets[index], self._string_offsets[index + 1]
+            text = self._mm[self._string_data + a:self._string_data + b].decode('utf-8')
+            self._strings[index] = text
+        return text
+
+    def text(self, row, column):
+        kind, block = self._blocks[column]
+        value = block[row]
+        if kind == "str":
+            return self.string(value)
+        if kind == "i8":
+            return '' if value == self.INT_EMPTY else str(value)
+        return '' if value != value else repr(value)
+
+    def column_texts(self, column):
+        return MappedTextColumn(self, column)
+
+    def column_values(self, column):
+        # f8-Blöcke werden ohne Kopie als Werte-Array verwendet, sonst None (wird bei Bedarf berechnet)
+        kind, block = self._blocks[column]
+        return block if kind == "f8" else None
+
+    @classmethod
+    def column_kind(cls, texts):
+        can_int = can_float = True
+        for text in texts:
+            if not text:
+                continue
+            if can_int:
+                try:
+                    number = int(text)
+                    can_int = str(number) == text and cls.INT_EMPTY < number < (1 << 63)
+                except ValueError:
+                    can_int = False
+            if can_float:
+                try:
+                    number = float(text)
+                    can_float = number == number and repr(number) == text
+                except ValueError:
+                    can_float = False
+            if not (can_int or can_float):
+                return "str"
+        return "i8" if can_int else "f8"
+
+    @classmethod
+    def write(cls, path, headers, columns, column_texts, setpoint_row=-1):
+        path = Path(path)
+        row_count = max((len(texts) for texts in column_texts), default=0)
+        string_ids = {}
+        blocks, payload, offset = [], [], 0
+        for texts in column_texts:
+            texts = [str(t) if t is not None else '' for t in texts]
+            texts += [''] * (row_count - len(texts))
+            kind = cls.column_kind(texts)
+            if kind == "i8":
+                data = array('q', (int(t) if t else cls.INT_EMPTY for t in texts))
+            elif kind == "f8":
+                data = array('d', (float(t) if t else math.nan for t in texts))
+            else:
+                data = array(cls.INDEX_CODE, (string_ids.setdefault(t, len(string_ids)) for t in texts))
+            if sys.byteorder != 'little':
+                data.byteswap()
+            raw = data.tobytes()
+            raw += bytes(cls._align(len(raw)) - len(raw))
+            blocks.append({"kind": kind, "offset": offset})
+            payload.append(raw)
+            offset += len(raw)
+
+        encoded = [t.encode('utf-8') for t in string_ids]
+        string_offsets = array('Q', [0])
+        for item in encoded:
+            string_offsets.append(string_offsets[-1] + len(item))
+        if sys.byteorder != 'little':
+            string_offsets.byteswap()
+        payload.append(string_offsets.tobytes())
+        payload.append(b''.join(encoded))
+
+        header = json.dumps({
+            "headers": list(headers),
+            "columns": list(columns) if columns and any(columns) else None,
+            "rows": row_count,
+            "setpoint_row": setpoint_row,
+            "blocks": blocks,
+            "strings": {"offset": offset, "count": len(encoded)},
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        head = cls.PREFIX.pack(cls.MAGIC, cls.VERSION, 0, len(header)) + header
+        head += bytes(cls._align(len(head)) - len(head))
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(head)
+            for raw in payload:
+                f.write(raw)
+        os.replace(tmp_path, path)
+
+
+# Spalte eines gemappten Datasets mit Listen-Schnittstelle für das Tabellenmodell.
+# Gelesen wird aus der Datei, bearbeitete Zellen liegen in overrides.
+class MappedTextColumn:
+    def __init__(self, dataset, column):
+        self.dataset = dataset
+        self.column = column
+        self.overrides = {}
+
+    def __len__(self):
+        return self.dataset.row_count
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[r] for r in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        text = self.overrides.get(row)
+        return text if text is not None else self.dataset.text(row, self.column)
+
+    def __setitem__(self, row, text):
+        self.overrides[row] = text
+
+    def copy(self):
+        # Teilt das Dataset, nur die geänderten Zellen werden kopiert
+        column = MappedTextColumn(self.dataset, self.column)
+        column.overrides = dict(self.overrides)
+        return column
+
+    def __iter__(self):
+        text, overrides, column = self.dataset.text, self.overrides, self.column
+        for row in range(len(self)):
+            value = overrides.get(row)
+            yield value if value is not None else text(row, column)
+
+
+# Import großer CSV/JSON-Datasets im Hintergrund-Thread.
+# Die Datei wird stückweise gelesen und in Blöcken an das Tabellenmodell übergeben. Höchstens
+# MAX_PENDING_CHUNKS Blöcke warten gleichzeitig auf die GUI, damit der Speicher nicht über die
+# fertige Tabelle hinauswächst. Trennzeichen, Kodierung und Kopfzeile werden erkannt.
+class DatasetImporter(QtCore.QObject):
+    headers_ready = QtCore.pyqtSignal(list)
+    rows_ready = QtCore.pyqtSignal(list)
+    progress = QtCore.pyqtSignal(int)  # Prozent
+    finished = QtCore.pyqtSignal(int, bool)  # Anzahl Zeilen, abgebrochen
+    failed = QtCore.pyqtSignal(str)
+
+    CHUNK_ROWS = 5000
+    READ_SIZE = 1 << 20
+    SAMPLE_SIZE = 64 * 1024
+    MAX_PENDING_CHUNKS = 4
+    DELIMITERS = ",;\t|"
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = Path(path)
+        self._cancel = threading.Event()
+        self._slots = threading.Semaphore(self.MAX_PENDING_CHUNKS)
+        self._thread = threading.Thread(target=self._run, name="DatasetImporter", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def chunk_consumed(self):
+        # von der GUI nach dem Übernehmen eines Blocks aufrufen
+        self._slots.release()
+
+    @staticmethod
+    def detect_encoding(sample: bytes) -> str:
+        if sample.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return "utf-16"
+        try:
+            sample.decode("utf-8")
+            return "utf-8"
+        except UnicodeDecodeError as e:
+            # nur ein am Probenende abgeschnittenes Zeichen
+            if e.start >= len(sample) - 3:
+                return "utf-8"
+            return "cp1252"  # typischer Excel-Export unter Windows
+
+    def _emit_rows(self, rows) -> bool:
+        # wartet, bis die GUI wieder Platz hat; False bei Abbruch
+        while not self._slots.acquire(timeout=0.1):
+            if self._cancel.is_set():
+                return False
+        self.rows_ready.emit(rows)
+        return not self._cancel.is_set()
+
+    def _run(self):
+        count = 0
+        try:
+            size = max(self.path.stat().st_size, 1)
+            with open(self.path, "rb") as raw:
+                sample = raw.read(self.SAMPLE_SIZE)
+                raw.seek(0)
+                encoding = self.detect_encoding(sample)
+                f = io.TextIOWrapper(raw, encoding=encoding, errors="replace", newline="")
+                text_sample = sample.decode(encoding, errors="replace")
+                if self.path.suffix.lower() == ".json" or text_sample.lstrip("\ufeff \t\r\n").startswith("{"):
+                    rows = self._iter_json(f)
+                else:
+                    rows = self._iter_csv(f, text_sample)
+                chunk = []
+                last_percent = -1
+                for row in rows:
+                    chunk.append(row)
+                    if len(chunk) >= self.CHUNK_ROWS:
+                        count += len(chunk)
+                        if not self._emit_rows(chunk):
+                            break
+                        chunk = []
+                        percent = min(99, int(raw.tell() * 100 / size))
+                        if percent != last_percent:
+                            last_percent = percent
+                            self.progress.emit(percent)
+                if chunk and not self._cancel.is_set():
+                    count += len(chunk)
+                    self._emit_rows(chunk)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.progress.emit(100)
+        self.finished.emit(count, self._cancel.is_set())
+
+    def _iter_csv(self, f, text_sample: str):
+        # Probe an der letzten vollständigen Zeile abschneiden
+        cut = text_sample.rfind("\n")
+        if cut > 0:
+            text_sample = text_sample[:cut]
+        # Vom Sniffer nur das Trennzeichen übernehmen; Anführungszeichen wie csv.excel (und _save_csv),
+        # sonst werden "" in Zellen falsch gelesen
+        try:
+            delimiter = csv.Sniffer().sniff(text_sample, delimiters=self.DELIMITERS).delimiter
+        except csv.Error:
+            delimiter = csv.excel.delimiter
+        reader = csv.reader(f, csv.excel, delimiter=delimiter)
+        first = next(reader, None)
+        if first is None:
+            self.headers_ready.emit([])
+            return
+        # Erste Zeile ist der Kopf (wie bei _save_csv), sobald eine nicht-leere Zelle keine Zahl ist;
+        # Zeilen nur aus Zahlen und leeren Zellen gelten als Daten (Logger ohne Kopfzeile)
+        cells = [cell.strip() for cell in first]
+        has_header = not any(cells) or any(cell and math.isnan(MeasurementTableModel.parse_value(cell)) for cell in cells)
+        if has_header:
+            self.headers_ready.emit(first)
+        else:
+            self.headers_ready.emit([f"Spalte {i + 1}" for i in range(len(first))])
+            yield first
+        for row in reader:
+            if self._cancel.is_set():
+                return
+            yield row
+
+    def _iter_json(self, f):
+        # Liest {"headers": [...], "rows": [[...], ...]} stückweise, ohne das ganze Dokument zu laden.
+        # Die Schlüssel der obersten Ebene werden mit dem Decoder gelesen, nicht per Textsuche.
+        decoder = json.JSONDecoder()
+        buf = f.read(self.READ_SIZE)
+        eof = not buf
+
+        def more():
+            nonlocal buf, eof
+            data = f.read(self.READ_SIZE)
+            eof = not data
+            buf += data
+            return not eof
+
+        def skip(pos, chars=" \t\r\n"):
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf) or not more():
+                    return pos
+
+        def decode(pos):
+            while True:
+                try:
+                    return decoder.raw_decode(buf, pos)
+                except ValueError:
+                    if not more():
+                        raise
+
+        pos = skip(0)
+        if pos >= len(buf) or buf[pos] != "{":
+            raise ValueError("JSON-Dataset muss ein Objekt mit 'headers' und 'rows' sein")
+        pos += 1
+        headers = None
+        while True:
+            pos = skip(pos, " \t\r\n,")
+            if pos >= len(buf) or buf[pos] == "}":
+                # keine Zeilen
+                self.headers_ready.emit([str(h) for h in headers or []])
+                return
+            key, pos = decode(pos)
+            pos = skip(pos, " \t\r\n:")
+            if key == "rows" and headers is not None:
+                break
+            if key == "rows":
+                # unbekannter Aufbau (Kopf hinter den Zeilen): komplett laden
+                d = json.loads(buf + f.read())
+                self.headers_ready.emit([str(h) for h in d.get("headers", [])])
+                for row in d.get("rows", []):
+                    yield [str(v) if v is not None else "" for v in row]
+                return
+            item, pos = decode(pos)
+            if key == "headers":
+                headers = item
+        self.headers_ready.emit([str(h) for h in headers])
+
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ValueError("'rows' ist keine Liste")
+        pos += 1
+        while not self._cancel.is_set():
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                if pos >= len(buf):
+                    raise ValueError("Puffer leer")
+                row, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+                buf = buf[pos:]
+                pos = 0
+                more()
+                continue
+            pos = end
+            yield [str(v) if v is not None else "" for v in row]
+
+
+# Stylesheet für HTML-Export und Druck der Messtabelle
+TABLE_EXPORT_CSS = "body{font-family:Arial, Helvetica, sans-serif;font-size:12px;background:#121217;color:#e6eef8}table{border-collapse:collapse;width:100%}th,td{border:1px solid #444;padding:6px;text-align:left}th{background:#222;color:#fff}.meta{margin-bottom:10px}.setpoint{font-style:italic;color:#9aa;font-weight:bold}.short-description{margin-bottom:15px;padding:10px;border:1px solid #444;background:#1b1b20}.long-description{margin-top:20px;padding:10px;border:1px solid #444;background:#1b1b20}.value-ok{background:#1e3a1e;color:#90ee90}.value-error{background:#3a1e1e;color:#ff6b6b}table.stats{margin-top:12px;width:auto}img.banner{max-height:80px}"
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
@@ -6820,12 +10032,21 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setMinimumSize(1000, 600)
         self.center_start()
         self.current_template = None
-        self.setpoint_row_index = -1
+        self.table_model = MeasurementTableModel(self)
         self.export_short_description = ""
         self.export_long_description = ""
         self.global_tolerance = 0.0
         self.current_vehicle = None
-        self.vehicles = self._load_all_vehicles()
+        self.vehicle_index = VehicleIndex()
+        self.vehicle_index.refresh()
+        self.hu_au_store = HuAuStore()
+        self.hu_au_store.migrate_from_vehicles(self.vehicle_index)
+        self.save_scheduler = VehicleSaveScheduler.instance()
+        self.save_scheduler.saved.connect(self.vehicle_index.mark_saved)
+        self.save_scheduler.failed.connect(self._on_vehicle_save_failed)
+        self.job_runner = JobRunner.instance()
+        self.job_runner.jobDone.connect(self._on_job_done)
+        self.job_dialog = JobProgressDialog(self.job_runner, self)
         self.unsaved_changes = False
         self.auto_save_in_progress = False
         self.create_actions()
@@ -6837,10 +10058,19 @@ class MainWindow(QtWidgets.QMainWindow):
 
 # ANFANG DROPDOWNS/BUTTONS 
 
+    @property
+    def setpoint_row_index(self):
+        return self.table_model.setpoint_row
+
+    @setpoint_row_index.setter
+    def setpoint_row_index(self, row):
+        self.table_model.setpoint_row = row
+
 # speichererinnerung
     def setup_auto_save_check(self):
         # Überwache Änderungen in der Tabelle
-        self.table.cellChanged.connect(self.mark_unsaved_changes)
+        self.table_model.cellEdited.connect(self.mark_unsaved_changes)
+        self.table_model.rowsInserted.connect(self.mark_unsaved_changes)
         self.template_name_edit.textChanged.connect(self.mark_unsaved_changes)
         self.description_edit.textChanged.connect(self.mark_unsaved_changes)
         
@@ -6860,7 +10090,7 @@ class MainWindow(QtWidgets.QMainWindow):
         
         # Nur bestimmte Komponenten als "wichtige" Änderungen betrachten
         relevant_senders = [
-            self.table,           # Tabellenänderungen
+            self.table_model,     # Tabellenänderungen
             self.template_name_edit,  # Vorlagenname
             self.description_edit,    # Vorlagenbeschreibung
             self.columns_list        # Spaltenänderungen
@@ -6896,6 +10126,25 @@ class MainWindow(QtWidgets.QMainWindow):
                 event.ignore()
         else:
             event.accept()
+        
+        # Ausstehende Fahrzeug-Saves vor dem Beenden schreiben, laufende Hintergrundaufträge abschließen
+        if event.isAccepted():
+            self.save_scheduler.flush()
+            self.job_runner.shutdown()
+
+    def _on_vehicle_save_failed(self, vehicle_name, error):
+        QtWidgets.QMessageBox.warning(self, "Auto-Save Fehler",
+                                    f"Fahrzeug '{vehicle_name}' konnte nicht gespeichert werden: {error}")
+
+    def _on_job_done(self, job):
+        # Abschlussmeldung für alle Hintergrundaufträge
+        self.statusBar().showMessage(f"{job.title}: {job.message}", 10000)
+        if job.state == BackgroundJob.FAILED:
+            QtWidgets.QMessageBox.warning(self, "Hintergrundauftrag fehlgeschlagen", f"{job.title}:\n{job.message}")
+
+    def show_jobs(self):
+        self.job_dialog.show()
+        self.job_dialog.raise_()
 
     def show_unsaved_changes_dialog(self):
         dialog = UnsavedChangesDialog(self)
@@ -6921,13 +10170,10 @@ class MainWindow(QtWidgets.QMainWindow):
                     self, 
                     "Tabellendaten speichern", 
                     str(DATA_DIR), 
-                    "CSV Dateien (*.csv);;JSON Dateien (*.json)"
+                    DATASET_FILE_FILTER
                 )
                 if fname:
-                    if fname.lower().endswith('.csv'):
-                        self._save_csv(fname)
-                    else:
-                        self._save_json(fname)
+                    self._save_dataset_file(fname)
                     QtWidgets.QMessageBox.information(self, "Gespeichert", f"Tabellendaten gespeichert: {fname}")
                     self.clear_unsaved_changes()
                     return True
@@ -6948,11 +10194,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.move(frame_geom.topLeft())
 
     def show_hu_au_manager(self):
-        if not self.vehicles:
+        self.vehicle_index.refresh()
+        vehicle_names = self.vehicle_index.names()
+        if not vehicle_names:
             QtWidgets.QMessageBox.warning(self, "Keine Fahrzeuge", "Bitte zuerst Fahrzeuge anlegen.")
             return
             
-        dlg = hu_auManagerDialog(self.vehicles, self)
+        dlg = hu_auManagerDialog(vehicle_names, self.hu_au_store, self)
         dlg.exec_()
 
     def show_storage_manager(self):
@@ -7002,12 +10250,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self.export_html_act = QtWidgets.QAction("HTML Tabellenexport", self)
         self.export_html_act.triggered.connect(self.export_html)
 
+        self.jobs_act = QtWidgets.QAction("Hintergrundaufträge", self)
+        self.jobs_act.triggered.connect(self.show_jobs)
+
         self.add_description_act = QtWidgets.QAction("Tabellenbeschreibungen hinzufügen", self)
         self.add_description_act.triggered.connect(self.add_descriptions)
 
         self.check_values_act = QtWidgets.QAction("Sollwerte prüfen", self)
         self.check_values_act.triggered.connect(self.check_all_values)
 
+        self.paste_rows_act = QtWidgets.QAction("Zeilen aus Zwischenablage einfügen", self)
+        self.paste_rows_act.setShortcut(QtGui.QKeySequence.Paste)
+        self.paste_rows_act.setShortcutContext(QtCore.Qt.WidgetWithChildrenShortcut)
+        self.paste_rows_act.triggered.connect(self.paste_rows)
+
         self.new_vehicle_act = QtWidgets.QAction("Neues Fahrzeug", self)
         self.new_vehicle_act.triggered.connect(self.new_vehicle)
 
@@ -7168,6 +10424,8 @@ class MainWindow(QtWidgets.QMainWindow):
         export_menu.setStyleSheet(menu_style)
         export_menu.addAction(self.print_act)
         export_menu.addAction(self.export_html_act)
+        export_menu.addSeparator()
+        export_menu.addAction(self.jobs_act)
         export_btn.setMenu(export_menu)
         tb.addWidget(export_btn)
 
@@ -7179,6 +10437,7 @@ class MainWindow(QtWidgets.QMainWindow):
         data_menu.setStyleSheet(menu_style)
         data_menu.addAction(self.add_description_act)
         data_menu.addAction(self.check_values_act)
+        data_menu.addAction(self.paste_rows_act)
         data_menu.addAction(self.set_tolerance_act)
         data_menu.addAction(self.view_units_act)
         data_btn.setMenu(data_menu)
@@ -7266,12 +10525,13 @@ class MainWindow(QtWidgets.QMainWindow):
 # ENDE DROPDOWNS/BUTTONS
 
     def advanced_vehicle_search(self):
-        if not self.vehicles:
+        self.vehicle_index.refresh()
+        if not len(self.vehicle_index):
             QtWidgets.QMessageBox.information(self, "Keine Fahrzeuge", 
                                             "Es sind keine Fahrzeuge zum Durchsuchen vorhanden.")
             return
             
-        dlg = AdvancedVehicleSelectionDialog(self.vehicles, self)
+        dlg = AdvancedVehicleSelectionDialog(self.vehicle_index, self)
         if dlg.exec_() == QtWidgets.QDialog.Accepted:
             selected_vehicle = dlg.get_selected_vehicle()
             if selected_vehicle:
@@ -7286,7 +10546,7 @@ class MainWindow(QtWidgets.QMainWindow):
                                         "Bitte wählen Sie zuerst ein Fahrzeug aus, um die Tabelle zu speichern.")
             return
         
-        if not self.current_template and self.table.rowCount() == 0:
+        if not self.current_template and self.table_model.rowCount() == 0:
             QtWidgets.QMessageBox.warning(self, "Keine Daten", 
                                         "Keine Tabellendaten zum Speichern vorhanden.")
             return
@@ -7319,36 +10579,12 @@ class MainWindow(QtWidgets.QMainWindow):
             self._apply_template_to_ui(template)
             
             # Tabellendaten laden
-            self.table.clear()
-            self.table.setRowCount(len(saved_table.table_data))
-            self.table.setColumnCount(len(template.columns))
-            
-            # Header setzen
-            headers = []
-            for c in template.columns:
-                unit = c.get('unit', '')
-                if unit:
-                    headers.append(f"{c.get('name', '')} ({unit})")
-                else:
-                    headers.append(c.get('name', ''))
-            self.table.setHorizontalHeaderLabels(headers)
-            
-            # Zellendaten laden
-            for row, row_data in enumerate(saved_table.table_data):
-                for col, cell_data in enumerate(row_data):
-                    if col < len(template.columns):
-                        item = QtWidgets.QTableWidgetItem(cell_data.get('text', ''))
-                        
-                        # Formatierung wiederherstellen
-                        bg_color = cell_data.get('background')
-                        fg_color = cell_data.get('foreground')
-                        
-                        if bg_color:
-                            item.setBackground(QtGui.QColor(bg_color))
-                        if fg_color:
-                            item.setForeground(QtGui.QColor(fg_color))
-                        
-                        self.table.setItem(row, col, item)
+            self.table_model.reset_columns(
+                [MeasurementTableModel.header_for(c) for c in template.columns],
+                template.columns,
+                saved_table.columns
+            )
+            self._apply_column_widths(template.columns)
             
             # Sollwert-Zeile wiederherstellen falls vorhanden
             self._add_setpoint_row(template.columns)
@@ -7357,6 +10593,9 @@ class MainWindow(QtWidgets.QMainWindow):
             self.template_name_edit.setText(template.name)
             self.description_edit.setPlainText(template.description)
             
+            # OK/Fehler-Farben aus den Sollwerten neu berechnen
+            self.check_all_values()
+            
             QtWidgets.QMessageBox.information(self, "Erfolg", 
                                             f"Tabelle '{saved_table.name}' wurde geladen.")
             
@@ -7404,22 +10643,8 @@ class MainWindow(QtWidgets.QMainWindow):
         if not fname:
             return  # wenn abgebrochen
         
-        # Backup erstellen
-        result = self.backup_manager.create_full_backup(backup_path=fname)
-        
-        if result["success"]:
-            QtWidgets.QMessageBox.information(
-                self, 
-                "Backup erfolgreich", 
-                f"Schnell-Backup wurde erstellt:\n{result['backup_path']}\n\n"
-                f"{result['file_count']} Dateien, {result['total_size'] / 1024 / 1024:.2f} MB"
-            )
-        else:
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Backup fehlgeschlagen",
-                f"Backup konnte nicht erstellt werden:\n{result['error']}"
-            )
+        # Vollständiges Backup im Hintergrund erstellen, die Zip-Datei ist für sich allein wiederherstellbar
+        self.job_runner.submit("Schnell-Backup", lambda job: self.backup_manager.run_backup_job(job, backup_path=fname))
 
 
     def view_activities_history(self):
@@ -7564,13 +10789,36 @@ class MainWindow(QtWidgets.QMainWindow):
         header.addStretch()
         right_layout.addLayout(header)
 
-        self.table = QtWidgets.QTableWidget()
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.table_model)
         self.table.setAlternatingRowColors(False)
         self.table.verticalHeader().setVisible(True)
         self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.cellChanged.connect(self.on_cell_changed)
+        self.table_model.cellEdited.connect(self.on_cell_changed)
+        self.table.addAction(self.paste_rows_act)  # Strg+V in der Tabelle
         right_layout.addWidget(self.table, 1)
 
+        # Statistik-Fußzeilen, Spaltenbreiten und Scrollposition folgen der Messtabelle
+        self.stats_model = ColumnStatsModel(self.table_model, self)
+        self.stats_footer = QtWidgets.QTableView()
+        self.stats_footer.setModel(self.stats_model)
+        self.stats_footer.horizontalHeader().hide()
+        self.stats_footer.horizontalHeader().setStretchLastSection(True)
+        self.stats_footer.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.stats_footer.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.stats_footer.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.stats_footer.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.stats_footer.verticalHeader().setDefaultSectionSize(20)
+        self.stats_footer.setFixedHeight(20 * len(ColumnStatsModel.ROWS) + 2 * self.stats_footer.frameWidth())
+        for header in (self.table.verticalHeader(), self.stats_footer.verticalHeader()):
+            header.setFixedWidth(90)
+        self.table.horizontalHeader().sectionResized.connect(lambda idx, old, new: self.stats_footer.setColumnWidth(idx, new))
+        self.table.horizontalScrollBar().valueChanged.connect(self.stats_footer.horizontalScrollBar().setValue)
+        self.table_model.modelReset.connect(self._sync_stats_footer)
+        self.table_model.modelReset.connect(self._update_stats_specs)
+        self.table_model.headerDataChanged.connect(self._update_stats_specs)
+        right_layout.addWidget(self.stats_footer)
+
         row_ops = QtWidgets.QHBoxLayout()
         add_row = QtWidgets.QPushButton("+ Zeile")
         add_row.clicked.connect(self.add_row)
@@ -7608,10 +10856,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.description_edit.clear()
         self.columns_list.clear()
         self.current_template = None
-        self.table.clear()
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
-        self.setpoint_row_index = -1
+        self.table_model.clear()
         self.export_short_description = ""
         self.export_long_description = ""
         self.global_tolerance = 0.0
@@ -7674,42 +10919,40 @@ class MainWindow(QtWidgets.QMainWindow):
             elif reply == QtWidgets.QMessageBox.Cancel:
                 return
         
-        fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Dataset laden", str(DATA_DIR), "CSV Dateien (*.csv);;JSON Dateien (*.json)")
+        fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Dataset laden", str(DATA_DIR), DATASET_FILE_FILTER)
         if not fname:
             return
-        if fname.lower().endswith('.csv'):
-            self._load_csv(fname)
+        if fname.lower().endswith(MappedDataset.SUFFIX):
+            self._load_binary(fname)
         else:
-            self._load_json(fname)
-        self.clear_unsaved_changes()
+            self._import_dataset(fname)
 
     def save_dataset(self):
-        fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Dataset speichern", str(DATA_DIR), "CSV Dateien (*.csv);;JSON Dateien (*.json)")
+        fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Dataset speichern", str(DATA_DIR), DATASET_FILE_FILTER)
         if not fname:
             return
-        if fname.lower().endswith('.csv'):
-            self._save_csv(fname)
-        else:
-            self._save_json(fname)
+        self._save_dataset_file(fname)
         QtWidgets.QMessageBox.information(self, "Gespeichert", f"Dataset gespeichert: {fname}")
         self.clear_unsaved_changes()
 
     def print_table(self):
-        html = self._generate_html_for_print()
         printer = QPrinter()
         dlg = QPrintDialog(printer, self)
-        if dlg.exec_() == QtWidgets.QDialog.Accepted:
-            doc = QtGui.QTextDocument()
-            doc.setHtml(html)
-            doc.print_(printer)
+        if dlg.exec_() != QtWidgets.QDialog.Accepted:
+            return
+        snapshot = self._print_snapshot()
+
+        def print_job(job):
+            self._print_paginated(printer, snapshot, job)
+            job.message = f"{len(snapshot['rows'])} Zeilen gedruckt"
+
+        self.job_runner.submit("Tabelle drucken", print_job)
 
     def export_html(self):
-        html = self._generate_html_for_print()
         fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "HTML speichern", str(DATA_DIR / "export.html"), "HTML Dateien (*.html)")
         if not fname:
             return
-        with open(fname, 'w', encoding='utf-8') as f:
-            f.write(html)
+        self._write_html_export(fname)
         QtWidgets.QMessageBox.information(self, "Export erfolgreich", f"HTML wurde gespeichert: {fname}")
 
     def add_descriptions(self):
@@ -7722,55 +10965,24 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.warning(self, "Keine Vorlage", "Bitte zuerst eine Vorlage laden")
             return
         
-        for row in range(self.table.rowCount()):
-            if row == self.setpoint_row_index:  # Sollwert zeile überspringen
+        # Alle Spalten mit Sollwert als ein Durchgang, die Ansicht wird danach einmal neu gezeichnet
+        checks = []
+        for column, col_info in enumerate(self.current_template.columns[:self.table_model.columnCount()]):
+            setpoint_value = col_info.get('setpoint')
+            if setpoint_value is None:  # Nur Spalten mit Sollwerten prüfen
                 continue
             
-            for column in range(self.table.columnCount()):
-                if column >= len(self.current_template.columns):
-                    continue
-                    
-                col_info = self.current_template.columns[column]
-                setpoint_value = col_info.get('setpoint')
-            
-                if setpoint_value is None:  # Nur Spalten mit Sollwerten prüfen
-                    continue
-                
-                cell_item = self.table.item(row, column)
-                if not cell_item:
-                    continue
-                
-                actual_value = cell_item.text()
-            
-                tolerance = col_info.get('tolerance', self.global_tolerance)
-            
-                if actual_value.strip():  # Nur prüfen wenn Wert vorhanden
-                    actual_clean = self._remove_unit(actual_value)
-                    setpoint_clean = self._remove_unit(setpoint_value)
-                
-                    is_ok = self.check_value(actual_clean, setpoint_clean, tolerance)
-                
-                    unit = col_info.get('unit', '')
-                    if unit and actual_clean:
-                        formatted_value = self._format_value_with_unit(actual_clean, unit)
-                        cell_item.setText(formatted_value)
-                
-                    if tolerance > 0 or col_info.get('always_highlight', False):
-                    # Farbe setzen basierend auf Prüfung
-                        if is_ok:
-                            cell_item.setBackground(QtGui.QColor('#1e3a1e'))  
-                            cell_item.setForeground(QtGui.QColor('#90ee90'))  
-                        else:
-                            cell_item.setBackground(QtGui.QColor('#3a1e1e'))  
-                            cell_item.setForeground(QtGui.QColor('#ff6b6b'))  
-                    else:
-                        cell_item.setBackground(QtGui.QColor(0, 0, 0, 0))     
-                        cell_item.setForeground(QtGui.QColor(255, 255, 255))  
+            tolerance = col_info.get('tolerance', self.global_tolerance)
+            checks.append((column, setpoint_value, tolerance, col_info.get('unit', ''),
+                           col_info.get('always_highlight', False)))
+        
+        self.table_model.check_columns(checks)
 
     def set_tolerance(self):
         dlg = ToleranceDialog(self.global_tolerance, self)
         if dlg.exec_() == QtWidgets.QDialog.Accepted:
             self.global_tolerance = dlg.get_tolerance()
+            self._update_stats_specs()
             QtWidgets.QMessageBox.information(self, "Toleranz gesetzt", 
                                             f"Globale Toleranz wurde auf {self.global_tolerance}% eingestellt.\n"
                                             f"Klicken Sie auf 'Sollwerte prüfen' um alle Werte neu zu bewerten.")
@@ -7781,29 +10993,17 @@ class MainWindow(QtWidgets.QMainWindow):
 
 
     def _load_all_vehicles(self):
-        vehicles = []
-        if VEHICLES_BASE_DIR.exists():
-            for vehicle_dir in VEHICLES_BASE_DIR.iterdir():
-                if vehicle_dir.is_dir():
-                    vehicle_file = vehicle_dir / "vehicle.json"
-                    if vehicle_file.exists():
-                        try:
-                            with open(vehicle_file, "r", encoding="utf-8") as f:
-                                data = json.load(f)
-                            vehicle = Vehicle.from_dict(data)
-                            vehicles.append(vehicle)
-                        except Exception as e:
-                            print(f"Fehler beim Laden von {vehicle_file}: {e}")
-        return vehicles
+        # Lädt alle Fahrzeuge vollständig, nur für fahrzeugübergreifende Dialoge
+        self.vehicle_index.refresh()
+        return self.vehicle_index.all_vehicles()
 
     def _refresh_vehicle_combo(self):
+        self.vehicle_combo.blockSignals(True)
         self.vehicle_combo.clear()
+        self.vehicle_combo.blockSignals(False)
         
-        # Prüfen ob vehicles existiert
-        if not hasattr(self, 'vehicles') or not self.vehicles:
-            self.vehicles = self._load_all_vehicles()
-            
-        if not self.vehicles:
+        vehicle_names = self.vehicle_index.names()
+        if not vehicle_names:
             return
         
         # ComboBox konfigurieren für bessere Suche
@@ -7811,26 +11011,31 @@ class MainWindow(QtWidgets.QMainWindow):
         self.vehicle_combo.setInsertPolicy(QtWidgets.QComboBox.NoInsert)
         
         # Auto-Vervollständigung
-        completer = QtWidgets.QCompleter([v.name for v in self.vehicles])
+        completer = QtWidgets.QCompleter(vehicle_names)
         completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
         completer.setFilterMode(QtCore.Qt.MatchContains)
         completer.setCompletionMode(QtWidgets.QCompleter.PopupCompletion)
         self.vehicle_combo.setCompleter(completer)
         
-        for vehicle in self.vehicles:
-            self.vehicle_combo.addItem(vehicle.name, vehicle)
+        self.vehicle_combo.blockSignals(True)
+        self.vehicle_combo.addItems(vehicle_names)
+        # Auswahl beibehalten, ohne dabei ein anderes Fahrzeug zu laden
+        if self.current_vehicle and self.current_vehicle.name in self.vehicle_index:
+            self.vehicle_combo.setCurrentText(self.current_vehicle.name)
+        self.vehicle_combo.blockSignals(False)
 
 
     def on_vehicle_selected(self, vehicle_name):
         if not vehicle_name:
             return
             
-        # Finde das entsprechende Vehicle-Objekt
-        for vehicle in self.vehicles:
-            if vehicle.name == vehicle_name:
-                self.current_vehicle = vehicle
-                self._update_vehicle_display()
-                break
+        # Fahrzeug erst hier vollständig laden
+        if vehicle_name not in self.vehicle_index:
+            return
+        vehicle = self.vehicle_index.load_vehicle(vehicle_name)
+        if vehicle:
+            self.current_vehicle = vehicle
+            self._update_vehicle_display()
 
     # Fahrzeugfunktionen
     def new_vehicle(self):
@@ -7844,7 +11049,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     QtWidgets.QMessageBox.warning(self, "Fehler", "Bitte geben Sie einen Fahrzeugnamen ein.")
                     return
                     
-                self.vehicles.append(new_vehicle)
+                self.vehicle_index.update(new_vehicle)
                 self.current_vehicle = new_vehicle
                 self._refresh_vehicle_combo()
                 self.vehicle_combo.setCurrentText(new_vehicle.name)
@@ -7868,6 +11073,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 updated_vehicle = dlg.get_vehicle()
                 
                 if old_name != updated_vehicle.name:
+                    # Offene Saves noch in den alten Ordner schreiben, bevor er umbenannt wird
+                    self.save_scheduler.flush()
                     old_dir = VEHICLES_BASE_DIR / old_name
                     if old_dir.exists():
                         temp_dir = VEHICLES_BASE_DIR / f"temp_{old_name}"
@@ -7882,11 +11089,11 @@ class MainWindow(QtWidgets.QMainWindow):
                         # Endgültig umbenennen
                         temp_dir.rename(new_dir)
                 
-                for i, vehicle in enumerate(self.vehicles):
-                    if vehicle.name == old_name:
-                        self.vehicles[i] = updated_vehicle
-                        self.current_vehicle = updated_vehicle
-                        break
+                if old_name != updated_vehicle.name:
+                    self.vehicle_index.remove(old_name)
+                    self.hu_au_store.rename(old_name, updated_vehicle.name)
+                self.vehicle_index.update(updated_vehicle)
+                self.current_vehicle = updated_vehicle
                         
                 self._refresh_vehicle_combo()
                 self.vehicle_combo.setCurrentText(updated_vehicle.name)
@@ -7912,14 +11119,10 @@ class MainWindow(QtWidgets.QMainWindow):
             # Auto-Save-Flag setzen
             self.auto_save_in_progress = True
             
-            # Fahrzeugverzeichnis
-            vehicle.ensure_directories()
-            
-            # Sicherung Fahrzeugdaten
-            vehicle_file = vehicle.get_vehicle_dir() / "vehicle.json"
-            with open(vehicle_file, "w", encoding="utf-8") as f:
-                json.dump(vehicle.to_dict(), f, indent=2, ensure_ascii=False)
-            print(f"Fahrzeug automatisch gespeichert: {vehicle_file}")
+            # Sicherung Fahrzeugdaten (schreibt im Hintergrund)
+            self.save_scheduler.schedule(vehicle)
+            # Index mitziehen
+            self.vehicle_index.update(vehicle)
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Auto-Save Fehler", f"Fehler beim automatischen Speichern: {e}")
         finally:
@@ -7928,20 +11131,19 @@ class MainWindow(QtWidgets.QMainWindow):
 
 
     def load_vehicle(self):
-        vehicle_names = [v.name for v in self.vehicles]
+        vehicle_names = self.vehicle_index.names()
         if not vehicle_names:
             QtWidgets.QMessageBox.information(self, "Info", "Keine Fahrzeuge zum Laden verfügbar.")
             return
             
         name, ok = QtWidgets.QInputDialog.getItem(self, "Fahrzeug laden", "Fahrzeug auswählen:", vehicle_names, 0, False)
         if ok and name:
-            for vehicle in self.vehicles:
-                if vehicle.name == name:
-                    self.current_vehicle = vehicle
-                    self._refresh_vehicle_combo()
-                    self.vehicle_combo.setCurrentText(vehicle.name)
-                    self._update_vehicle_display()
-                    break
+            vehicle = self.vehicle_index.load_vehicle(name)
+            if vehicle:
+                self.current_vehicle = vehicle
+                self._refresh_vehicle_combo()
+                self.vehicle_combo.setCurrentText(vehicle.name)
+                self._update_vehicle_display()
 
     def save_vehicle(self):
         if not self.current_vehicle:
@@ -7963,199 +11165,36 @@ class MainWindow(QtWidgets.QMainWindow):
             if not folder:
                 return
             export_dir = Path(folder) / f"{self.current_vehicle.name}_export"
-            export_dir.mkdir(exist_ok=True)
-            
-            # Bilder kopieren, wenn für Export freigegeben
-            if include_images:
-                for attachment in self.current_vehicle.attachments:
-                    if 'scan_path' in attachment and Path(attachment['scan_path']).exists():
-                        shutil.copy2(attachment['scan_path'], export_dir / attachment['filename'])
-            
             html_path = export_dir / f"{self.current_vehicle.name}.html"
-            html = self._generate_vehicle_html(include_images=include_images, export_dir=export_dir)
         else:
             fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Fahrzeug exportieren", str(VEHICLES_BASE_DIR / f"{self.current_vehicle.name}.html"), "HTML Dateien (*.html)")
             if not fname:
                 return
+            export_dir = None
             html_path = Path(fname)
-            html = self._generate_vehicle_html(include_images=False)
-        
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-        QtWidgets.QMessageBox.information(self, "Export erfolgreich", f"Fahrzeugbericht wurde exportiert: {html_path}")
+
+        # Eigene Kopie des Fahrzeugs, damit während des Exports weiter bearbeitet werden kann
+        vehicle = Vehicle.from_dict(json.loads(json.dumps(self.current_vehicle.to_dict(), ensure_ascii=False)))
+
+        def export_job(job):
+            if export_dir is not None:
+                export_dir.mkdir(exist_ok=True)
+                # Bilder kopieren, wenn für Export freigegeben
+                job.set_progress(-1, "Anhänge kopieren")
+                copy_vehicle_attachments(vehicle, export_dir)
+            job.set_progress(-1, "Bericht erzeugen")
+            html = render_vehicle_report(vehicle, include_images, export_dir)
+            job.check_cancelled()
+            REPORT_RENDERER.write(html_path, html)
+            job.message = f"Fahrzeugbericht wurde exportiert: {html_path}"
+
+        self.job_runner.submit(f"Fahrzeug '{vehicle.name}' exportieren", export_job)
 
 # html generieren
     def _generate_vehicle_html(self, include_images=False, export_dir=None):
         if not self.current_vehicle:
             return ""
-
-        html = [f"""
-            <!--
-            
-            ***********************************************************************
-            * o3Measurement Version {o3VERSION} by openw3rk INVENT - VEHICLE SOLUTIONS *
-            *             https://openw3rk.de | https://vs.openw3rk.de            *
-            *                  - Copyright (c) openw3rk INVENT -                  *
-            ***********************************************************************
-            
-            -->
-            <!--
-            
-            INFORMATION:                                                                  
-            o3Measurement EXPORT | VEHICLE: {self.current_vehicle.name}                    
-            o3Measurement EXPORT | VEHICLE DESCRIPTION: {self.current_vehicle.description} 
-            
-            -->
-            
-        <html>
-        <head>
-            <meta charset='utf-8'>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background: #2c3e50; color: white; padding: 20px; border-radius: 5px; }}
-                .section {{ margin: 20px 0; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
-                .specs-table {{ width: 100%; border-collapse: collapse; }}
-                .specs-table th, .specs-table td {{ padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }}
-                .specs-table th {{ background: #f2f2f2; }}
-                .fluids-table, .parts-table {{ width: 100%; border-collapse: collapse; }}
-                .fluids-table th, .fluids-table td, .parts-table th, .parts-table td {{ padding: 8px; text-align: left; border: 1px solid #ddd; }}
-                .attachments {{ display: flex; flex-wrap: wrap; gap: 10px; }}
-                .attachment {{ border: 1px solid #ddd; padding: 10px; border-radius: 5px; }}
-                .attachment img {{
-                    max-width: 200px;
-                    max-height: 200px;
-                    cursor: pointer;
-                    transition: transform 0.2s;
-                }}
-                /* Modal (großes Bild) */
-                .modal {{
-                    display: none;
-                    position: fixed;
-                    z-index: 9999;
-                    padding-top: 50px;
-                    left: 0;
-                    top: 0;
-                    width: 100%;
-                    height: 100%;
-                    background-color: rgba(0,0,0,0.8);
-                }}
-                .modal img {{
-                    margin: auto;
-                    display: block;
-                    max-width: 90%;
-                    max-height: 90%;
-                    border-radius: 5px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class='header'>
-                <h1>{self.current_vehicle.name}</h1>
-                <p>{self.current_vehicle.description}</p>
-            </div>
-
-            
-            <div id="imgModal" class="modal" onclick="this.style.display='none'">
-                <img id="modalImg">
-            </div>
-
-            <script>
-            function showModal(src) {{
-                var modal = document.getElementById("imgModal");
-                var modalImg = document.getElementById("modalImg");
-                modal.style.display = "block";
-                modalImg.src = src;
-            }}
-            </script>
-        """]
-    
-        # Spezifikationen
-        html.append("<div class='section'>")
-        html.append("<h2>Fahrzeugspezifikationen</h2>")
-        html.append("<table class='specs-table'>")
-        specs = self.current_vehicle.specifications
-        for key, value in specs.items():
-            if key != 'fluessigkeiten' and value:
-                display_key = key.capitalize()
-                html.append(f"<tr><th>{display_key}</th><td>{value}</td></tr>")
-        html.append("</table>")
-        html.append("</div>")
-    
-        # Flüssigkeiten
-        fluids = specs.get('fluessigkeiten', {})
-        if fluids:
-            html.append("<div class='section'>")
-            html.append("<h2>Flüssigkeiten</h2>")
-            html.append("<table class='fluids-table'>")
-            html.append("<tr><th>Flüssigkeit</th><th>Spezifikation</th><th>Menge</th></tr>")
-            for fluid_name, fluid_spec in fluids.items():
-                html.append(f"<tr><td>{fluid_name}</td><td>{fluid_spec.get('spezifikation', '')}</td><td>{fluid_spec.get('menge', '')}</td></tr>")
-            html.append("</table>")
-            html.append("</div>")
-        
-        if self.current_vehicle.parts:
-            html.append("<div class='section'>")
-            html.append("<h2>Bauteile und Teilenummern</h2>")
-            html.append("<table class='parts-table'>")
-            html.append("<tr><th>Bauteil</th><th>Teilenummer</th><th>Motor Code</th></tr>")
-            for part in self.current_vehicle.parts:
-                html.append(f"<tr><td>{part.get('bauteil', '')}</td><td>{part.get('teilenummer', '')}</td><td>{part.get('motor_code', '')}</td></tr>")
-            html.append("</table>")
-            html.append("</div>")
-    
-        if self.current_vehicle.service_history or self.current_vehicle.service_intervals:
-            html.append("<div class='section'>")
-            html.append("<h2>Service-Informationen</h2>")
-        
-            if self.current_vehicle.last_service.get('ölwechsel_km'):
-                html.append(f"<p><strong>Letzter Ölwechsel:</strong> {self.current_vehicle.last_service.get('ölwechsel_km')} km am {self.current_vehicle.last_service.get('ölwechsel_datum', '')}</p>")
-        
-            if self.current_vehicle.service_intervals:
-                html.append("<h3>Service-Intervalle</h3>")
-                html.append("<table class='fluids-table'>")
-                html.append("<tr><th>Service</th><th>Intervall</th></tr>")
-                for service, interval in self.current_vehicle.service_intervals.items():
-                    unit = SERVICE_TYPES.get(service, {}).get('unit', 'km')
-                    html.append(f"<tr><td>{service}</td><td>{interval} {unit}</td></tr>")
-                html.append("</table>")
-        
-            html.append("</div>")
-    
-        # Anhänge/scans
-        if self.current_vehicle.attachments and include_images:
-            html.append("<div class='section'>")
-            html.append("<h2>Dokumente und Scans</h2>")
-            html.append("<div class='attachments'>")
-            for attachment in self.current_vehicle.attachments:
-                if attachment['mimetype'] == 'image':
-                    if include_images and export_dir:
-                        img_src = attachment['filename']
-                    else:
-                        img_src = f"data:image/jpeg;base64,{attachment['data']}"
-                
-                    html.append(f"""
-                    <div class='attachment'>
-                        <img src='{img_src}' alt='{attachment['filename']}' onclick="showModal(this.src)"><br>
-                        {attachment['filename']}
-                    </div>
-                    """)
-                else:
-                    html.append(f"""
-                    <div class='attachment'>
-                        <strong>{attachment['filename']}</strong><br>
-                        ({attachment['mimetype']})
-                    </div>
-                    """)
-            html.append("</div>")
-            html.append("</div>")
-        html.append(f"""
-        <div class='footer'>
-            <h5>Erstellt mit:<br>{o3NAME} Version {o3VERSION}<br>openw3rk INVENT - Vehicle Solutions</h5>
-            <p>Zeitpunkt: <span id="now"></span><script>document.getElementById('now').textContent=new Date().toLocaleString()</script>
-        </div>
-        """)
-        html.append("</body></html>")
-        return ''.join(html)
+        return render_vehicle_report(self.current_vehicle, include_images, export_dir)
 
     def _update_vehicle_display(self):
         if self.current_vehicle:
@@ -8177,17 +11216,13 @@ class MainWindow(QtWidgets.QMainWindow):
             try:
                 updated_vehicle = dlg.get_service_data()
                 self.current_vehicle = updated_vehicle
-                for i, vehicle in enumerate(self.vehicles):
-                    if vehicle.name == self.current_vehicle.name:
-                        self.vehicles[i] = updated_vehicle
-                        break
                 self._auto_save_vehicle(updated_vehicle)
             finally:
                 self.auto_save_in_progress = False
 
 
     def show_pending_services(self):
-        dlg = PendingServicesDialog(self.vehicles, self)
+        dlg = PendingServicesDialog(self._load_all_vehicles(), self)
         dlg.exec_()
 
     def _refresh_templates_list(self):
@@ -8197,12 +11232,15 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def check_value(self, actual_value, setpoint_value, tolerance_percent):
         try:
-            # Entferne Einheiten für den Vergleich
-            actual_clean = self._remove_unit(actual_value)
-            setpoint_clean = self._remove_unit(setpoint_value)
-            
-            actual = float(actual_clean)
-            setpoint = float(setpoint_clean)
+            # Einheiten abtrennen und den Istwert in die Einheit des Sollwerts umrechnen
+            actual, actual_unit = UNIT_REGISTRY.parse(actual_value)
+            setpoint, setpoint_unit = UNIT_REGISTRY.parse(setpoint_value)
+            if actual_unit and setpoint_unit and actual_unit != setpoint_unit:
+                conversion = UNIT_REGISTRY.conversion(actual_unit, setpoint_unit)
+                if conversion is False:
+                    return False
+                if conversion:
+                    actual = actual * conversion[0] + conversion[1]
             
             if tolerance_percent == 0:
                 # Exakter Vergleich
@@ -8241,35 +11279,9 @@ class MainWindow(QtWidgets.QMainWindow):
         if setpoint_value is None:  # Nur Spalten mit Sollwerten prüfen
             return
         
-        cell_item = self.table.item(row, column)
-        if not cell_item:
-            return
-        
-        actual_value = cell_item.text()
-    
         tolerance = col_info.get('tolerance', self.global_tolerance)
-    
-        if actual_value.strip():  # Nur prüfen wenn Wert vorhanden
-            actual_clean = self._remove_unit(actual_value)
-            setpoint_clean = self._remove_unit(setpoint_value)
-        
-            is_ok = self.check_value(actual_clean, setpoint_clean, tolerance)
-        
-            unit = col_info.get('unit', '')
-            if unit and actual_clean:
-                formatted_value = self._format_value_with_unit(actual_clean, unit)
-                cell_item.setText(formatted_value)
-        
-            if tolerance > 0 or col_info.get('always_highlight', False):
-                if is_ok:
-                    cell_item.setBackground(QtGui.QColor('#1e3a1e'))  
-                    cell_item.setForeground(QtGui.QColor('#90ee90'))  
-                else:
-                    cell_item.setBackground(QtGui.QColor('#3a1e1e'))  
-                    cell_item.setForeground(QtGui.QColor('#ff6b6b'))  
-            else:
-                cell_item.setBackground(QtGui.QColor(0, 0, 0, 0))     
-                cell_item.setForeground(QtGui.QColor(255, 255, 255))  
+        self.table_model.check_column(column, setpoint_value, tolerance, col_info.get('unit', ''),
+                                      col_info.get('always_highlight', False), rows=[row])
 
     def add_column(self):
         name, ok = QtWidgets.QInputDialog.getText(self, "Spaltenname", "Name der neuen Spalte:")
@@ -8301,37 +11313,24 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _update_single_column(self, column_index, new_col_info):        
         # Header aktualisieren
-        unit = new_col_info.get('unit', '')
-        if unit:
-            header_text = f"{new_col_info.get('name', '')} ({unit})"
-        else:
-            header_text = new_col_info.get('name', '')
-        
-        self.table.setHorizontalHeaderItem(column_index, QtWidgets.QTableWidgetItem(header_text))
+        if column_index < self.table_model.columnCount():
+            self.table_model.update_column(column_index, new_col_info)
         
         # Spaltenbreite aktualisieren
         width = new_col_info.get('width', 120)
         self.table.setColumnWidth(column_index, width)
         
-        # Sollwert-Zeile aktualisieren falls vorhanden
-        if self.setpoint_row_index >= 0:
-            setpoint_item = self.table.item(self.setpoint_row_index, column_index)
-            if setpoint_item:
-                setpoint_value = new_col_info.get('setpoint', '')
-                unit = new_col_info.get('unit', '')
-                
-                if unit and setpoint_value:
-                    display_value = f"{setpoint_value} {unit}"
-                else:
-                    display_value = str(setpoint_value) if setpoint_value else ''
-                
-                setpoint_item.setText(display_value)
-                
-                # Schreibschutz entsprechend der Spalteneinstellung
-                if new_col_info.get('readonly', True):
-                    setpoint_item.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled)
-                else:
-                    setpoint_item.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable)
+        # Sollwert-Zeile aktualisieren falls vorhanden (Schreibschutz kommt aus der Spalteninfo)
+        if self.setpoint_row_index >= 0 and column_index < self.table_model.columnCount():
+            setpoint_value = new_col_info.get('setpoint', '')
+            unit = new_col_info.get('unit', '')
+            
+            if unit and setpoint_value:
+                display_value = f"{setpoint_value} {unit}"
+            else:
+                display_value = str(setpoint_value) if setpoint_value else ''
+            
+            self.table_model.set_text(self.setpoint_row_index, column_index, display_value)
         
         # Template aktualisieren
         if self.current_template and column_index < len(self.current_template.columns):
@@ -8356,15 +11355,14 @@ class MainWindow(QtWidgets.QMainWindow):
                 if self.current_template and row < len(self.current_template.columns):
                     self.current_template.columns.pop(row)
                     
-                    # Tabelle neu aufbauen mit verbleibenden Spalten
-                    self._apply_template_to_table(self.current_template, preserve_data=True)
+                    # Nur die Werte dieser Spalte entfernen, die übrigen bleiben an ihrer Spalte
+                    if row < self.table_model.columnCount():
+                        self.table_model.remove_column(row)
+                    self._apply_column_widths(self.current_template.columns)
 
     def move_column_up(self):
         row = self.columns_list.currentRow()
         if row > 0:
-            # Daten vor Bewegung sichern
-            old_data = self._get_current_table_data()
-            
             # Spalte in der Liste bewegen
             item = self.columns_list.takeItem(row)
             self.columns_list.insertItem(row - 1, item)
@@ -8376,14 +11374,11 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.current_template.columns.insert(row - 1, col)
                 
                 # Tabelle mit neuen Spaltenreihenfolge aber gleichen Daten
-                self._reorder_table_columns(old_data, row, row - 1)
+                self._reorder_table_columns(row, row - 1)
 
     def move_column_down(self):
         row = self.columns_list.currentRow()
         if row >= 0 and row < self.columns_list.count() - 1:
-            # Daten vor Bewegung sichern
-            old_data = self._get_current_table_data()
-            
             # Spalte in der Liste bewegen
             item = self.columns_list.takeItem(row)
             self.columns_list.insertItem(row + 1, item)
@@ -8395,70 +11390,41 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.current_template.columns.insert(row + 1, col)
                 
                 # Tabelle mit neuen Spaltenreihenfolge aber gleichen Daten
-                self._reorder_table_columns(old_data, row, row + 1)
-
-    def _get_current_table_data(self):
-        data = []
-        for row in range(self.table.rowCount()):
-            row_data = []
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                row_data.append({
-                    'text': item.text() if item else "",
-                    'background': item.background().color().name() if item and item.background() else "",
-                    'foreground': item.foreground().color().name() if item and item.foreground() else "",
-                    'flags': item.flags() if item else QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable
-                })
-            data.append(row_data)
-        return data
-
-    def _reorder_table_columns(self, old_data, from_index, to_index):
+                self._reorder_table_columns(row, row + 1)
+
+    def _reorder_table_columns(self, from_index, to_index):
         if not self.current_template:
             return
-            
-        # Temporär Daten sichern
-        temp_data = old_data
-        
-        # Neue Tabellenstruktur erstellen
-        self.table.clear()
-        self.table.setColumnCount(len(self.current_template.columns))
-        
-        # Header setzen
-        headers = []
-        for c in self.current_template.columns:
-            unit = c.get('unit', '')
-            if unit:
-                headers.append(f"{c.get('name', '')} ({unit})")
-            else:
-                headers.append(c.get('name', ''))
         
-        self.table.setHorizontalHeaderLabels(headers)
-        
-        # Spaltenbreiten setzen
-        for idx, c in enumerate(self.current_template.columns):
+        # Spalten-Arrays verschieben, Werte und Formatierung wandern mit
+        if max(from_index, to_index) < self.table_model.columnCount():
+            self.table_model.move_column(from_index, to_index)
+        self._apply_column_widths(self.current_template.columns)
+
+    def _apply_column_widths(self, columns):
+        for idx, c in enumerate(columns):
             w = int(c.get('width', 120))
             self.table.setColumnWidth(idx, w)
-        
-        # Daten wiederherstellen mit neuer Spaltenreihenfolge
-        if temp_data:
-            self.table.setRowCount(len(temp_data))
-            for row, row_data in enumerate(temp_data):
-                for col in range(len(self.current_template.columns)):
-                    if col < len(row_data):
-                        item_data = row_data[col]
-                        item = QtWidgets.QTableWidgetItem(item_data['text'])
-                        
-                        # Formatierung wiederherstellen
-                        if item_data.get('background'):
-                            item.setBackground(QtGui.QColor(item_data['background']))
-                        if item_data.get('foreground'):
-                            item.setForeground(QtGui.QColor(item_data['foreground']))
-                        
-                        item.setFlags(item_data.get('flags', QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable))
-                        self.table.setItem(row, col, item)
-        
-        # Sollwert-Zeile wiederherstellen
-        self._add_setpoint_row(self.current_template.columns)
+
+    def _sync_stats_footer(self):
+        # nach dem Neuaufbau des Modells erst, wenn die Tabelle ihre Spalten angelegt hat
+        def apply():
+            for idx in range(self.table_model.columnCount()):
+                self.stats_footer.setColumnWidth(idx, self.table.columnWidth(idx))
+        QtCore.QTimer.singleShot(0, apply)
+
+    def _update_stats_specs(self, *args):
+        # Toleranzgrenzen für die Statistik aus Sollwert/Toleranz der Spalten (wie check_all_values)
+        specs = []
+        for col in self.table_model.columns:
+            unit = col.get('unit', '') if col else ''
+            target = MeasurementTableModel.setpoint_value(col.get('setpoint'), unit) if col else None
+            if target is None:
+                specs.append((unit, None, None))
+                continue
+            tolerance_abs = abs(target) * (col.get('tolerance', self.global_tolerance) / 100.0)
+            specs.append((unit, target - tolerance_abs, target + tolerance_abs))
+        self.table_model.set_column_specs(specs)
 
     def on_column_selected(self, current, previous):
         if current is None:
@@ -8508,50 +11474,21 @@ class MainWindow(QtWidgets.QMainWindow):
         self._apply_template_to_table(tmpl, preserve_data=True)
 
     def _apply_template_to_table(self, tmpl: Template, preserve_data=True):        
-        # Alte Daten sichern, falls gewünscht
-        old_data = []
-        if preserve_data and self.table.rowCount() > 0 and self.table.columnCount() > 0:
-            for row in range(self.table.rowCount()):
-                row_data = []
-                for col in range(self.table.columnCount()):
-                    item = self.table.item(row, col)
-                    row_data.append(item.text() if item else "")
-                old_data.append(row_data)
-        
         cols = tmpl.columns
-        self.table.clear()
-        self.table.setColumnCount(len(cols))
-        
-        headers = []
-        for c in cols:
-            unit = c.get('unit', '')
-            if unit:
-                headers.append(f"{c.get('name', '')} ({unit})")
-            else:
-                headers.append(c.get('name', ''))
+        headers = [MeasurementTableModel.header_for(c) for c in cols]
         
-        self.table.setHorizontalHeaderLabels(headers)
+        # Vorhandene Werte nach Position übernehmen, sonst leere Tabelle
+        has_data = preserve_data and self.table_model.rowCount() > 0 and self.table_model.columnCount() > 0
+        if has_data:
+            self.table_model.set_columns(headers, cols)
+        else:
+            self.table_model.reset(headers, cols, [])
         
         # Spaltenbreiten setzen
-        for idx, c in enumerate(cols):
-            w = int(c.get('width', 120))
-            self.table.setColumnWidth(idx, w)
-        
-        # Zeilen wiederherstellen
-        if preserve_data and old_data:
-            self.table.setRowCount(len(old_data))
-            for row, row_data in enumerate(old_data):
-                for col in range(min(len(row_data), len(cols))):
-                    if col < len(row_data):
-                        item = QtWidgets.QTableWidgetItem(row_data[col])
-                        flags = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable
-                        item.setFlags(flags)
-                        self.table.setItem(row, col, item)
-        else:
-            self.table.setRowCount(0)
+        self._apply_column_widths(cols)
         
         # Sollwert-Zeile nur hinzufügen, wenn nicht bereits Daten vorhanden
-        if not old_data or self.setpoint_row_index == -1:
+        if not has_data or self.setpoint_row_index == -1:
             self._add_setpoint_row(cols)
         
         self.current_template = tmpl
@@ -8559,68 +11496,116 @@ class MainWindow(QtWidgets.QMainWindow):
     def _add_setpoint_row(self, columns):
         has_setpoints = any(col.get('setpoint') is not None for col in columns)
         if has_setpoints:
-            self.setpoint_row_index = 0
-            self.table.insertRow(0)
-            
-            for col_idx, col_info in enumerate(columns):
+            texts = []
+            for col_info in columns:
                 setpoint_value = col_info.get('setpoint', '')
                 unit = col_info.get('unit', '')
                 
                 if unit and setpoint_value:
-                    display_value = f"{setpoint_value} {unit}"
-                else:
-                    display_value = str(setpoint_value)
-                    
-                item = QtWidgets.QTableWidgetItem(display_value)
-                
-                if col_info.get('readonly', True):
-                    item.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled)
+                    texts.append(f"{setpoint_value} {unit}")
                 else:
-                    item.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable)
-                
-                item.setBackground(QtGui.QColor('#2a2a33'))  
-                item.setForeground(QtGui.QColor('#9aa'))     
-                
-                self.table.setItem(0, col_idx, item)
+                    texts.append(str(setpoint_value))
             
-            self.table.setVerticalHeaderItem(0, QtWidgets.QTableWidgetItem("Sollwerte"))
+            # Schreibschutz und Darstellung kommen aus dem Modell
+            self.table_model.insert_setpoint_row(texts)
         else:
             self.setpoint_row_index = -1
 
     def add_row(self):
-        c = self.table.columnCount()
+        c = self.table_model.columnCount()
         if c == 0:
             QtWidgets.QMessageBox.warning(self, "Keine Spalten", "Bitte zuerst eine Vorlage/Dataset erstellen")
             return
     
-        # Neue Zeile immer am Ende einfügen
-        insert_position = self.table.rowCount()
-        self.table.insertRow(insert_position)
-    
         cols = self.current_template.columns if self.current_template else [self.columns_list.item(i).data(QtCore.Qt.UserRole) for i in range(self.columns_list.count())]
+        texts = []
         for col_idx in range(c):
-            colinfo = cols[col_idx]
+            colinfo = cols[col_idx] if col_idx < len(cols) else {}
             default = colinfo.get('default')
             unit = colinfo.get('unit', '')
         
             text = str(default) if default is not None else ''
             if unit and text:
                 text = f"{text} {unit}"
-            
-            it = QtWidgets.QTableWidgetItem(text)
-        
-            flags = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable
-            it.setFlags(flags)
-        
-            self.table.setItem(insert_position, col_idx, it)
+            texts.append(text)
+    
+        # Neue Zeile immer am Ende einfügen
+        self.table_model.insert_row(self.table_model.rowCount(), texts)
+
+    def paste_rows(self):
+        # Messreihen aus Tabellenkalkulation/Tablet als neue Zeilen anhängen
+        c = self.table_model.columnCount()
+        if c == 0:
+            QtWidgets.QMessageBox.warning(self, "Keine Spalten", "Bitte zuerst eine Vorlage/Dataset erstellen")
+            return
+        text = QtWidgets.QApplication.clipboard().text()
+        if not text.strip():
+            QtWidgets.QMessageBox.information(self, "Zwischenablage leer", "Die Zwischenablage enthält keine Tabellendaten.")
+            return
+
+        cols = self.current_template.columns if self.current_template else [self.columns_list.item(i).data(QtCore.Qt.UserRole) for i in range(self.columns_list.count())]
+        rows = self._parse_pasted_rows(text, cols, c)
+        if not rows:
+            return
+        # Ein Einfüge-Vorgang im Modell, Prüfung danach einmal für die ganze Tabelle statt je Zelle
+        self.table_model.append_rows(rows)
+        if self.current_template:
+            self.check_all_values()
+        self.table.scrollToBottom()
+
+    @staticmethod
+    def _parse_pasted_rows(text, cols, column_count):
+        # Tabulator (Excel/LibreOffice) oder Semikolon (CSV deutsch), sonst ein Wert je Zeile
+        sample = text[:4096]
+        delimiter = '\t' if '\t' in sample else ';' if ';' in sample else '\t'
+        rows = [row for row in csv.reader(io.StringIO(text), delimiter=delimiter) if any(cell.strip() for cell in row)]
+        if not rows:
+            return []
+
+        infos = [cols[i] if i < len(cols) and cols[i] else {} for i in range(column_count)]
+        # Kopfzeile mit Spaltennamen wird erkannt und bestimmt die Zuordnung, sonst nach Position
+        names = {}
+        for i, col in enumerate(infos):
+            for key in (col.get('name', ''), MeasurementTableModel.header_for(col)):
+                if key:
+                    names.setdefault(key.strip().lower(), i)
+        first = [cell.strip().lower() for cell in rows[0]]
+        if any(first) and all(name in names for name in first if name):
+            mapping = [names.get(name) for name in first]
+            rows = rows[1:]
+        else:
+            mapping = list(range(column_count))
+
+        numeric = [col.get('type') == 'Zahl' or col.get('setpoint') is not None for col in infos]
+        units = [col.get('unit', '') for col in infos]
+        result = []
+        for row in rows:
+            texts = [''] * column_count
+            for pos, cell in enumerate(row[:len(mapping)]):
+                target = mapping[pos]
+                if target is None:
+                    continue
+                value = cell.strip()
+                if numeric[target] and ',' in value and '.' not in value:
+                    # Dezimalkomma aus deutschen Tabellen
+                    try:
+                        float(value.split(' ')[0].replace(',', '.'))
+                        value = value.replace(',', '.', 1)
+                    except ValueError:
+                        pass
+                if units[target] and value and ' ' not in value:
+                    value = f"{value} {units[target]}"
+                texts[target] = value
+            result.append(texts)
+        return result
 
     def remove_row(self):
-        r = self.table.currentRow()
+        r = self.table.currentIndex().row()
         if r >= 0:
             if r == self.setpoint_row_index:
                 QtWidgets.QMessageBox.warning(self, "Nicht erlaubt", "Die Sollwert-Zeile kann nicht gelöscht werden.")
                 return
-            self.table.removeRow(r)
+            self.table_model.remove_row(r)
 
     def fill_setpoints(self):
         cols = []
@@ -8637,89 +11622,122 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.setpoint_row_index < 0:
             self._add_setpoint_row(cols)
     
+        if self.setpoint_row_index < 0:
+            return
+    
     # Sollwerte in die Zeile eintragen
-        for cidx, col in enumerate(cols):
+        for cidx, col in enumerate(cols[:self.table_model.columnCount()]):
             sp = col.get("setpoint")
             if sp is not None:
-                it = self.table.item(self.setpoint_row_index, cidx)
-                if it is not None:
-                    unit = col.get('unit', '')
-                    if unit:
-                        display_value = f"{sp} {unit}"
-                    else:
-                        display_value = str(sp)
-                    it.setText(display_value)
-                # Schreibschutz entsprechend der Spalteneinstellung
-                    if col.get('readonly', True):
-                        it.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled)
-                    else:
-                        it.setFlags(QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable)
+                unit = col.get('unit', '')
+                if unit:
+                    display_value = f"{sp} {unit}"
+                else:
+                    display_value = str(sp)
+                self.table_model.set_text(self.setpoint_row_index, cidx, display_value)
 
     def _save_csv(self, path):
-        headers = [self.table.horizontalHeaderItem(i).text() if self.table.horizontalHeaderItem(i) else f"Column{i}" for i in range(self.table.columnCount())]
+        headers = self.table_model.headers
         with open(path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(headers)
-            for r in range(self.table.rowCount()):
-                row = [self.table.item(r, c).text() if self.table.item(r, c) else '' for c in range(self.table.columnCount())]
-                writer.writerow(row)
+            writer.writerows(self.table_model.rows_as_text())
 
     def _save_json(self, path):
-        data = {"headers": [self.table.horizontalHeaderItem(i).text() if self.table.horizontalHeaderItem(i) else f"Column{i}" for i in range(self.table.columnCount())],
-                "rows": [[self.table.item(r, c).text() if self.table.item(r, c) else '' for c in range(self.table.columnCount())] for r in range(self.table.rowCount())]}
+        data = {"headers": list(self.table_model.headers),
+                "rows": self.table_model.rows_as_text()}
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
-    def _load_csv(self, path):
-        with open(path, newline='', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-        if not rows:
+    def _save_binary(self, path):
+        model = self.table_model
+        if model.source is not None and model.source.path.resolve() == Path(path).resolve():
+            # Die gemappte Datei wird gleich ersetzt
+            model.materialize()
+        MappedDataset.write(path, model.headers, model.columns,
+                            [model.column_texts(c) for c in range(model.columnCount())], model.setpoint_row)
+
+    def _save_dataset_file(self, path):
+        lower = path.lower()
+        if lower.endswith('.csv'):
+            self._save_csv(path)
+        elif lower.endswith(MappedDataset.SUFFIX):
+            self._save_binary(path)
+        else:
+            self._save_json(path)
+
+    def _load_binary(self, path):
+        try:
+            dataset = MappedDataset(path)
+        except (OSError, ValueError, KeyError) as e:
+            QtWidgets.QMessageBox.warning(self, "Fehler", f"Dataset konnte nicht geladen werden: {e}")
             return
-        headers = rows[0]
-        data = rows[1:]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setRowCount(0)
-        for rdata in data:
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-            for c, val in enumerate(rdata):
-                it = QtWidgets.QTableWidgetItem(val)
-                self.table.setItem(r, c, it)
-
-    def _load_json(self, path):
-        with open(path, encoding='utf-8') as f:
-            d = json.load(f)
-        headers = d.get('headers', [])
-        rows = d.get('rows', [])
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setRowCount(0)
-        for rdata in rows:
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-            for c, val in enumerate(rdata):
-                self.table.setItem(r, c, QtWidgets.QTableWidgetItem(val))
+        self.table_model.reset_mapped(dataset)
+        self.clear_unsaved_changes()
 
-    def _generate_html_for_print(self):
+    def _import_dataset(self, path):
+        # Import läuft im Hintergrund, die Tabelle füllt sich blockweise
+        if getattr(self, '_dataset_importer', None) is not None:
+            return
+        self._dataset_importer = DatasetImporter(path, self)
+        self._import_progress = QtWidgets.QProgressDialog("Dataset wird importiert...", "Abbrechen", 0, 100, self)
+        self._import_progress.setWindowTitle("Dataset laden")
+        self._import_progress.setWindowModality(QtCore.Qt.WindowModal)
+        self._import_progress.setMinimumDuration(300)
+        self._import_progress.setAutoClose(False)
+        self._import_progress.setAutoReset(False)
+        self._import_progress.canceled.connect(self._dataset_importer.cancel)
+        self._dataset_importer.progress.connect(self._import_progress.setValue)
+        self._dataset_importer.headers_ready.connect(self._on_import_headers)
+        self._dataset_importer.rows_ready.connect(self._on_import_rows)
+        self._dataset_importer.finished.connect(self._on_import_finished)
+        self._dataset_importer.failed.connect(self._on_import_failed)
+        self._dataset_importer.start()
+
+    def _on_import_headers(self, headers):
+        self.table_model.reset(headers, None, [])
+
+    def _on_import_rows(self, rows):
+        self.table_model.append_rows(rows)
+        if self._dataset_importer is not None:
+            self._dataset_importer.chunk_consumed()
+
+    def _finish_import(self):
+        self._import_progress.close()
+        self._dataset_importer = None
+        self.clear_unsaved_changes()
+
+    def _on_import_finished(self, count, cancelled):
+        self._finish_import()
+        if cancelled:
+            QtWidgets.QMessageBox.information(self, "Import abgebrochen",
+                                            f"Import abgebrochen, {self.table_model.rowCount()} Zeilen wurden übernommen.")
+
+    def _on_import_failed(self, message):
+        self._finish_import()
+        QtWidgets.QMessageBox.warning(self, "Fehler", f"Dataset konnte nicht geladen werden: {message}")
+
+    def _html_head(self, with_title=True):
+        html = [f"<html><head><meta charset='utf-8'><style>{TABLE_EXPORT_CSS}</style></head><body>"]
+        if not with_title:
+            return ''.join(html)
         title = f"{o3NAME} - Export"
-        html = [f"<html><head><meta charset='utf-8'><style>body{{font-family:Arial, Helvetica, sans-serif;font-size:12px;background:#121217;color:#e6eef8}}table{{border-collapse:collapse;width:100%}}th,td{{border:1px solid #444;padding:6px;text-align:left}}th{{background:#222;color:#fff}}.meta{{margin-bottom:10px}}.setpoint{{font-style:italic;color:#9aa;font-weight:bold}}.short-description{{margin-bottom:15px;padding:10px;border:1px solid #444;background:#1b1b20}}.long-description{{margin-top:20px;padding:10px;border:1px solid #444;background:#1b1b20}}.value-ok{{background:#1e3a1e;color:#90ee90}}.value-error{{background:#3a1e1e;color:#ff6b6b}}img.banner{{max-height:80px}}</style></head><body>"]
+        template_name = REPORT_RENDERER.escape(self.template_name_edit.text() or '-')
         if LOGO_PATH.exists():
-            html.append(f"<div style='display:flex;align-items:center;margin-bottom:10px'><img class='banner' src='file://{LOGO_PATH}' alt='logo' style='height:60px;margin-right:12px'><div><h2>{title}</h2><div class='meta'>Vorlage: {self.template_name_edit.text() or '-'} &nbsp;&nbsp; Version: {o3VERSION}</div></div></div>")
+            html.append(f"<div style='display:flex;align-items:center;margin-bottom:10px'><img class='banner' src='file://{LOGO_PATH}' alt='logo' style='height:60px;margin-right:12px'><div><h2>{title}</h2><div class='meta'>Vorlage: {template_name} &nbsp;&nbsp; Version: {o3VERSION}</div></div></div>")
         else:
             html.append(f"<h2>{title}</h2>")
-            html.append(f"<div class='meta'>Vorlage: {self.template_name_edit.text() or '-'} &nbsp;&nbsp; Version: {o3VERSION}</div>")
+            html.append(f"<div class='meta'>Vorlage: {template_name} &nbsp;&nbsp; Version: {o3VERSION}</div>")
 
         if self.export_short_description:
-            html.append(f"<div class='short-description'><strong>Kurzbeschreibung:</strong><br>{self.export_short_description.replace(chr(10), '<br>')}</div>")
+            html.append(f"<div class='short-description'><strong>Kurzbeschreibung:</strong><br>{REPORT_RENDERER.escape_lines(self.export_short_description)}</div>")
+        return ''.join(html)
 
-        
-        html.append("<table>")
-        html.append("<tr>")
-        headers = [self.table.horizontalHeaderItem(i).text() if self.table.horizontalHeaderItem(i) else f"Column{i+1}" for i in range(self.table.columnCount())]
-        for h in headers:
-            html.append(f"<th>{h}</th>")
+    def _html_table_start(self):
+        # Tabellenanfang mit Kopf- und Sollwert-Zeile, wird auf jeder Druckseite wiederholt
+        html = ["<table>", "<tr>"]
+        for h in self._html_headers():
+            html.append(f"<th>{REPORT_RENDERER.escape(h)}</th>")
         html.append("</tr>")
         cols = []
         if self.current_template and self.current_template.columns:
@@ -8737,38 +11755,170 @@ class MainWindow(QtWidgets.QMainWindow):
                         display_value = f"{sp} {unit}"
                     else:
                         display_value = sp if sp is not None else ''
-                    html.append(f"<td>{display_value}</td>")
+                    html.append(f"<td>{REPORT_RENDERER.escape(display_value)}</td>")
                 html.append("</tr>")
-        for r in range(self.table.rowCount()):
-            if r == self.setpoint_row_index:
-                continue
-            html.append("<tr>")
-            for c in range(self.table.columnCount()):
-                val = self.table.item(r, c).text() if self.table.item(r, c) else ""
-                cell_item = self.table.item(r, c)
-                if cell_item and cell_item.background().color().name() == "#1e3a1e":
-                    html.append(f"<td class='value-ok'>{val}</td>")
-                elif cell_item and cell_item.background().color().name() == "#3a1e1e":
-                    html.append(f"<td class='value-error'>{val}</td>")
-                else:
-                    html.append(f"<td>{val}</td>")
+        return ''.join(html)
+
+    def _html_headers(self):
+        return [h or f"Column{i+1}" for i, h in enumerate(self.table_model.headers)]
+
+    def _html_columns(self, copy=False):
+        # (Texte, Statuscodes) je Spalte; mit copy=True ein Stand, der im Hintergrund gelesen werden kann
+        model = self.table_model
+        columns = [(model.column_texts(c), model.column_status(c)) for c in range(model.columnCount())]
+        if copy:
+            columns = [(texts.copy(), codes[:]) for texts, codes in columns]
+        return columns
+
+    def _html_rows(self, rows, columns=None):
+        # Eine <tr> je Datenzeile, Klassen direkt aus den Statuscodes des Modells
+        if columns is None:
+            columns = self._html_columns()
+        classes = {MeasurementTableModel.STATUS_OK: " class='value-ok'",
+                   MeasurementTableModel.STATUS_ERROR: " class='value-error'"}
+        esc = REPORT_RENDERER.escape
+        for r in rows:
+            yield "<tr>" + ''.join(f"<td{classes.get(codes[r], '')}>{esc(col_texts[r])}</td>" for col_texts, codes in columns) + "</tr>"
+
+    def _html_tail(self):
+        model = self.table_model
+        headers = self._html_headers()
+        html = ["</table>"]
+
+        # Statistik der Spalten mit Zahlenwerten (wie die Fußzeilen unter der Tabelle)
+        stat_columns = [(headers[c], ColumnStatsModel.stat_texts(model.column_stats(c))) for c in range(model.columnCount())]
+        stat_columns = [(h, values) for h, values in stat_columns if values[0]]
+        if stat_columns:
+            html.append("<table class='stats'><tr><th>Kennwert</th>")
+            for h, _ in stat_columns:
+                html.append(f"<th>{REPORT_RENDERER.escape(h)}</th>")
             html.append("</tr>")
-        html.append("</table>")
+            for i, label in enumerate(ColumnStatsModel.ROWS):
+                html.append(f"<tr><td>{label}</td>")
+                for _, values in stat_columns:
+                    html.append(f"<td>{values[i]}</td>")
+                html.append("</tr>")
+            html.append("</table>")
         
         # Langbeschreibung unter der Tabelle
         if self.export_long_description:
-            html.append(f"<div class='long-description'><strong>Beschreibung:</strong><br>{self.export_long_description.replace(chr(10), '<br>')}</div>")
+            html.append(f"<div class='long-description'><strong>Beschreibung:</strong><br>{REPORT_RENDERER.escape_lines(self.export_long_description)}</div>")
         
         html.append("</body></html>")
         return ''.join(html)
 
+    def _iter_html_for_print(self, batch_rows=500):
+        # Dokument stückweise, Datenzeilen in Blöcken; nie der ganze Export auf einmal im Speicher
+        yield self._html_head()
+        yield self._html_table_start()
+        rows = self._html_rows(self.table_model.data_rows())
+        while True:
+            batch = ''.join(itertools.islice(rows, batch_rows))
+            if not batch:
+                break
+            yield batch
+        yield self._html_tail()
+
+    def _generate_html_for_print(self):
+        return ''.join(self._iter_html_for_print())
+
+    def _write_html_export(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for part in self._iter_html_for_print():
+                f.write(part)
+
+    def _print_document(self, printer, html, width=None, page_size=None):
+        doc = QtGui.QTextDocument()
+        doc.documentLayout().setPaintDevice(printer)
+        if page_size is not None:
+            doc.setPageSize(page_size)
+        else:
+            doc.setTextWidth(width)
+        doc.setHtml(html)
+        return doc
+
+    def _print_snapshot(self):
+        # Alles, was der Druck aus Fenster und Modell braucht, im GUI-Thread einsammeln;
+        # gedruckt wird danach im Hintergrund
+        table_start = self._html_table_start()
+        return {
+            'first_head': self._html_head() + table_start,
+            'page_head': self._html_head(with_title=False) + table_start,
+            'tail': self._html_tail(),
+            'columns': self._html_columns(copy=True),
+            'rows': list(self.table_model.data_rows()),
+        }
+
+    def _print_chunks(self, printer, page_width, page_height, snapshot):
+        # Seitenweise HTML-Blöcke mit Anzahl der bisher ausgegebenen Zeilen: Zeilen je Seite
+        # werden an einer Stichprobe gemessen, jede Seite wiederholt Kopf- und Sollwert-Zeile
+        page_head = snapshot['page_head']
+        page_end = "</table></body></html>"
+        sample = list(itertools.islice(self._html_rows(snapshot['rows'], snapshot['columns']), 20))
+        empty_height = self._print_document(printer, page_head + page_end, page_width).size().height()
+        row_height = 1.0
+        if sample:
+            sample_height = self._print_document(printer, page_head + ''.join(sample) + page_end, page_width).size().height()
+            row_height = max((sample_height - empty_height) / len(sample), 1.0)
+        first_head = snapshot['first_head']
+        first_height = self._print_document(printer, first_head + page_end, page_width).size().height()
+        per_page = max(1, int((page_height - empty_height) / row_height))
+        per_first_page = max(1, int((page_height - first_height) / row_height))
+
+        rows = self._html_rows(snapshot['rows'], snapshot['columns'])
+        done = min(per_first_page, len(snapshot['rows']))
+        head, chunk = first_head, ''.join(itertools.islice(rows, per_first_page))
+        while True:
+            following = ''.join(itertools.islice(rows, per_page))
+            if not following:
+                yield head + chunk + snapshot['tail'], done
+                return
+            yield head + chunk + page_end, done
+            head, chunk = page_head, following
+            done = min(done + per_page, len(snapshot['rows']))
+
+    def _print_paginated(self, printer, snapshot=None, job=None):
+        # Jede Seite ist ein eigenes kleines QTextDocument, der Speicher bleibt auch bei
+        # vielen tausend Zeilen begrenzt. Läuft als Hintergrundauftrag (job) oder direkt.
+        if snapshot is None:
+            snapshot = self._print_snapshot()
+        page_rect = printer.pageRect(QPrinter.DevicePixel)
+        page_width, page_height = page_rect.width(), page_rect.height()
+        page_size = QtCore.QSizeF(page_width, page_height)
+        total = max(len(snapshot['rows']), 1)
+        painter = QtGui.QPainter()
+        if not painter.begin(printer):
+            raise RuntimeError("Der Drucker konnte nicht gestartet werden.")
+        try:
+            first_page = True
+            for html, done in self._print_chunks(printer, page_width, page_height, snapshot):
+                if job is not None:
+                    job.set_progress(done * 100 // total, f"{done} von {total} Zeilen")
+                doc = self._print_document(printer, html, page_size=page_size)
+                # Falls eine Seite wegen umbrechender Zellen doch länger wird, läuft sie weiter
+                for page in range(doc.pageCount()):
+                    if not first_page:
+                        printer.newPage()
+                    first_page = False
+                    painter.save()
+                    painter.translate(0, -page * page_height)
+                    doc.drawContents(painter, QtCore.QRectF(0, page * page_height, page_width, page_height))
+                    painter.restore()
+        except JobCancelled:
+            # Bereits gesendete Seiten verwerfen
+            printer.abort()
+            raise
+        finally:
+            painter.end()
+        return True
+
     def _apply_dark_style(self):
         style = """
         QWidget{ background-color: #121217; color: #e6eef8; }
         QLineEdit, QPlainTextEdit, QTextEdit, QSpinBox, QComboBox, QListWidget{ background-color: #1b1b20; border: 1px solid #2a2a33; padding:4px }
         QPushButton{ background-color: #2b2b34; border: 1px solid #3a3a45; padding:6px; border-radius:6px }
         QPushButton:hover{ background-color: #34343e }
-        QTableWidget{ background-color: #0f0f12; gridline-color: #222; selection-background-color:#2b6ea3 }
+        QTableView{ background-color: #0f0f12; gridline-color: #222; selection-background-color:#2b6ea3 }
         QHeaderView::section{ background-color: #16161a; padding:6px; border: none }
         QGroupBox{ border: 1px solid #24242b; border-radius:8px; margin-top:6px }
         QGroupBox:title{ subcontrol-origin: margin; left:8px; padding:0 3px }
@@ -8781,6 +11931,293 @@ class MainWindow(QtWidgets.QMainWindow):
         """
         self.setStyleSheet(style)
 
+# Sammel-Export ohne Oberfläche: Fahrzeuge werden auf Prozesse verteilt, jeder Worker liest sein
+# Fahrzeug nur und schreibt seine Berichte nach <Ziel>/<Fahrzeug>/. Übersicht und HU/AU danach im Hauptprozess.
+VEHICLE_REPORTS = (("Fahrzeug", "fahrzeug.html"), ("Beanstandungen", "beanstandungen.html"), ("Aktivitäten", "aktivitaeten.html"))
+
+
+def _input_digest(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def vehicle_report_inputs(name: str, include_images: bool = True) -> dict:
+    # Hash der Eingaben je Bericht: relativer Pfad -> (Titel, Hash); None wenn das Fahrzeug nicht lesbar ist
+    vehicle_dir = VEHICLES_BASE_DIR / name
+    try:
+        raw = (vehicle_dir / "vehicle.json").read_bytes()
+        data = json.loads(raw)
+    except Exception:
+        return None
+    fingerprint = REPORT_RENDERER.fingerprint
+    specs = data.get("specifications") or {}
+    (vehicle_title, vehicle_file), (defects_title, defects_file), (activities_title, activities_file) = VEHICLE_REPORTS
+    
+    # Anhänge im Blob-Speicher stecken per Hash schon in der vehicle.json, nur Scans außerhalb per Dateistatus
+    scans = []
+    for attachment in data.get("attachments", []):
+        scan_path = attachment.get("scan_path")
+        if not attachment.get("blob") and scan_path:
+            try:
+                st = os.stat(scan_path)
+                scans.append((scan_path, st.st_size, st.st_mtime_ns))
+            except OSError:
+                scans.append((scan_path, None, None))
+    inputs = {f"{name}/{vehicle_file}": (vehicle_title, _input_digest(fingerprint, vehicle_file, hashlib.sha256(raw).hexdigest(), scans, include_images))}
+    
+    if data.get("defect_reports"):
+        inputs[f"{name}/{defects_file}"] = (defects_title, _input_digest(fingerprint, defects_file, data.get("name") or name,
+                                                                         specs.get("fin", ""), data["defect_reports"]))
+    
+    activity_files = []
+    activities_dir = vehicle_dir / "activities"
+    if activities_dir.exists():
+        for activity_file in sorted(activities_dir.glob("*/*.json")):
+            st = activity_file.stat()
+            activity_files.append((activity_file.relative_to(activities_dir).as_posix(), st.st_size, st.st_mtime_ns))
+    if activity_files:
+        inputs[f"{name}/{activities_file}"] = (activities_title, _input_digest(fingerprint, activities_file, data.get("name") or name,
+                                                                               specs.get("fin", ""), activity_files))
+    return inputs
+
+
+def export_vehicle_reports(name: str, output_dir: str, include_images: bool = True, only=None) -> dict:
+    # only: Menge relativer Pfade, die neu erzeugt werden sollen; None = alle
+    result = {'vehicle': name, 'description': '', 'reports': [], 'error': ''}
+    (vehicle_title, vehicle_file), (defects_title, defects_file), (activities_title, activities_file) = VEHICLE_REPORTS
+    
+    def wanted(file_name):
+        return only is None or f"{name}/{file_name}" in only
+    
+    try:
+        with open(VEHICLES_BASE_DIR / name / "vehicle.json", "r", encoding="utf-8") as f:
+            vehicle = Vehicle.from_dict(json.load(f))
+        vehicle.name = vehicle.name or name
+        result['description'] = vehicle.description
+        
+        vehicle_dir = Path(output_dir) / name
+        vehicle_dir.mkdir(parents=True, exist_ok=True)
+        
+        if wanted(vehicle_file):
+            with_images = include_images and vehicle.include_attachments_in_export
+            if with_images:
+                copy_vehicle_attachments(vehicle, vehicle_dir)
+            REPORT_RENDERER.write(vehicle_dir / vehicle_file,
+                                  render_vehicle_report(vehicle, with_images, vehicle_dir if with_images else None))
+            result['reports'].append((vehicle_title, f"{name}/{vehicle_file}"))
+        
+        if vehicle.defect_reports and wanted(defects_file):
+            REPORT_RENDERER.write(vehicle_dir / defects_file, render_defects_report(vehicle))
+            result['reports'].append((defects_title, f"{name}/{defects_file}"))
+        
+        if wanted(activities_file):
+            manifest = ActivityManifest(vehicle)
+            entries = sorted(manifest.load(), key=lambda x: x.get('datum', ''), reverse=True)
+            activities = [activity for activity in map(manifest.load_activity, entries) if activity is not None]
+            if activities:
+                REPORT_RENDERER.write(vehicle_dir / activities_file, render_activities_report(vehicle, activities))
+                result['reports'].append((activities_title, f"{name}/{activities_file}"))
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def render_fleet_index(results: list, hu_au_href: str) -> str:
+    render = REPORT_RENDERER.render
+    rows = []
+    for result in results:
+        links = ' '.join(render("fleet_link", href=url_quote(href), title=title) for title, href in result['reports'])
+        rows.append(render("fleet_index_row", raw={'links': links}, vehicle=result['vehicle'],
+                           description=result['description'], error=result['error'],
+                           error_class="fleet-error" if result['error'] else ""))
+    failed = sum(1 for result in results if result['error'])
+    content = render("fleet_index", raw={'rows': ''.join(rows), 'footer': REPORT_RENDERER.footer()},
+                     exported=datetime.now().strftime("%d.%m.%Y %H:%M"), count=len(results),
+                     failed=failed, hu_au_href=hu_au_href)
+    return REPORT_RENDERER.page("Fuhrpark-Berichte", "report-fleet", content)
+
+
+# Welcher Bericht aus welchen Eingaben entstanden ist (report_manifest.json im Zielordner).
+# Ein erneuter Export erzeugt nur Berichte, deren Eingabe-Hash sich geändert hat oder deren Datei fehlt.
+class ReportManifest:
+    MANIFEST_NAME = "report_manifest.json"
+    MANIFEST_VERSION = 1
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.manifest_file = self.output_dir / self.MANIFEST_NAME
+        self.vehicles = {}  # Fahrzeugname -> {'description', 'reports': {relativer Pfad -> {'title', 'hash'}}}
+        self.load()
+
+    def load(self):
+        self.vehicles = {}
+        if not self.manifest_file.exists():
+            return
+        try:
+            with open(self.manifest_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.MANIFEST_VERSION:
+                self.vehicles = data.get("vehicles", {})
+        except Exception as e:
+            print(f"Fehler beim Laden des Berichts-Manifests: {e}")
+
+    def save(self) -> bool:
+        try:
+            tmp_file = self.manifest_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": self.MANIFEST_VERSION, "vehicles": self.vehicles}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.manifest_file)
+            return True
+        except Exception as e:
+            print(f"Fehler beim Speichern des Berichts-Manifests: {e}")
+            return False
+
+    def reports(self, name: str) -> dict:
+        return self.vehicles.get(name, {}).get("reports", {})
+
+    def stale(self, name: str, inputs: dict) -> set:
+        known = self.reports(name)
+        return {rel for rel, (_, digest) in inputs.items()
+                if known.get(rel, {}).get("hash") != digest or not (self.output_dir / rel).exists()}
+
+    def update(self, name: str, description: str, inputs: dict, written: list):
+        # nur tatsächlich geschriebene Berichte übernehmen, entfallene Berichte löschen
+        entry = self.vehicles.setdefault(name, {"description": "", "reports": {}})
+        if description:
+            entry["description"] = description
+        reports = entry["reports"]
+        for rel in [rel for rel in reports if rel not in inputs]:
+            try:
+                (self.output_dir / rel).unlink()
+            except OSError:
+                pass
+            del reports[rel]
+        for _, rel in written:
+            if rel in inputs:
+                title, digest = inputs[rel]
+                reports[rel] = {"title": title, "hash": digest}
+
+    def result(self, name: str, error: str = "") -> dict:
+        entry = self.vehicles.get(name, {})
+        reports = [(report["title"], rel) for rel, report in entry.get("reports", {}).items()]
+        return {'vehicle': name, 'description': entry.get("description", ""), 'reports': reports, 'error': error}
+
+
+class FleetReportExporter:
+    INDEX_NAME = "index.html"
+    HU_AU_NAME = "hu_au_uebersicht.html"
+
+    def __init__(self, output_dir, vehicle_names=None, name_filter: str = "", include_images: bool = True, workers: int = None):
+        self.output_dir = Path(output_dir)
+        self.vehicle_names = vehicle_names
+        self.name_filter = name_filter.lower()
+        self.include_images = include_images
+        self.workers = workers
+        self.vehicle_index = None
+
+    def select_vehicles(self) -> list:
+        vehicle_index = self.vehicle_index = VehicleIndex()
+        vehicle_index.refresh()
+        names = vehicle_index.names()
+        if self.vehicle_names:
+            wanted = set(self.vehicle_names)
+            names = [name for name in names if name in wanted]
+        if self.name_filter:
+            names = [name for name in names
+                     if self.name_filter in name.lower()
+                     or self.name_filter in (vehicle_index.get(name) or {}).get('description', '').lower()]
+        return names
+
+    def run(self, progress=None) -> list:
+        names = self.select_vehicles()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Eingabe-Hashes im Hauptprozess; unveränderte Fahrzeuge erreichen den Prozess-Pool gar nicht
+        manifest = ReportManifest(self.output_dir)
+        inputs = {}
+        jobs = {}
+        results = []
+        pruned = False
+        for name in names:
+            inputs[name] = vehicle_report_inputs(name, self.include_images)
+            if inputs[name] is None:
+                jobs[name] = None
+                continue
+            stale = manifest.stale(name, inputs[name])
+            if stale:
+                jobs[name] = stale
+            else:
+                if set(manifest.reports(name)) != set(inputs[name]):
+                    # nur entfallene Berichte: löschen reicht, dafür kein Worker-Prozess
+                    manifest.update(name, "", inputs[name], [])
+                    pruned = True
+                result = manifest.result(name)
+                result['skipped'] = True
+                results.append(result)
+                if progress:
+                    progress(len(results), len(names), result)
+        
+        if jobs:
+            # spawn statt fork: der Elternprozess kann eine laufende Qt-Anwendung sein
+            context = multiprocessing.get_context("spawn")
+            workers = min(self.workers or os.cpu_count() or 1, len(jobs))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = {pool.submit(export_vehicle_reports, name, str(self.output_dir), self.include_images, stale): name
+                           for name, stale in jobs.items()}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'vehicle': name, 'description': '', 'reports': [], 'error': str(e)}
+                    if inputs[name] is not None:
+                        manifest.update(name, result['description'], inputs[name], result['reports'])
+                        result = manifest.result(name, result['error'])
+                    results.append(result)
+                    if progress:
+                        progress(len(results), len(names), result)
+        if jobs or pruned:
+            manifest.save()
+        results.sort(key=lambda result: result['vehicle'].lower())
+        
+        # HU/AU-Übersicht der ausgewählten Fahrzeuge; ohne GUI-Start seit dem Update
+        # stehen die Daten noch in den vehicle.json
+        hu_au_store = HuAuStore()
+        hu_au_store.migrate_from_vehicles(self.vehicle_index)
+        entries = hu_au_store.ordered_entries(names)
+        hu_au_store.update_status(entries)
+        REPORT_RENDERER.write(self.output_dir / self.HU_AU_NAME, render_hu_au_report(entries))
+        REPORT_RENDERER.write(self.output_dir / self.INDEX_NAME, render_fleet_index(results, self.HU_AU_NAME))
+        return results
+
+
+def run_batch_report(argv) -> int:
+    parser = argparse.ArgumentParser(prog=o3NAME, description="Berichte aller Fahrzeuge ohne Oberfläche exportieren")
+    parser.add_argument("--batch-report", metavar="ZIELORDNER", required=True, help="Ausgabeordner für die Berichte")
+    parser.add_argument("--vehicles", nargs="+", metavar="NAME", help="nur diese Fahrzeuge exportieren")
+    parser.add_argument("--filter", default="", help="nur Fahrzeuge, deren Name oder Beschreibung den Text enthält")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl paralleler Prozesse")
+    parser.add_argument("--no-images", action="store_true", help="Anhänge nicht mit exportieren")
+    args = parser.parse_args(argv)
+    
+    def progress(done, total, result):
+        if result['error']:
+            state = f"Fehler: {result['error']}"
+        elif result.get('skipped'):
+            state = "unverändert"
+        else:
+            state = f"{len(result['reports'])} Berichte"
+        print(f"[{done}/{total}] {result['vehicle']}: {state}", flush=True)
+    
+    started = time.perf_counter()
+    exporter = FleetReportExporter(args.batch_report, args.vehicles, args.filter, not args.no_images, args.workers)
+    results = exporter.run(progress)
+    failed = sum(1 for result in results if result['error'])
+    skipped = sum(1 for result in results if result.get('skipped'))
+    print(f"{len(results)} Fahrzeuge exportiert ({skipped} unverändert, {failed} fehlgeschlagen) in {time.perf_counter() - started:.1f} s: "
+          f"{exporter.output_dir / exporter.INDEX_NAME}")
+    return 1 if failed else 0
+
+
 def show_splash(app):
     w, h = 640, 300
     pix = QtGui.QPixmap(w, h)
@@ -8816,6 +12253,11 @@ def show_splash(app):
 
 
 def main():
+    multiprocessing.freeze_support()
+    if "--batch-report" in sys.argv[1:]:
+        # Headless, ohne QApplication
+        sys.exit(run_batch_report(sys.argv[1:]))
+    
     QtCore.QCoreApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
     QtCore.QCoreApplication.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps, True)
     app = QtWidgets.QApplication(sys.argv)